@@ -0,0 +1,80 @@
+"""
+Throughput benchmark for the vectorized bill recomputation engine.
+
+Builds synthetic bills, then times loading them into arrays and recomputing
+totals, and checks the results against the per-bill Cart arithmetic.
+
+Usage:
+    python -m benchmarks.bench_bill_batch [--bills 200000] [--lines 8]
+"""
+
+import argparse
+import random
+import time
+
+from models.bill_model import Bill, BillItem
+from models.product_model import Product
+from services.bill_batch_engine import BillBatchEngine
+from services.cart import Cart
+
+
+def make_bills(count, lines, seed=7):
+    """Random bills whose stored totals come from Cart, so they should all match"""
+    rng = random.Random(seed)
+    categories = BillBatchEngine.CATEGORIES
+    products = [Product(f"prd_{i}", f"Product {i}", rng.randint(500, 50000), categories[i % 3])
+                for i in range(1000)]
+    bills = []
+    for b in range(count):
+        cart = Cart()
+        for product in rng.sample(products, lines):
+            cart.set_quantity(product, rng.randint(1, 5))
+        snapshot = cart.snapshot()
+        bills.append(Bill(
+            bill_no=str(b),
+            customer_name="Customer",
+            customer_phone="9999999999",
+            items=[BillItem(line.product_id, line.product_name, line.quantity, line.price, line.total,
+                            line.category, line.tax_rate) for line in snapshot.lines],
+            medical_total=snapshot.category_totals.get("medical", 0),
+            grocery_total=snapshot.category_totals.get("grocery", 0),
+            drinks_total=snapshot.category_totals.get("drinks", 0),
+            medical_tax=snapshot.category_taxes.get("medical", 0),
+            grocery_tax=snapshot.category_taxes.get("grocery", 0),
+            drinks_tax=snapshot.category_taxes.get("drinks", 0),
+            total_amount=snapshot.grand_total
+        ))
+    return bills
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batch bill recomputation')
+    parser.add_argument('--bills', type=int, default=200000, help='Number of synthetic bills')
+    parser.add_argument('--lines', type=int, default=8, help='Line items per bill')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed compute runs (best is reported)')
+    args = parser.parse_args()
+
+    bills = make_bills(args.bills, args.lines)
+    engine = BillBatchEngine()
+
+    start = time.perf_counter()
+    batch = engine.load(bills)
+    load_seconds = time.perf_counter() - start
+    lines = len(batch.quantity)
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        totals = engine.compute(batch)
+        best = min(best, time.perf_counter() - start)
+
+    mismatches = engine.mismatches(batch, totals)
+
+    print(f"Bills: {len(batch):,}  Line items: {lines:,}")
+    print(f"Load into arrays:  {load_seconds:8.3f}s  ({lines / load_seconds:,.0f} lines/s)")
+    print(f"Compute totals:    {best:8.3f}s  ({lines / best:,.0f} lines/s)")
+    print(f"Mismatches vs Cart: {len(mismatches)}")
+
+
+if __name__ == "__main__":
+    main()
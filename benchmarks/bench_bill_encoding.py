@@ -0,0 +1,95 @@
+"""
+Size and decode-time benchmark for the two bill item layouts.
+
+Compares the default layout (one map per item) with the compact columnar layout
+(one array per item field) for bills of 10, 100 and 1,000 lines. Sizes are given
+both as Firestore storage bytes, computed with Firestore's documented size rules,
+and as JSON bytes, a proxy for the bytes sent over the wire.
+
+Usage:
+    python -m benchmarks.bench_bill_encoding [--lines 10 100 1000] [--repeat 200]
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime
+
+from models.bill_model import Bill, BillItem
+
+CATEGORIES = ("medical", "grocery", "drinks")
+TAX_RATES = {"medical": 500, "grocery": 100, "drinks": 1000}
+
+
+def make_bill(lines, seed=11):
+    """A bill with `lines` distinct items, a few of them discounted by a promotion"""
+    rng = random.Random(seed)
+    items = []
+    for i in range(lines):
+        category = CATEGORIES[i % 3]
+        quantity = rng.randint(1, 5)
+        price = rng.randint(500, 50000)
+        promoted = i % 10 == 0
+        items.append(BillItem(f"prd_{i:05d}", f"Product {i}", quantity, price, quantity * price, category,
+                              TAX_RATES[category], price // 10 if promoted else 0,
+                              ("promo_weekend",) if promoted else ()))
+    return Bill("0MVBTYZ3N37SN00", "Customer Name", "9999999999", items, 1, 2, 3, 4, 5, 6, 7,
+                datetime(2025, 1, 1, 10, 0), 1234)
+
+
+def firestore_size(value):
+    """Storage size of a field value under Firestore's size rules"""
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, (int, float, datetime)):
+        return 8
+    if isinstance(value, str):
+        return len(value.encode("utf-8")) + 1
+    if isinstance(value, list):
+        return sum(firestore_size(v) for v in value)
+    if isinstance(value, dict):
+        return sum(firestore_size(k) + firestore_size(v) for k, v in value.items())
+    raise TypeError(f"unsupported value {value!r}")
+
+
+def document_size(bill_no, data, shop_id="x" * 28):
+    """Storage size of a document in `shops/{shop_id}/bills`: name + 32 bytes + fields"""
+    name = sum(firestore_size(part) for part in ("shops", shop_id, "bills", bill_no)) + 16
+    return name + 32 + firestore_size(data)
+
+
+def decode_seconds(doc, repeat):
+    """Best of `repeat` timed Bill.from_dict calls"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        Bill.from_dict(doc)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark bill item layouts')
+    parser.add_argument('--lines', type=int, nargs='+', default=[10, 100, 1000], help='Line items per bill')
+    parser.add_argument('--repeat', type=int, default=200, help='Timed decodes per measurement (best is reported)')
+    args = parser.parse_args()
+
+    print(f"{'Lines':>6}{'Layout':>9}{'Firestore B':>13}{'JSON B':>10}{'Decode us':>11}")
+    for lines in args.lines:
+        bill = make_bill(lines)
+        results = []
+        for label, compact in (("maps", False), ("columns", True)):
+            doc = bill.to_dict(compact)
+            assert Bill.from_dict(doc) == bill
+            results.append((label, document_size(bill.bill_no, doc), len(json.dumps(doc).encode("utf-8")),
+                            decode_seconds(doc, args.repeat) * 1e6))
+        for label, stored, wire, decode in results:
+            print(f"{lines:>6}{label:>9}{stored:>13,}{wire:>10,}{decode:>11,.1f}")
+        (_, stored_maps, wire_maps, decode_maps), (_, stored_cols, wire_cols, decode_cols) = results
+        print(f"{'':>6}{'change':>9}{stored_cols / stored_maps - 1:>+13.0%}{wire_cols / wire_maps - 1:>+10.0%}"
+              f"{decode_cols / decode_maps - 1:>+11.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Memory and (de)serialization benchmark for the model classes.
+
+Compares the slotted dataclass models against the previous plain-class
+implementations (reproduced below as `Legacy*`).
+
+Usage:
+    python -m benchmarks.bench_models [--count 100000]
+"""
+
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+
+from models.bill_model import Bill, BillItem
+from models.product_model import Product
+
+
+class LegacyProduct:
+    """Plain-class Product with a per-instance __dict__, as before slots"""
+
+    def __init__(self, product_id, name, price, category, updated_at=None, barcode=""):
+        self.product_id = product_id
+        self.name = name
+        self.price = price
+        self.category = category
+        self.updated_at = updated_at
+        self.barcode = barcode
+
+    def to_dict(self):
+        return {
+            "product_id": self.product_id,
+            "name": self.name,
+            "price": self.price,
+            "category": self.category,
+            "updated_at": self.updated_at,
+            "barcode": self.barcode
+        }
+
+    @staticmethod
+    def from_dict(source):
+        try:
+            updated_at = source.get("updated_at")
+            if isinstance(updated_at, str):
+                updated_at = datetime.fromisoformat(updated_at)
+            return LegacyProduct(
+                product_id=source.get("product_id", ""),
+                name=source.get("name", ""),
+                price=source.get("price", 0.0),
+                category=source.get("category", ""),
+                updated_at=updated_at,
+                barcode=str(source.get("barcode") or "")
+            )
+        except Exception as e:
+            raise ValueError(f"Failed to parse Product from dict: {e}")
+
+
+class LegacyBillItem:
+    """Plain-class BillItem, as before slots"""
+
+    def __init__(self, product_id, product_name, quantity, price, total):
+        self.product_id = product_id
+        self.product_name = product_name
+        self.quantity = quantity
+        self.price = price
+        self.total = total
+
+    def to_dict(self):
+        return {
+            "product_id": self.product_id,
+            "product_name": self.product_name,
+            "quantity": self.quantity,
+            "price": self.price,
+            "total": self.total
+        }
+
+    @staticmethod
+    def from_dict(source):
+        return LegacyBillItem(
+            product_id=source.get("product_id", ""),
+            product_name=source.get("product_name", ""),
+            quantity=source.get("quantity", 0),
+            price=source.get("price", 0.0),
+            total=source.get("total", 0.0)
+        )
+
+
+class LegacyBill:
+    """Plain-class Bill, as before slots"""
+
+    def __init__(self, bill_no, customer_name, customer_phone, items=None, medical_total=0.0, grocery_total=0.0,
+                 drinks_total=0.0, medical_tax=0.0, grocery_tax=0.0, drinks_tax=0.0, total_amount=0.0,
+                 timestamp=None):
+        self.bill_no = bill_no
+        self.customer_name = customer_name
+        self.customer_phone = customer_phone
+        self.items = items or []
+        self.medical_total = medical_total
+        self.grocery_total = grocery_total
+        self.drinks_total = drinks_total
+        self.medical_tax = medical_tax
+        self.grocery_tax = grocery_tax
+        self.drinks_tax = drinks_tax
+        self.total_amount = total_amount
+        self.timestamp = timestamp or datetime.now()
+
+    @staticmethod
+    def from_dict(source):
+        try:
+            items = [LegacyBillItem.from_dict(item) for item in source.get("items", [])]
+            timestamp = source.get("timestamp")
+            if isinstance(timestamp, str):
+                timestamp = datetime.fromisoformat(timestamp)
+            return LegacyBill(
+                bill_no=source.get("bill_no", ""),
+                customer_name=source.get("customer_name", ""),
+                customer_phone=source.get("customer_phone", ""),
+                items=items,
+                medical_total=source.get("medical_total", 0.0),
+                grocery_total=source.get("grocery_total", 0.0),
+                drinks_total=source.get("drinks_total", 0.0),
+                medical_tax=source.get("medical_tax", 0.0),
+                grocery_tax=source.get("grocery_tax", 0.0),
+                drinks_tax=source.get("drinks_tax", 0.0),
+                total_amount=source.get("total_amount", 0.0),
+                timestamp=timestamp
+            )
+        except Exception as e:
+            raise ValueError(f"Failed to parse Bill from dict: {e}")
+
+
+def product_doc(i):
+    return {"product_id": f"prd_{i}", "name": f"Product {i}", "price": 1000 + i % 9000, "amount_unit": "paise",
+            "category": "grocery", "updated_at": None, "barcode": f"890{i:010d}"}
+
+
+def bill_doc(i, lines=5):
+    items = [{"product_id": f"prd_{j}", "product_name": f"Product {j}", "quantity": 2,
+              "price": 1250, "total": 2500} for j in range(lines)]
+    return {"bill_no": str(i), "customer_name": "Customer", "customer_phone": "9999999999", "items": items,
+            "medical_total": 0, "grocery_total": 12500, "drinks_total": 0, "medical_tax": 0,
+            "grocery_tax": 125, "drinks_tax": 0, "total_amount": 12625, "amount_unit": "paise",
+            "timestamp": "2025-01-01T10:00:00"}
+
+
+def bytes_per_object(factory, count):
+    """Average traced allocation per object built by `factory`"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def ops_per_second(func, items):
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return len(items) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark model memory and (de)serialization')
+    parser.add_argument('--count', type=int, default=100000, help='Objects per measurement')
+    args = parser.parse_args()
+    n = args.count
+
+    product_docs = [product_doc(i) for i in range(n)]
+    bill_docs = [bill_doc(i) for i in range(n // 10)]
+
+    print(f"{'Measurement':<34}{'Before':>14}{'After':>14}{'Change':>10}")
+    rows = [
+        ("Product bytes/object",
+         bytes_per_object(lambda i: LegacyProduct.from_dict(product_docs[i]), n),
+         bytes_per_object(lambda i: Product.from_dict(product_docs[i]), n)),
+        ("BillItem bytes/object",
+         bytes_per_object(lambda i: LegacyBillItem("p", "name", 1, 100, 100), n),
+         bytes_per_object(lambda i: BillItem("p", "name", 1, 100, 100), n)),
+        ("Bill (5 lines) bytes/object",
+         bytes_per_object(lambda i: LegacyBill.from_dict(bill_docs[i]), len(bill_docs)),
+         bytes_per_object(lambda i: Bill.from_dict(bill_docs[i]), len(bill_docs))),
+    ]
+
+    legacy_products = [LegacyProduct.from_dict(d) for d in product_docs]
+    products = [Product.from_dict(d) for d in product_docs]
+    rows += [
+        ("Product.from_dict ops/s",
+         ops_per_second(LegacyProduct.from_dict, product_docs), ops_per_second(Product.from_dict, product_docs)),
+        ("Product.to_dict ops/s",
+         ops_per_second(LegacyProduct.to_dict, legacy_products), ops_per_second(Product.to_dict, products)),
+        ("Bill.from_dict (5 lines) ops/s",
+         ops_per_second(LegacyBill.from_dict, bill_docs), ops_per_second(Bill.from_dict, bill_docs)),
+    ]
+
+    for label, before, after in rows:
+        change = (after / before - 1) * 100
+        print(f"{label:<34}{before:>14,.0f}{after:>14,.0f}{change:>+9.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -79,6 +79,26 @@ def login_cache_path() -> str:
     return ensure_dir(os.path.join(cache_path(), "login"))
 
 
+def catalog_cache_path() -> str:
+    """
+    Get the path to the product catalog cache directory.
+
+    Returns:
+        str: Full path to the catalog cache directory.
+    """
+    return ensure_dir(os.path.join(cache_path(), "catalog"))
+
+
+def imports_cache_path() -> str:
+    """
+    Get the path to the directory holding bulk import checkpoints.
+
+    Returns:
+        str: Full path to the imports cache directory.
+    """
+    return ensure_dir(os.path.join(cache_path(), "imports"))
+
+
 def bills_path() -> str:
     """
     Get the path to the directory where billing data/files should be stored.
@@ -1,7 +1,18 @@
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from itertools import islice
+from typing import List, Optional, Tuple
 
+from models.money import AMOUNT_UNIT, to_paise
 
+_AMOUNT_FIELDS = ("medical_total", "grocery_total", "drinks_total",
+                  "medical_tax", "grocery_tax", "drinks_tax", "total_amount")
+
+# Marker of the compact item encoding: one array per BillItem field instead of one map per item
+COLUMNAR_ITEMS = "columns-1"
+
+
+@dataclass(slots=True)
 class BillItem:
     """
     Represents a single item in a bill.
@@ -10,16 +21,22 @@ class BillItem:
         product_id (str): Unique identifier for the product.
         product_name (str): Name of the product.
         quantity (int): Quantity of the product purchased.
-        price (float): Price per unit of the product.
-        total (float): Total cost for the item (quantity * price).
+        price (int): Price per unit of the product, in paise.
+        total (int): Total cost for the item (quantity * price), in paise.
+        category (str): Product category at billing time; empty on bills saved before it was recorded.
+        tax_rate (Optional[int]): Tax rate applied, in basis points; None on bills saved before it was recorded.
+        discount (int): Promotion discount on the item, in paise; tax is charged on `total - discount`.
+        promotions (Tuple[str, ...]): IDs of the promotions that gave the discount.
     """
-
-    def __init__(self, product_id: str, product_name: str, quantity: int, price: float, total: float):
-        self.product_id = product_id
-        self.product_name = product_name
-        self.quantity = quantity
-        self.price = price
-        self.total = total
+    product_id: str
+    product_name: str
+    quantity: int
+    price: int
+    total: int
+    category: str = ""
+    tax_rate: Optional[int] = None
+    discount: int = 0
+    promotions: Tuple[str, ...] = ()
 
     def to_dict(self) -> dict:
         """Serializes the BillItem object to a dictionary."""
@@ -28,7 +45,11 @@ class BillItem:
             "product_name": self.product_name,
             "quantity": self.quantity,
             "price": self.price,
-            "total": self.total
+            "total": self.total,
+            "category": self.category,
+            "tax_rate": self.tax_rate,
+            "discount": self.discount,
+            "promotions": list(self.promotions)
         }
 
     @staticmethod
@@ -42,15 +63,33 @@ class BillItem:
         Returns:
             BillItem: The reconstructed BillItem object.
         """
-        return BillItem(
-            product_id=source.get("product_id", ""),
-            product_name=source.get("product_name", ""),
-            quantity=source.get("quantity", 0),
-            price=source.get("price", 0.0),
-            total=source.get("total", 0.0)
-        )
+        try:
+            return BillItem(
+                source["product_id"],
+                source["product_name"],
+                source["quantity"],
+                source["price"],
+                source["total"],
+                source.get("category", ""),
+                source.get("tax_rate"),
+                source.get("discount", 0),
+                tuple(source.get("promotions", ()))
+            )
+        except KeyError:
+            return BillItem(
+                product_id=source.get("product_id", ""),
+                product_name=source.get("product_name", ""),
+                quantity=source.get("quantity", 0),
+                price=source.get("price", 0),
+                total=source.get("total", 0),
+                category=source.get("category", ""),
+                tax_rate=source.get("tax_rate"),
+                discount=source.get("discount", 0),
+                promotions=tuple(source.get("promotions", ()))
+            )
 
 
+@dataclass(slots=True)
 class Bill:
     """
     Represents a full customer bill with multiple categories and tax calculations.
@@ -60,47 +99,50 @@ class Bill:
         customer_name (str): Name of the customer.
         customer_phone (str): Phone number of the customer.
         items (List[BillItem]): List of billed items.
-        medical_total, grocery_total, drinks_total (float): Totals for each category.
-        medical_tax, grocery_tax, drinks_tax (float): Tax amounts per category.
-        total_amount (float): Grand total of the bill.
+        medical_total, grocery_total, drinks_total (int): Totals for each category, in paise.
+        medical_tax, grocery_tax, drinks_tax (int): Tax amounts per category, in paise.
+        total_amount (int): Grand total of the bill, in paise.
         timestamp (datetime): Date and time when the bill was created.
+        invoice_no (Optional[int]): Sequential invoice number within the shop; None if none was assigned.
+        shop_id (Optional[str]): UID of the shop that issued the bill; None on bills saved before it was recorded.
     """
+    bill_no: str
+    customer_name: str
+    customer_phone: str
+    items: List[BillItem] = field(default_factory=list)
+    medical_total: int = 0
+    grocery_total: int = 0
+    drinks_total: int = 0
+    medical_tax: int = 0
+    grocery_tax: int = 0
+    drinks_tax: int = 0
+    total_amount: int = 0
+    timestamp: Optional[datetime] = None
+    invoice_no: Optional[int] = None
+    shop_id: Optional[str] = None
 
-    def __init__(
-            self,
-            bill_no: str,
-            customer_name: str,
-            customer_phone: str,
-            items: Optional[List[BillItem]] = None,
-            medical_total: float = 0.0,
-            grocery_total: float = 0.0,
-            drinks_total: float = 0.0,
-            medical_tax: float = 0.0,
-            grocery_tax: float = 0.0,
-            drinks_tax: float = 0.0,
-            total_amount: float = 0.0,
-            timestamp: Optional[datetime] = None
-    ):
-        self.bill_no = bill_no
-        self.customer_name = customer_name
-        self.customer_phone = customer_phone
-        self.items = items or []
-        self.medical_total = medical_total
-        self.grocery_total = grocery_total
-        self.drinks_total = drinks_total
-        self.medical_tax = medical_tax
-        self.grocery_tax = grocery_tax
-        self.drinks_tax = drinks_tax
-        self.total_amount = total_amount
-        self.timestamp = timestamp or datetime.now()
+    def __post_init__(self):
+        if self.items is None:
+            self.items = []
+        if self.timestamp is None:
+            self.timestamp = datetime.now()
 
-    def to_dict(self) -> dict:
-        """Serializes the Bill object to a dictionary format suitable for Firestore or JSON."""
-        return {
+    def to_dict(self, compact: bool = False) -> dict:
+        """
+        Serializes the Bill object to a dictionary format suitable for Firestore or JSON.
+
+        Args:
+            compact (bool, optional): Store items as parallel arrays (see `_items_to_columns`)
+                instead of one map per item. Versions before this encoding cannot read it.
+
+        Returns:
+            dict: The serialized bill.
+        """
+        data = {
             "bill_no": self.bill_no,
             "customer_name": self.customer_name,
             "customer_phone": self.customer_phone,
-            "items": [item.to_dict() for item in self.items],
+            "items": self._items_to_columns() if compact else [item.to_dict() for item in self.items],
             "medical_total": self.medical_total,
             "grocery_total": self.grocery_total,
             "drinks_total": self.drinks_total,
@@ -108,39 +150,197 @@ class Bill:
             "grocery_tax": self.grocery_tax,
             "drinks_tax": self.drinks_tax,
             "total_amount": self.total_amount,
-            "timestamp": self.timestamp.isoformat()
+            "amount_unit": AMOUNT_UNIT,
+            "timestamp": self.timestamp.isoformat(),
+            "invoice_no": self.invoice_no,
+            "shop_id": self.shop_id
+        }
+        if compact:
+            data["items_layout"] = COLUMNAR_ITEMS
+        return data
+
+    def _items_to_columns(self) -> dict:
+        """
+        Encode the items as one array per field, so field names are stored once per bill.
+
+        Columns whose values are all defaults (no categories, rates, discounts or
+        promotions) are left out. Promotion IDs of all items are flattened into one
+        array with a per-item count, as Firestore arrays cannot nest.
+        """
+        items = self.items
+        columns = {
+            "product_id": [item.product_id for item in items],
+            "product_name": [item.product_name for item in items],
+            "quantity": [item.quantity for item in items],
+            "price": [item.price for item in items],
+            "total": [item.total for item in items],
         }
+        if any(item.category for item in items):
+            columns["category"] = [item.category for item in items]
+        if any(item.tax_rate is not None for item in items):
+            columns["tax_rate"] = [item.tax_rate for item in items]
+        if any(item.discount for item in items):
+            columns["discount"] = [item.discount for item in items]
+        if any(item.promotions for item in items):
+            columns["promotion_count"] = [len(item.promotions) for item in items]
+            columns["promotion_ids"] = [promotion for item in items for promotion in item.promotions]
+        return columns
+
+    @staticmethod
+    def _items_from_columns(columns: dict) -> List[BillItem]:
+        """
+        Decode items stored by `_items_to_columns`.
+
+        Raises:
+            ValueError: If a column's length differs from the number of items, or the promotion
+                IDs do not match the per-item counts.
+        """
+        try:
+            count = len(columns["product_id"])
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"malformed item columns: {e!r}")
+        for name in ("product_name", "quantity", "price", "total", "category", "tax_rate", "discount",
+                     "promotion_count"):
+            if name in columns and len(columns[name]) != count:
+                raise ValueError(f"malformed item columns: '{name}' has {len(columns[name])} values "
+                                 f"for {count} items")
+
+        promotions = [()] * count
+        if "promotion_count" in columns:
+            ids = columns.get("promotion_ids", [])
+            if sum(columns["promotion_count"]) != len(ids):
+                raise ValueError("malformed item columns: promotion_ids does not match promotion_count")
+            ids = iter(ids)
+            promotions = [tuple(islice(ids, n)) for n in columns["promotion_count"]]
+        elif columns.get("promotion_ids"):
+            raise ValueError("malformed item columns: promotion_ids without promotion_count")
+
+        return [
+            BillItem(*fields)
+            for fields in zip(
+                columns["product_id"], columns.get("product_name") or [""] * count,
+                columns.get("quantity") or [0] * count, columns.get("price") or [0] * count,
+                columns.get("total") or [0] * count,
+                columns.get("category") or [""] * count,
+                columns.get("tax_rate") or [None] * count,
+                columns.get("discount") or [0] * count,
+                promotions,
+                strict=True
+            )
+        ]
 
     @staticmethod
     def from_dict(source: dict) -> 'Bill':
         """
         Creates a Bill instance from a dictionary.
 
+        Complete documents take a direct-indexing fast path; documents missing
+        fields fall back to per-field defaults. Amounts stored as float rupees by
+        older versions are converted to paise. Items may be stored either as a list
+        of maps or in the compact columnar layout.
+
         Args:
             source (dict): Dictionary representation of a Bill.
 
         Returns:
             Bill: The reconstructed Bill object.
+
+        Raises:
+            ValueError: If the source dictionary is malformed.
         """
         try:
-            items = [BillItem.from_dict(item) for item in source.get("items", [])]
+            if source.get("amount_unit") != AMOUNT_UNIT:
+                source = Bill._legacy_to_paise(source)
             timestamp = source.get("timestamp")
             if isinstance(timestamp, str):
                 timestamp = datetime.fromisoformat(timestamp)
+            layout = source.get("items_layout")
+            if layout is None:
+                item_from_dict = BillItem.from_dict
+                items = [item_from_dict(item) for item in source.get("items", [])]
+            elif layout == COLUMNAR_ITEMS:
+                items = Bill._items_from_columns(source["items"])
+            else:
+                raise ValueError(f"unknown items layout {layout!r}")
 
-            return Bill(
-                bill_no=source.get("bill_no", ""),
-                customer_name=source.get("customer_name", ""),
-                customer_phone=source.get("customer_phone", ""),
-                items=items,
-                medical_total=source.get("medical_total", 0.0),
-                grocery_total=source.get("grocery_total", 0.0),
-                drinks_total=source.get("drinks_total", 0.0),
-                medical_tax=source.get("medical_tax", 0.0),
-                grocery_tax=source.get("grocery_tax", 0.0),
-                drinks_tax=source.get("drinks_tax", 0.0),
-                total_amount=source.get("total_amount", 0.0),
-                timestamp=timestamp
-            )
-        except Exception as e:
+            try:
+                return Bill(
+                    source["bill_no"],
+                    source["customer_name"],
+                    source["customer_phone"],
+                    items,
+                    source["medical_total"],
+                    source["grocery_total"],
+                    source["drinks_total"],
+                    source["medical_tax"],
+                    source["grocery_tax"],
+                    source["drinks_tax"],
+                    source["total_amount"],
+                    timestamp,
+                    source.get("invoice_no"),
+                    source.get("shop_id")
+                )
+            except KeyError:
+                return Bill(
+                    bill_no=source.get("bill_no", ""),
+                    customer_name=source.get("customer_name", ""),
+                    customer_phone=source.get("customer_phone", ""),
+                    items=items,
+                    medical_total=source.get("medical_total", 0),
+                    grocery_total=source.get("grocery_total", 0),
+                    drinks_total=source.get("drinks_total", 0),
+                    medical_tax=source.get("medical_tax", 0),
+                    grocery_tax=source.get("grocery_tax", 0),
+                    drinks_tax=source.get("drinks_tax", 0),
+                    total_amount=source.get("total_amount", 0),
+                    timestamp=timestamp,
+                    invoice_no=source.get("invoice_no"),
+                    shop_id=source.get("shop_id")
+                )
+        except (TypeError, ValueError, AttributeError) as e:
             raise ValueError(f"Failed to parse Bill from dict: {e}")
+
+    @staticmethod
+    def _legacy_to_paise(source: dict) -> dict:
+        """Copy a document whose amounts are float rupees, converting them to paise."""
+        converted = dict(source)
+        for name in _AMOUNT_FIELDS:
+            if name in converted:
+                converted[name] = to_paise(converted[name])
+        converted["items"] = [
+            {**item, **{name: to_paise(item[name]) for name in ("price", "total", "discount") if name in item}}
+            for item in source.get("items", [])
+        ]
+        return converted
+
+
+@dataclass(slots=True)
+class BillHeader:
+    """
+    The searchable summary of a bill, without its items.
+
+    Attributes:
+        bill_no (str): Unique bill number.
+        customer_name (str): Name of the customer.
+        customer_phone (str): Phone number of the customer.
+        timestamp (Optional[datetime]): Date and time when the bill was created.
+        total_amount (int): Grand total of the bill, in paise.
+    """
+    bill_no: str
+    customer_name: str
+    customer_phone: str
+    timestamp: Optional[datetime]
+    total_amount: int
+
+    @staticmethod
+    def from_bill(bill: Bill) -> 'BillHeader':
+        """
+        Creates a BillHeader from a full bill.
+
+        Args:
+            bill (Bill): The bill to summarize.
+
+        Returns:
+            BillHeader: The bill's header.
+        """
+        return BillHeader(bill.bill_no, bill.customer_name, bill.customer_phone, bill.timestamp, bill.total_amount)
@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+
+@dataclass(slots=True)
+class InvoiceLease:
+    """
+    A block of sequential invoice numbers reserved by one terminal.
+
+    The block covers `start` up to, but not including, `end`. Numbers from `next`
+    onwards have not been issued yet.
+
+    Attributes:
+        terminal_id (str): Terminal holding the lease.
+        start (int): First number of the block.
+        end (int): One past the last number of the block.
+        next (int): Next number to issue.
+        expires_at (datetime): Time after which the terminal stops issuing from the block.
+    """
+    terminal_id: str
+    start: int
+    end: int
+    next: int
+    expires_at: datetime
+
+    @property
+    def remaining(self) -> int:
+        """Numbers in the block that have not been issued."""
+        return self.end - self.next
+
+    def is_expired(self, now: Optional[datetime] = None) -> bool:
+        """
+        Check whether the lease has run out.
+
+        Args:
+            now (Optional[datetime]): Time to check at. Defaults to the current UTC time.
+
+        Returns:
+            bool: True if the lease has expired.
+        """
+        expires_at = self.expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return (now or datetime.now(timezone.utc)) >= expires_at
+
+    def to_dict(self) -> dict:
+        """Serializes the InvoiceLease object to a dictionary."""
+        return {
+            "terminal_id": self.terminal_id,
+            "start": self.start,
+            "end": self.end,
+            "next": self.next,
+            "expires_at": self.expires_at
+        }
+
+    @staticmethod
+    def from_dict(source: dict) -> 'InvoiceLease':
+        """
+        Creates an InvoiceLease instance from a dictionary.
+
+        Args:
+            source (dict): Dictionary representation of an InvoiceLease.
+
+        Returns:
+            InvoiceLease: The reconstructed InvoiceLease object.
+
+        Raises:
+            ValueError: If a field is missing or the range is malformed.
+        """
+        try:
+            start = int(source["start"])
+            end = int(source["end"])
+            next_no = int(source.get("next", start))
+            if not start <= next_no <= end:
+                raise ValueError(f"start={start}, next={next_no}, end={end}")
+            expires_at = source["expires_at"]
+            if isinstance(expires_at, str):
+                expires_at = datetime.fromisoformat(expires_at)
+            return InvoiceLease(
+                terminal_id=source.get("terminal_id", ""),
+                start=start,
+                end=end,
+                next=next_no,
+                expires_at=expires_at
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Failed to parse InvoiceLease from dict: {e}")
@@ -0,0 +1,111 @@
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Iterable
+
+# Stored on documents whose amounts are integer paise; documents without it hold float rupees
+AMOUNT_UNIT = "paise"
+
+_HUNDRED = Decimal(100)
+_ONE = Decimal(1)
+
+
+def to_paise(amount) -> int:
+    """
+    Convert a rupee amount to whole paise, rounding half up.
+
+    Floats are converted through their shortest decimal representation, so
+    12.35 becomes 1235 rather than 1234.
+
+    Args:
+        amount (int | float | str | Decimal): Amount in rupees, e.g. 12.5 or "1,250.00".
+
+    Returns:
+        int: Amount in paise.
+
+    Raises:
+        ValueError: If the amount is not a finite number.
+    """
+    if isinstance(amount, bool):
+        raise ValueError(f"Invalid amount '{amount}'")
+    if isinstance(amount, int):
+        return amount * 100
+    try:
+        value = Decimal(str(amount).replace(",", "").strip())
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount '{amount}'")
+    if not value.is_finite():
+        raise ValueError(f"Invalid amount '{amount}'")
+    return int((value * _HUNDRED).quantize(_ONE, rounding=ROUND_HALF_UP))
+
+
+def tax_on(subtotal: int, rate_bp: int) -> int:
+    """
+    Tax on a subtotal, rounded to the paisa with exact halves rounded up.
+
+    Args:
+        subtotal (int): Taxable amount in paise.
+        rate_bp (int): Tax rate in basis points (500 = 5%).
+
+    Returns:
+        int: Tax in paise.
+    """
+    return round_basis_points(subtotal * rate_bp)
+
+
+def round_basis_points(value: int) -> int:
+    """
+    Convert a sum of paise-times-basis-point products to paise, with exact halves rounded up.
+
+    Summing `total * rate_bp` over lines with different rates and rounding once gives the
+    same result as tax_on when all rates are equal.
+
+    Args:
+        value (int): Sum of amount (paise) times rate (basis points).
+
+    Returns:
+        int: Amount in paise.
+    """
+    return (value + 5000) // 10000
+
+
+def format_rupees(paise: int) -> str:
+    """
+    Format paise for display, e.g. 123405 -> "₹1234.05".
+
+    Args:
+        paise (int): Amount in paise.
+
+    Returns:
+        str: The amount in rupees with two decimals.
+    """
+    sign = "-" if paise < 0 else ""
+    rupees, rest = divmod(abs(paise), 100)
+    return f"{sign}₹{rupees}.{rest:02d}"
+
+
+def format_rate(rate_bp: int) -> str:
+    """
+    Format a basis-point rate as a percentage, e.g. 500 -> "5%", 1250 -> "12.5%".
+
+    Args:
+        rate_bp (int): Rate in basis points.
+
+    Returns:
+        str: The rate as a percentage.
+    """
+    whole, rest = divmod(rate_bp, 100)
+    return f"{whole}%" if not rest else f"{whole}.{rest:02d}".rstrip("0") + "%"
+
+
+def format_tax_label(name: str, rates_bp: Iterable[int]) -> str:
+    """
+    Format a printed tax line label, e.g. ("Medical Tax", [500, 1200]) -> "Medical Tax (5%, 12%)".
+
+    Args:
+        name (str): Tax name.
+        rates_bp (Iterable[int]): Rates in basis points, in the order to print them.
+
+    Returns:
+        str: The label, or just the name when there are no rates.
+    """
+    rates = ", ".join(format_rate(rate_bp) for rate_bp in rates_bp)
+    return f"{name} ({rates})" if rates else name
@@ -1,3 +1,11 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from models.money import AMOUNT_UNIT, to_paise
+
+
+@dataclass(slots=True)
 class Product:
     """
     Represents a product item in the billing system.
@@ -5,15 +13,19 @@ class Product:
     Attributes:
         product_id (str): Unique identifier for the product.
         name (str): Name of the product.
-        price (float): Price of the product.
+        price (int): Price of the product in paise.
         category (str): Category to which the product belongs (e.g., medical, grocery, drinks).
+        updated_at (Optional[datetime]): Server time of the last write to the product, if known.
+        barcode (str): Barcode/SKU printed on the product, used by counter scanners.
+        hsn_code (str): HSN code used to look up a product-specific tax rate, if any.
     """
-
-    def __init__(self, product_id: str, name: str, price: float, category: str):
-        self.product_id = product_id
-        self.name = name
-        self.price = price
-        self.category = category
+    product_id: str
+    name: str
+    price: int
+    category: str
+    updated_at: Optional[datetime] = None
+    barcode: str = ""
+    hsn_code: str = ""
 
     def to_dict(self) -> dict:
         """
@@ -26,7 +38,11 @@ class Product:
             "product_id": self.product_id,
             "name": self.name,
             "price": self.price,
-            "category": self.category
+            "amount_unit": AMOUNT_UNIT,
+            "category": self.category,
+            "updated_at": self.updated_at,
+            "barcode": self.barcode,
+            "hsn_code": self.hsn_code
         }
 
     @staticmethod
@@ -34,6 +50,10 @@ class Product:
         """
         Creates a Product instance from a dictionary.
 
+        Complete documents take a direct-indexing fast path; documents missing
+        fields fall back to per-field defaults. Prices stored as float rupees by
+        older versions are converted to paise.
+
         Args:
             source (dict): Dictionary representation of a product.
 
@@ -43,12 +63,47 @@ class Product:
         Raises:
             ValueError: If the source dictionary is malformed.
         """
+        try:
+            return Product(
+                source["product_id"],
+                source["name"],
+                _price(source, source["price"]),
+                source["category"],
+                _as_datetime(source.get("updated_at")),
+                str(source.get("barcode") or ""),
+                str(source.get("hsn_code") or "")
+            )
+        except KeyError:
+            return Product._from_partial_dict(source)
+        except (TypeError, ValueError, AttributeError) as e:
+            raise ValueError(f"Failed to parse Product from dict: {e}")
+
+    @staticmethod
+    def _from_partial_dict(source: dict) -> 'Product':
+        """Build a Product from a document that lacks some fields, using defaults."""
         try:
             return Product(
                 product_id=source.get("product_id", ""),
                 name=source.get("name", ""),
-                price=source.get("price", 0.0),
-                category=source.get("category", "")
+                price=_price(source, source.get("price", 0)),
+                category=source.get("category", ""),
+                updated_at=_as_datetime(source.get("updated_at")),
+                barcode=str(source.get("barcode") or ""),
+                hsn_code=str(source.get("hsn_code") or "")
             )
         except Exception as e:
             raise ValueError(f"Failed to parse Product from dict: {e}")
+
+
+def _price(source: dict, value) -> int:
+    """Return a document price in paise, converting legacy rupee prices."""
+    if source.get("amount_unit") == AMOUNT_UNIT:
+        return int(value)
+    return to_paise(value)
+
+
+def _as_datetime(value) -> Optional[datetime]:
+    """Accept a datetime, an ISO-8601 string or None."""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
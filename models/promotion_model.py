@@ -0,0 +1,123 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+
+@dataclass(slots=True)
+class Promotion:
+    """
+    A discount rule.
+
+    Kinds:
+    - "bundle": one unit of each product in `product_ids` sells together for `bundle_price`.
+    - "buy_x_get_y": on a matching line, every `buy_quantity + get_quantity` units include
+      `get_quantity` free units.
+    - "tiered": a matching line gets the discount of the highest tier its quantity reaches.
+
+    Buy-X-get-Y and tiered rules match lines by product ID or by category.
+
+    Attributes:
+        promotion_id (str): Unique identifier of the promotion.
+        name (str): Name shown on bills.
+        kind (str): One of BUNDLE, BUY_X_GET_Y or TIERED.
+        product_ids (List[str]): Products the rule applies to (bundle members for bundles).
+        categories (List[str]): Categories the rule applies to (not used by bundles).
+        buy_quantity (int): Units to pay for in a buy-X-get-Y group.
+        get_quantity (int): Free units in a buy-X-get-Y group.
+        bundle_price (int): Price of one bundle, in paise.
+        tiers (List[Tuple[int, int]]): (minimum quantity, discount in basis points) pairs.
+        active (bool): Whether the promotion is switched on.
+        starts_at (Optional[datetime]): Start of the validity window, if any.
+        ends_at (Optional[datetime]): End of the validity window, if any.
+    """
+    promotion_id: str
+    name: str
+    kind: str
+    product_ids: List[str] = field(default_factory=list)
+    categories: List[str] = field(default_factory=list)
+    buy_quantity: int = 0
+    get_quantity: int = 0
+    bundle_price: int = 0
+    tiers: List[Tuple[int, int]] = field(default_factory=list)
+    active: bool = True
+    starts_at: Optional[datetime] = None
+    ends_at: Optional[datetime] = None
+
+    BUNDLE = "bundle"
+    BUY_X_GET_Y = "buy_x_get_y"
+    TIERED = "tiered"
+
+    def is_live(self, now: Optional[datetime] = None) -> bool:
+        """
+        Check whether the promotion is active and inside its validity window.
+
+        Firestore returns the window in UTC; all times are compared as timezone-aware
+        values, with naive ones taken as local time.
+
+        Args:
+            now (Optional[datetime]): Time to check at. Defaults to the current time.
+
+        Returns:
+            bool: True if the promotion applies at `now`.
+        """
+        if not self.active:
+            return False
+        now = now.astimezone() if now is not None else datetime.now(timezone.utc)
+        if self.starts_at is not None and now < self.starts_at.astimezone():
+            return False
+        if self.ends_at is not None and now >= self.ends_at.astimezone():
+            return False
+        return True
+
+    def to_dict(self) -> dict:
+        """Serializes the Promotion object to a dictionary."""
+        return {
+            "promotion_id": self.promotion_id,
+            "name": self.name,
+            "kind": self.kind,
+            "product_ids": list(self.product_ids),
+            "categories": list(self.categories),
+            "buy_quantity": self.buy_quantity,
+            "get_quantity": self.get_quantity,
+            "bundle_price": self.bundle_price,
+            "tiers": [{"min_quantity": q, "discount_bp": bp} for q, bp in self.tiers],
+            "active": self.active,
+            "starts_at": self.starts_at,
+            "ends_at": self.ends_at
+        }
+
+    @staticmethod
+    def from_dict(source: dict) -> 'Promotion':
+        """
+        Creates a Promotion instance from a dictionary.
+
+        Args:
+            source (dict): Dictionary representation of a Promotion.
+
+        Returns:
+            Promotion: The reconstructed Promotion object.
+
+        Raises:
+            ValueError: If the kind is unknown or a field is malformed.
+        """
+        try:
+            kind = source["kind"]
+            if kind not in (Promotion.BUNDLE, Promotion.BUY_X_GET_Y, Promotion.TIERED):
+                raise ValueError(f"unknown kind {kind!r}")
+            tiers = sorted((int(t["min_quantity"]), int(t["discount_bp"])) for t in source.get("tiers", []))
+            return Promotion(
+                promotion_id=source.get("promotion_id", ""),
+                name=source.get("name", ""),
+                kind=kind,
+                product_ids=list(source.get("product_ids", [])),
+                categories=[str(c).lower() for c in source.get("categories", [])],
+                buy_quantity=int(source.get("buy_quantity", 0)),
+                get_quantity=int(source.get("get_quantity", 0)),
+                bundle_price=int(source.get("bundle_price", 0)),
+                tiers=tiers,
+                active=bool(source.get("active", True)),
+                starts_at=source.get("starts_at"),
+                ends_at=source.get("ends_at")
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Failed to parse Promotion from dict: {e}")
@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class TaxRate:
+    """
+    One row of the tax rate table.
+
+    A rate applies either to every product in a category or to products with a
+    given HSN code; an HSN rate takes precedence over its product's category rate.
+
+    Attributes:
+        rate_id (str): Document ID, e.g. "category:medical" or "hsn:3004".
+        kind (str): "category" or "hsn".
+        key (str): Category name or HSN code the rate applies to.
+        rate_bp (int): Tax rate in basis points (500 = 5%).
+        label (str): Name printed on bills, e.g. "Medical Tax".
+    """
+    rate_id: str
+    kind: str
+    key: str
+    rate_bp: int
+    label: str = ""
+
+    CATEGORY = "category"
+    HSN = "hsn"
+
+    def to_dict(self) -> dict:
+        """Serializes the TaxRate object to a dictionary."""
+        return {
+            "rate_id": self.rate_id,
+            "kind": self.kind,
+            "key": self.key,
+            "rate_bp": self.rate_bp,
+            "label": self.label
+        }
+
+    @staticmethod
+    def from_dict(source: dict) -> 'TaxRate':
+        """
+        Creates a TaxRate instance from a dictionary.
+
+        Args:
+            source (dict): Dictionary representation of a TaxRate.
+
+        Returns:
+            TaxRate: The reconstructed TaxRate object.
+
+        Raises:
+            ValueError: If the kind is unknown or the rate is not a non-negative integer.
+        """
+        try:
+            kind = source["kind"]
+            rate_bp = int(source["rate_bp"])
+            if kind not in (TaxRate.CATEGORY, TaxRate.HSN) or rate_bp < 0:
+                raise ValueError(f"kind={kind!r}, rate_bp={rate_bp!r}")
+            key = str(source["key"]).strip().lower()
+            return TaxRate(
+                rate_id=source.get("rate_id") or f"{kind}:{key}",
+                kind=kind,
+                key=key,
+                rate_bp=rate_bp,
+                label=source.get("label", "")
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Failed to parse TaxRate from dict: {e}")
@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import Dict, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     """
     Represents an authenticated user in the billing system.
@@ -0,0 +1,218 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from config import cache_path
+from models.bill_model import BillHeader
+
+
+class BillIndex:
+    """
+    Local SQLite full-text index of bill headers (number, customer, phone, time, total).
+
+    Headers live in a plain table; an FTS5 table with the trigram tokenizer indexes
+    the bill number, customer name and phone, so any fragment of three or more
+    characters - part of a name, a few phone digits - is an index lookup rather than
+    a scan. Shorter terms only match the start of a field and are checked while
+    walking bills newest first.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS bill_headers (
+            id INTEGER PRIMARY KEY,
+            bill_no TEXT NOT NULL UNIQUE,
+            customer_name TEXT NOT NULL DEFAULT '',
+            customer_phone TEXT NOT NULL DEFAULT '',
+            timestamp TEXT NOT NULL DEFAULT '',
+            total_amount INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_headers_timestamp ON bill_headers (timestamp);
+        CREATE VIRTUAL TABLE IF NOT EXISTS bill_search USING fts5(
+            bill_no, customer_name, customer_phone,
+            content='bill_headers', content_rowid='id', tokenize='trigram'
+        );
+        CREATE TRIGGER IF NOT EXISTS bill_headers_ai AFTER INSERT ON bill_headers BEGIN
+            INSERT INTO bill_search (rowid, bill_no, customer_name, customer_phone)
+            VALUES (new.id, new.bill_no, new.customer_name, new.customer_phone);
+        END;
+        CREATE TRIGGER IF NOT EXISTS bill_headers_ad AFTER DELETE ON bill_headers BEGIN
+            INSERT INTO bill_search (bill_search, rowid, bill_no, customer_name, customer_phone)
+            VALUES ('delete', old.id, old.bill_no, old.customer_name, old.customer_phone);
+        END;
+        CREATE TRIGGER IF NOT EXISTS bill_headers_au AFTER UPDATE ON bill_headers BEGIN
+            INSERT INTO bill_search (bill_search, rowid, bill_no, customer_name, customer_phone)
+            VALUES ('delete', old.id, old.bill_no, old.customer_name, old.customer_phone);
+            INSERT INTO bill_search (rowid, bill_no, customer_name, customer_phone)
+            VALUES (new.id, new.bill_no, new.customer_name, new.customer_phone);
+        END;
+        CREATE TABLE IF NOT EXISTS index_state (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    # Trigram matching needs at least this many characters per term
+    MIN_TERM_LENGTH = 3
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open (and create if needed) the index database.
+
+        Args:
+            path (Optional[str]): Database file. Defaults to `bill_index.db` in the cache directory.
+
+        Raises:
+            Exception: If the database cannot be opened, e.g. SQLite was built without FTS5.
+        """
+        self.path = path or os.path.join(cache_path(), "bill_index.db")
+        self._lock = threading.Lock()
+        try:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self._SCHEMA)
+        except Exception as e:
+            raise Exception(f"Failed to open bill index '{self.path}': {e}")
+
+    def add_many(self, headers: Iterable[BillHeader]) -> int:
+        """
+        Add or update bill headers in one transaction.
+
+        Args:
+            headers (Iterable[BillHeader]): Headers to index.
+
+        Returns:
+            int: Number of headers written.
+        """
+        rows = [
+            (h.bill_no, h.customer_name or "", h.customer_phone or "",
+             h.timestamp.isoformat() if isinstance(h.timestamp, datetime) else str(h.timestamp or ""),
+             h.total_amount)
+            for h in headers
+        ]
+        if not rows:
+            return 0
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN")
+                try:
+                    self._conn.executemany(
+                        "INSERT INTO bill_headers (bill_no, customer_name, customer_phone, timestamp, total_amount) "
+                        "VALUES (?, ?, ?, ?, ?) ON CONFLICT (bill_no) DO UPDATE SET "
+                        "customer_name = excluded.customer_name, customer_phone = excluded.customer_phone, "
+                        "timestamp = excluded.timestamp, total_amount = excluded.total_amount",
+                        rows
+                    )
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            return len(rows)
+        except Exception as e:
+            raise Exception(f"Failed to index {len(rows)} bills: {e}")
+
+    def remove(self, bill_no: str) -> None:
+        """
+        Remove a bill from the index.
+
+        Args:
+            bill_no (str): Bill number.
+        """
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM bill_headers WHERE bill_no = ?", (bill_no,))
+        except Exception as e:
+            raise Exception(f"Failed to remove bill '{bill_no}' from index: {e}")
+
+    def search(self, query: str, limit: int = 50) -> List[BillHeader]:
+        """
+        Find bills whose number, customer name or phone contains every term of the query.
+
+        Terms are matched case-insensitively anywhere in those fields and in any order,
+        so "kum 9845" finds "Ramesh Kumar, 98450 12345". Terms shorter than three
+        characters only match the start of a field.
+
+        Args:
+            query (str): Search text.
+            limit (int, optional): Maximum number of results.
+
+        Returns:
+            List[BillHeader]: Matching headers, newest first.
+        """
+        terms = query.split()
+        if not terms:
+            return []
+        long_terms = [t for t in terms if len(t) >= self.MIN_TERM_LENGTH]
+        short_terms = [t for t in terms if len(t) < self.MIN_TERM_LENGTH]
+
+        conditions, params = [], []
+        if long_terms:
+            conditions.append("id IN (SELECT rowid FROM bill_search WHERE bill_search MATCH ?)")
+            params.append(" AND ".join('"' + t.replace('"', '""') + '"' for t in long_terms))
+        for term in short_terms:
+            pattern = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            conditions.append("(customer_name LIKE ? ESCAPE '\\' OR customer_phone LIKE ? ESCAPE '\\' "
+                              "OR bill_no LIKE ? ESCAPE '\\')")
+            params += [pattern] * 3
+        sql = (f"SELECT bill_no, customer_name, customer_phone, timestamp, total_amount FROM bill_headers "
+               f"WHERE {' AND '.join(conditions)} ORDER BY timestamp DESC LIMIT ?")
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, params + [limit]).fetchall()
+            return [
+                BillHeader(bill_no, name, phone, datetime.fromisoformat(timestamp) if timestamp else None, total)
+                for bill_no, name, phone, timestamp, total in rows
+            ]
+        except Exception as e:
+            raise Exception(f"Failed to search bill index for '{query}': {e}")
+
+    def count(self) -> int:
+        """
+        Count indexed bills.
+
+        Returns:
+            int: Number of bills in the index.
+        """
+        try:
+            with self._lock:
+                return self._conn.execute("SELECT COUNT(*) FROM bill_headers").fetchone()[0]
+        except Exception as e:
+            raise Exception(f"Failed to count indexed bills: {e}")
+
+    def get_state(self, key: str) -> Optional[str]:
+        """
+        Read a value saved with `set_state`, e.g. how far the index has caught up with Firestore.
+
+        Args:
+            key (str): State key.
+
+        Returns:
+            Optional[str]: The saved value, or None.
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT value FROM index_state WHERE key = ?", (key,)).fetchone()
+            return row[0] if row else None
+        except Exception as e:
+            raise Exception(f"Failed to read index state '{key}': {e}")
+
+    def set_state(self, key: str, value: str) -> None:
+        """
+        Save a value alongside the index.
+
+        Args:
+            key (str): State key.
+            value (str): Value to save.
+        """
+        try:
+            with self._lock:
+                self._conn.execute("INSERT OR REPLACE INTO index_state (key, value) VALUES (?, ?)", (key, value))
+        except Exception as e:
+            raise Exception(f"Failed to save index state '{key}': {e}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,254 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from config import cache_path
+from models.bill_model import Bill
+
+
+class BillJournal:
+    """
+    Local SQLite journal of bills, written before anything is sent to Firestore.
+
+    The database runs in WAL mode, so appends from the UI thread do not wait on the
+    sync worker's reads. Each row keeps the serialized bill, a few columns used for
+    lookups, and its sync state.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS bills (
+            bill_no TEXT PRIMARY KEY,
+            payload TEXT NOT NULL,
+            customer_name TEXT NOT NULL DEFAULT '',
+            customer_phone TEXT NOT NULL DEFAULT '',
+            created_at REAL NOT NULL,
+            synced INTEGER NOT NULL DEFAULT 0,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_bills_sync_order ON bills (attempts, created_at) WHERE synced = 0;
+        CREATE INDEX IF NOT EXISTS idx_bills_customer_name ON bills (customer_name);
+        CREATE INDEX IF NOT EXISTS idx_bills_customer_phone ON bills (customer_phone);
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open (and create if needed) the journal database.
+
+        Args:
+            path (Optional[str]): Database file. Defaults to `bill_journal.db` in the cache directory.
+
+        Raises:
+            Exception: If the database cannot be opened.
+        """
+        self.path = path or os.path.join(cache_path(), "bill_journal.db")
+        self._lock = threading.Lock()
+        try:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # Bills are money records: make each append durable before checkout continues
+            self._conn.execute("PRAGMA synchronous=FULL")
+            self._conn.executescript(self._SCHEMA)
+        except Exception as e:
+            raise Exception(f"Failed to open bill journal '{self.path}': {e}")
+
+    def append(self, bill: Bill, synced: bool = False) -> None:
+        """
+        Record a bill, replacing any earlier entry with the same number.
+
+        Args:
+            bill (Bill): The bill to record.
+            synced (bool, optional): Whether Firestore already holds this version of the bill.
+        """
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO bills (bill_no, payload, customer_name, customer_phone, created_at, synced) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (bill.bill_no, json.dumps(bill.to_dict()), bill.customer_name, bill.customer_phone, time.time(),
+                     int(synced))
+                )
+        except Exception as e:
+            raise Exception(f"Failed to journal bill '{bill.bill_no}': {e}")
+
+    def unsynced(self, limit: int = 500) -> List[Bill]:
+        """
+        Return the bills that have not reached Firestore yet, fewest failed attempts first.
+
+        Bills that keep failing go to the back, so they cannot hold up the rest of a backlog.
+
+        Args:
+            limit (int, optional): Maximum number of bills.
+
+        Returns:
+            List[Bill]: Unsynced bills, oldest first among those with the same attempt count.
+        """
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT payload FROM bills WHERE synced = 0 ORDER BY attempts, created_at LIMIT ?", (limit,)
+                ).fetchall()
+            return [Bill.from_dict(json.loads(payload)) for (payload,) in rows]
+        except Exception as e:
+            raise Exception(f"Failed to read unsynced bills: {e}")
+
+    def mark_synced(self, bill_nos: List[str]) -> None:
+        """
+        Mark bills as saved to Firestore.
+
+        Args:
+            bill_nos (List[str]): Numbers of the bills that were saved.
+        """
+        try:
+            with self._lock:
+                # One statement, so a large batch costs one transaction rather than one per bill
+                self._conn.execute(
+                    "UPDATE bills SET synced = 1, last_error = NULL "
+                    "WHERE bill_no IN (SELECT value FROM json_each(?))", (json.dumps(bill_nos),)
+                )
+        except Exception as e:
+            raise Exception(f"Failed to mark bills as synced: {e}")
+
+    def record_failures(self, errors: Dict[str, str]) -> None:
+        """
+        Count a failed sync attempt against each bill.
+
+        Args:
+            errors (Dict[str, str]): Error message to keep with each failed bill, by bill number.
+        """
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE bills SET attempts = attempts + 1, "
+                    "last_error = (SELECT value FROM json_each(?1) WHERE key = bills.bill_no) "
+                    "WHERE bill_no IN (SELECT key FROM json_each(?1))", (json.dumps(errors),)
+                )
+        except Exception as e:
+            raise Exception(f"Failed to record sync failure: {e}")
+
+    def reset_attempts(self) -> int:
+        """
+        Clear the attempt counters of unsynced bills.
+
+        Returns:
+            int: Number of bills reset.
+        """
+        try:
+            with self._lock:
+                return self._conn.execute("UPDATE bills SET attempts = 0 WHERE synced = 0 AND attempts > 0").rowcount
+        except Exception as e:
+            raise Exception(f"Failed to reset sync attempts: {e}")
+
+    def failing(self, min_attempts: int) -> List[Tuple[str, str]]:
+        """
+        Return unsynced bills that have failed at least `min_attempts` times.
+
+        Args:
+            min_attempts (int): Attempt threshold.
+
+        Returns:
+            List[Tuple[str, str]]: (bill number, last error) pairs, oldest first.
+        """
+        try:
+            with self._lock:
+                return self._conn.execute(
+                    "SELECT bill_no, COALESCE(last_error, '') FROM bills "
+                    "WHERE synced = 0 AND attempts >= ? ORDER BY created_at", (min_attempts,)
+                ).fetchall()
+        except Exception as e:
+            raise Exception(f"Failed to read failing bills: {e}")
+
+    def count_unsynced(self) -> int:
+        """
+        Count bills that have not reached Firestore yet.
+
+        Returns:
+            int: Number of unsynced bills.
+        """
+        try:
+            with self._lock:
+                return self._conn.execute("SELECT COUNT(*) FROM bills WHERE synced = 0").fetchone()[0]
+        except Exception as e:
+            raise Exception(f"Failed to count unsynced bills: {e}")
+
+    def get(self, bill_no: str) -> Optional[Bill]:
+        """
+        Retrieve a journaled bill by number.
+
+        Args:
+            bill_no (str): Bill number.
+
+        Returns:
+            Optional[Bill]: The bill if it is in the journal, else None.
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT payload FROM bills WHERE bill_no = ?", (bill_no,)).fetchone()
+            return Bill.from_dict(json.loads(row[0])) if row else None
+        except Exception as e:
+            raise Exception(f"Failed to read bill '{bill_no}' from journal: {e}")
+
+    def search(self, field: str, value: str, prefix: bool = False, start: Optional[datetime] = None,
+               end: Optional[datetime] = None, unsynced_only: bool = False) -> List[Bill]:
+        """
+        Find journaled bills whose field equals, or starts with, a value.
+
+        Args:
+            field (str): Bill field name (e.g. 'customer_name').
+            value (str): Value to match, or the prefix to match when `prefix` is True.
+            prefix (bool, optional): Match values starting with `value` instead of equal to it.
+            start (Optional[datetime]): Only bills created at or after this time.
+            end (Optional[datetime]): Only bills created before this time.
+            unsynced_only (bool, optional): Only bills that have not reached Firestore yet.
+
+        Returns:
+            List[Bill]: Matching bills, newest first.
+        """
+        try:
+            if field in ("bill_no", "customer_name", "customer_phone"):
+                column, params = field, []
+            else:
+                column, params = "json_extract(payload, ?)", [f'$."{field}"']
+            if prefix:
+                # Placeholders bind left to right: the JSON path (if any), then the prefix length and value
+                conditions = [f"substr({column}, 1, ?) = ?"]
+                params += [len(value), value]
+            else:
+                conditions = [f"{column} = ?"]
+                params.append(value)
+            if start is not None:
+                conditions.append("json_extract(payload, '$.timestamp') >= ?")
+                params.append(start.isoformat())
+            if end is not None:
+                conditions.append("json_extract(payload, '$.timestamp') < ?")
+                params.append(end.isoformat())
+            if unsynced_only:
+                conditions.append("synced = 0")
+            sql = f"SELECT payload FROM bills WHERE {' AND '.join(conditions)} ORDER BY created_at DESC"
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+            return [Bill.from_dict(json.loads(payload)) for (payload,) in rows]
+        except Exception as e:
+            raise Exception(f"Failed to search journal by {field}: {e}")
+
+    def delete(self, bill_no: str) -> None:
+        """
+        Remove a bill from the journal.
+
+        Args:
+            bill_no (str): Bill number.
+        """
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM bills WHERE bill_no = ?", (bill_no,))
+        except Exception as e:
+            raise Exception(f"Failed to delete bill '{bill_no}' from journal: {e}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -1,24 +1,43 @@
-from typing import Optional
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from google.cloud.firestore import Client, DocumentSnapshot
+from google.cloud.firestore import SERVER_TIMESTAMP, Client, DocumentSnapshot, Query
+from google.cloud.firestore_v1.bulk_writer import BulkRetry, BulkWriteFailure, BulkWriterOptions, SendMode
 
 from models.bill_model import Bill
 
 
 class BillRepository:
     """
-    Repository class for managing Bill records in Firestore.
+    Repository class for managing one shop's Bill records in Firestore.
+
+    Each shop's bills live in its own collection, `shops/{shop_id}/bills`, so every
+    query reads only that shop's documents and its cost grows with the shop's own
+    volume. The composite indexes these queries need are in `firestore.indexes.json`.
+
+    Every write stamps `synced_at` with the server's commit time, so readers can
+    pick up bills written since they last looked, including bills created long
+    before on a terminal that was offline.
     """
 
-    def __init__(self, db: Client):
+    # gRPC status codes worth retrying: DEADLINE_EXCEEDED, RESOURCE_EXHAUSTED, ABORTED, INTERNAL, UNAVAILABLE
+    RETRYABLE_CODES = frozenset({4, 8, 10, 13, 14})
+
+    def __init__(self, db: Client, shop_id: str, compact: bool = False):
         """
         Initialize the repository with a Firestore client.
 
         Args:
             db (Client): An instance of Firestore client.
+            shop_id (str): UID of the shop owner whose bills are read and written.
+            compact (bool, optional): Write bills with the compact columnar item layout. Reads accept both
+                layouts either way; enable it once every terminal runs a version that can read it.
         """
         self.db = db
-        self.collection = self.db.collection("bills")
+        self.shop_id = shop_id
+        self.compact = compact
+        self.collection = self.db.collection("shops").document(shop_id).collection("bills")
 
     def save(self, bill: Bill) -> str:
         """
@@ -31,11 +50,78 @@ class BillRepository:
             str: The bill number used as the document ID.
         """
         try:
-            self.collection.document(bill.bill_no).set(bill.to_dict())
+            self.collection.document(bill.bill_no).set(self._to_document(bill))
             return bill.bill_no
         except Exception as e:
             raise Exception(f"Failed to save bill: {e}")
 
+    def save_batch(self, bills: List[Bill]) -> int:
+        """
+        Save or update several bills in one atomic WriteBatch commit.
+        Firestore limits a batch to 500 writes.
+
+        Args:
+            bills (List[Bill]): Bills to be saved.
+
+        Returns:
+            int: Number of bills written.
+        """
+        try:
+            batch = self.db.batch()
+            for bill in bills:
+                batch.set(self.collection.document(bill.bill_no), self._to_document(bill))
+            batch.commit()
+            return len(bills)
+        except Exception as e:
+            raise Exception(f"Failed to save batch of {len(bills)} bills: {e}")
+
+    def save_many(self, bills: List[Bill], max_ops_per_second: int = 500, max_attempts: int = 5) -> Dict[str, str]:
+        """
+        Save or update a large number of bills with a Firestore BulkWriter.
+
+        Writes are sent as parallel batches, ramping up from 500 operations per second
+        to `max_ops_per_second`. Each write is a full `set` keyed by bill_no, so retrying
+        it is idempotent: documents that fail with a transient error are retried with
+        backoff, up to `max_attempts` times. Unlike `save_batch`, one bad document does
+        not fail the others.
+
+        Args:
+            bills (List[Bill]): Bills to be saved.
+            max_ops_per_second (int, optional): Write rate the writer may ramp up to.
+            max_attempts (int, optional): Attempts per document before it is reported as failed.
+
+        Returns:
+            Dict[str, str]: Error message for each bill that could not be saved, by bill number.
+                Empty if every bill was saved.
+
+        Raises:
+            Exception: If the writer itself fails, e.g. when the client cannot be used.
+        """
+        failures: Dict[str, str] = {}
+        lock = threading.Lock()
+
+        def on_error(failure: BulkWriteFailure, _writer) -> bool:
+            if failure.code in self.RETRYABLE_CODES and failure.attempts < max_attempts:
+                return True
+            with lock:
+                failures[failure.operation.reference.id] = f"{failure.message} (code {failure.code})"
+            return False
+
+        try:
+            writer = self.db.bulk_writer(BulkWriterOptions(
+                initial_ops_per_second=min(500, max_ops_per_second),
+                max_ops_per_second=max_ops_per_second,
+                mode=SendMode.parallel,
+                retry=BulkRetry.exponential
+            ))
+            writer.on_write_error(on_error)
+            for bill in bills:
+                writer.set(self.collection.document(bill.bill_no), self._to_document(bill))
+            writer.close()
+            return failures
+        except Exception as e:
+            raise Exception(f"Failed to save {len(bills)} bills: {e}")
+
     def get_by_id(self, bill_no: str) -> Optional[Bill]:
         """
         Retrieve a bill by its unique bill number.
@@ -64,7 +150,7 @@ class BillRepository:
             bool: True if update is successful.
         """
         try:
-            self.collection.document(bill_no).update(updates)
+            self.collection.document(bill_no).update({**updates, "synced_at": SERVER_TIMESTAMP})
             return True
         except Exception as e:
             raise Exception(f"Failed to update bill '{bill_no}': {e}")
@@ -85,6 +171,133 @@ class BillRepository:
         except Exception as e:
             raise Exception(f"Failed to delete bill '{bill_no}': {e}")
 
+    def stream_all(self) -> Iterator[Bill]:
+        """
+        Stream every bill of the shop.
+
+        Bills are yielded as documents arrive, so callers can process long
+        histories without holding them all in memory.
+
+        Yields:
+            Bill: Each stored bill.
+        """
+        try:
+            for doc in self.collection.stream():
+                yield Bill.from_dict(self._with_id(doc))
+        except Exception as e:
+            raise Exception(f"Failed to stream bills: {e}")
+
+    def stream_synced_since(self, since: Optional[datetime] = None) -> Iterator[Tuple[Bill, Optional[datetime]]]:
+        """
+        Stream bills written to Firestore at or after a server time, in write order.
+
+        Bills written exactly at `since` are streamed again, so callers that resume
+        from the last time they saw must tolerate repeats.
+
+        Args:
+            since (Optional[datetime]): Server time to start at, from a previous `synced_at`.
+                None streams every bill, including ones saved before `synced_at` was recorded.
+
+        Yields:
+            Tuple[Bill, Optional[datetime]]: Each bill and its `synced_at` (None if not recorded).
+        """
+        try:
+            query = self.collection
+            if since is not None:
+                query = query.where("synced_at", ">=", since).order_by("synced_at")
+            for doc in query.stream():
+                data = self._with_id(doc)
+                yield Bill.from_dict(data), data.get("synced_at")
+        except Exception as e:
+            raise Exception(f"Failed to stream bills synced since {since}: {e}")
+
+    def highest_invoice_no(self, start: int, end: int) -> Optional[int]:
+        """
+        Find the highest invoice number in a range that has been synced.
+
+        Args:
+            start (int): First number of the range.
+            end (int): One past the last number of the range.
+
+        Returns:
+            Optional[int]: The highest synced invoice number in the range, or None if there is none.
+        """
+        try:
+            query = (self.collection.where("invoice_no", ">=", start).where("invoice_no", "<", end)
+                     .order_by("invoice_no", direction=Query.DESCENDING).limit(1).select(["invoice_no"]))
+            for doc in query.stream():
+                return int(doc.get("invoice_no"))
+            return None
+        except Exception as e:
+            raise Exception(f"Failed to find invoice numbers {start}-{end - 1}: {e}")
+
+    def search_pages(self, field: str, value: str, prefix: bool = False, start: Optional[datetime] = None,
+                     end: Optional[datetime] = None, page_size: int = 50) -> Iterator[List[Bill]]:
+        """
+        Search bills one page at a time, newest first.
+
+        Each page is one query with `limit(page_size)`, resuming after the last document
+        of the previous page, so only one page is held in memory and the next page is not
+        fetched until the caller asks for it.
+
+        Prefix searches order by the searched field first (Firestore requires the range
+        field to lead the ordering) and by time within it.
+
+        Args:
+            field (str): Field name to search (e.g. 'customer_name').
+            value (str): Value to match, or the prefix to match when `prefix` is True.
+            prefix (bool, optional): Match values starting with `value` instead of equal to it.
+            start (Optional[datetime]): Only bills created at or after this time.
+            end (Optional[datetime]): Only bills created before this time.
+            page_size (int, optional): Bills per page.
+
+        Yields:
+            List[Bill]: Each non-empty page of matching bills.
+        """
+        try:
+            query = self.collection
+            if prefix:
+                # \uf8ff sorts after every character used in names and numbers
+                query = query.where(field, ">=", value).where(field, "<", value + "\uf8ff")
+            else:
+                query = query.where(field, "==", value)
+            # Timestamps are stored as ISO strings, which sort in time order
+            if start is not None:
+                query = query.where("timestamp", ">=", start.isoformat())
+            if end is not None:
+                query = query.where("timestamp", "<", end.isoformat())
+            if prefix:
+                query = query.order_by(field)
+            query = query.order_by("timestamp", direction=Query.DESCENDING).limit(page_size)
+
+            cursor = None
+            while True:
+                page_query = query.start_after(cursor) if cursor is not None else query
+                docs = list(page_query.stream())
+                if not docs:
+                    return
+                yield [Bill.from_dict(self._with_id(doc)) for doc in docs]
+                if len(docs) < page_size:
+                    return
+                cursor = docs[-1]
+        except Exception as e:
+            raise Exception(f"Failed to search bills by {field}: {e}")
+
+    def _to_document(self, bill: Bill) -> dict:
+        """
+        Serialize a bill for this shop's collection, recording the shop as its owner and the write time.
+
+        Args:
+            bill (Bill): The bill to serialize.
+
+        Returns:
+            dict: Document data.
+        """
+        data = bill.to_dict(self.compact)
+        data["shop_id"] = self.shop_id
+        data["synced_at"] = SERVER_TIMESTAMP
+        return data
+
     @staticmethod
     def _with_id(doc: DocumentSnapshot) -> dict:
         """
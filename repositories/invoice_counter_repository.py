@@ -0,0 +1,115 @@
+from datetime import datetime
+from typing import List
+
+from google.cloud.firestore import Client, Transaction, transactional
+
+from models.invoice_lease_model import InvoiceLease
+
+
+class InvoiceCounterRepository:
+    """
+    Repository for a shop's invoice number counter, the document
+    `shops/{shop_id}/counters/bill_numbers`.
+
+    The document holds:
+    - `next`: the first number that has never been handed out.
+    - `free`: ranges returned unused, as {start, end} maps; they are leased again first.
+    - `leases`: outstanding leases by their start number.
+
+    Every change runs in a transaction, so concurrent terminals never receive
+    overlapping blocks. Terminals touch the document once per block, not once per bill.
+    """
+
+    def __init__(self, db: Client, shop_id: str):
+        """
+        Initialize the repository with a Firestore client.
+
+        Args:
+            db (Client): An instance of Firestore client.
+            shop_id (str): UID of the shop owner.
+        """
+        self.db = db
+        self.document = self.db.collection("shops").document(shop_id).collection("counters").document("bill_numbers")
+
+    def lease_block(self, terminal_id: str, size: int, expires_at: datetime) -> InvoiceLease:
+        """
+        Reserve a block of up to `size` consecutive numbers for a terminal.
+
+        Returned ranges are reused, lowest first, before new numbers are taken from the
+        counter, so numbers are not skipped. A block carved from a returned range may be
+        smaller than `size`.
+
+        Args:
+            terminal_id (str): Terminal taking the lease.
+            size (int): Maximum numbers in the block.
+            expires_at (datetime): When the lease runs out.
+
+        Returns:
+            InvoiceLease: The reserved block.
+        """
+
+        @transactional
+        def lease(transaction: Transaction) -> InvoiceLease:
+            snapshot = self.document.get(transaction=transaction)
+            data = (snapshot.to_dict() or {}) if snapshot.exists else {}
+            next_no = int(data.get("next", 1))
+            free = sorted((dict(r) for r in data.get("free", [])), key=lambda r: r["start"])
+            if free:
+                returned = free.pop(0)
+                start, end = returned["start"], min(returned["end"], returned["start"] + size)
+                if end < returned["end"]:
+                    free.insert(0, {"start": end, "end": returned["end"]})
+            else:
+                start, end = next_no, next_no + size
+                next_no = end
+            block = InvoiceLease(terminal_id, start, end, start, expires_at)
+            leases = dict(data.get("leases", {}))
+            leases[str(start)] = {"terminal_id": terminal_id, "start": start, "end": end, "expires_at": expires_at}
+            transaction.set(self.document, {"next": next_no, "free": free, "leases": leases})
+            return block
+
+        try:
+            return lease(self.db.transaction())
+        except Exception as e:
+            raise Exception(f"Failed to lease invoice numbers: {e}")
+
+    def return_block(self, block: InvoiceLease) -> None:
+        """
+        Close a lease, putting its unissued numbers back in the free list.
+        Returning a lease that is already closed changes nothing, so retries are safe.
+
+        Args:
+            block (InvoiceLease): The lease, with `next` at the first unissued number.
+        """
+
+        @transactional
+        def give_back(transaction: Transaction) -> None:
+            snapshot = self.document.get(transaction=transaction)
+            data = (snapshot.to_dict() or {}) if snapshot.exists else {}
+            leases = dict(data.get("leases", {}))
+            if leases.pop(str(block.start), None) is None:
+                return
+            free = list(data.get("free", []))
+            if block.remaining:
+                free.append({"start": block.next, "end": block.end})
+            transaction.update(self.document, {"free": free, "leases": leases})
+
+        try:
+            give_back(self.db.transaction())
+        except Exception as e:
+            raise Exception(f"Failed to return invoice numbers {block.next}-{block.end - 1}: {e}")
+
+    def list_leases(self) -> List[InvoiceLease]:
+        """
+        Retrieve every outstanding lease, e.g. to report expired ones that were never returned.
+        `next` is not tracked centrally, so each lease reports its whole block.
+
+        Returns:
+            List[InvoiceLease]: Outstanding leases, lowest numbers first.
+        """
+        try:
+            snapshot = self.document.get()
+            leases = (snapshot.to_dict() or {}).get("leases", {}) if snapshot.exists else {}
+            return sorted((InvoiceLease.from_dict(lease) for lease in leases.values()), key=lambda l: l.start)
+        except Exception as e:
+            raise Exception(f"Failed to list invoice number leases: {e}")
@@ -1,7 +1,9 @@
-from typing import Optional
+from datetime import datetime
+from typing import Iterable, List, Optional
 
-from google.cloud.firestore import Client, DocumentSnapshot
+from google.cloud.firestore import Client, DocumentSnapshot, Query, SERVER_TIMESTAMP
 
+from models.money import AMOUNT_UNIT
 from models.product_model import Product
 
 
@@ -23,6 +25,7 @@ class ProductRepository:
     def save(self, product: Product) -> str:
         """
         Save or update a product in Firestore using product_id as document ID.
+        The `updated_at` field is stamped with the server time.
 
         Args:
             product (Product): The product object to be saved.
@@ -31,11 +34,35 @@ class ProductRepository:
             str: The product_id used as the document ID.
         """
         try:
-            self.collection.document(product.product_id).set(product.to_dict())
+            data = product.to_dict()
+            data["updated_at"] = SERVER_TIMESTAMP
+            self.collection.document(product.product_id).set(data)
             return product.product_id
         except Exception as e:
             raise Exception(f"Failed to save product '{product.product_id}': {e}")
 
+    def save_batch(self, products: List[Product]) -> int:
+        """
+        Save or update several products in one atomic WriteBatch commit.
+        Firestore limits a batch to 500 writes.
+
+        Args:
+            products (List[Product]): Products to be saved.
+
+        Returns:
+            int: Number of products written.
+        """
+        try:
+            batch = self.db.batch()
+            for product in products:
+                data = product.to_dict()
+                data["updated_at"] = SERVER_TIMESTAMP
+                batch.set(self.collection.document(product.product_id), data)
+            batch.commit()
+            return len(products)
+        except Exception as e:
+            raise Exception(f"Failed to save batch of {len(products)} products: {e}")
+
     def get_by_id(self, product_id: str) -> Optional[Product]:
         """
         Retrieve a product by its unique product ID.
@@ -48,13 +75,87 @@ class ProductRepository:
         """
         try:
             doc = self.collection.document(product_id).get()
-            return Product.from_dict(self._with_id(doc)) if doc.exists else None
+            return self.to_product(doc) if doc.exists else None
         except Exception as e:
             raise Exception(f"Failed to retrieve product '{product_id}': {e}")
 
+    def list_all(self) -> List[Product]:
+        """
+        Retrieve every product in a single collection stream.
+
+        Products are materialized straight from the streamed snapshots, so the
+        whole catalog costs one query instead of one extra read per document.
+
+        Returns:
+            List[Product]: All Product objects in the collection.
+        """
+        try:
+            return [self.to_product(doc) for doc in self.collection.stream()]
+        except Exception as e:
+            raise Exception(f"Failed to list products: {e}")
+
+    def list_ids(self) -> List[str]:
+        """
+        Retrieve the ID of every product without downloading the product fields.
+
+        Returns:
+            List[str]: Document IDs of all products.
+        """
+        try:
+            return [doc.id for doc in self.collection.select([]).stream()]
+        except Exception as e:
+            raise Exception(f"Failed to list product IDs: {e}")
+
+    def get_many(self, product_ids: Iterable[str]) -> List[Product]:
+        """
+        Retrieve several products by ID in one batched request.
+
+        Args:
+            product_ids (Iterable[str]): Document IDs of the products to fetch.
+
+        Returns:
+            List[Product]: Product objects for the IDs that exist. Missing IDs are skipped.
+        """
+        try:
+            refs = [self.collection.document(product_id) for product_id in dict.fromkeys(product_ids)]
+            if not refs:
+                return []
+            return [self.to_product(doc) for doc in self.db.get_all(refs) if doc.exists]
+        except Exception as e:
+            raise Exception(f"Failed to retrieve products in bulk: {e}")
+
+    def changed_since_query(self, since: datetime) -> Query:
+        """
+        Build a query for products written after a given server time.
+
+        Args:
+            since (datetime): Only products with `updated_at` later than this are matched.
+
+        Returns:
+            Query: Firestore query over changed products.
+        """
+        return self.collection.where("updated_at", ">", since)
+
+    def list_updated_since(self, since: datetime) -> List[Product]:
+        """
+        Retrieve only the products written after a given server time.
+
+        Args:
+            since (datetime): Only products with `updated_at` later than this are returned.
+
+        Returns:
+            List[Product]: Products changed since `since`.
+        """
+        try:
+            return [self.to_product(doc) for doc in self.changed_since_query(since).stream()]
+        except Exception as e:
+            raise Exception(f"Failed to list products updated since {since}: {e}")
+
     def update(self, product_id: str, updates: dict) -> bool:
         """
         Update specific fields of a product document.
+        The `updated_at` field is stamped with the server time. A `price` update
+        must be in paise.
 
         Args:
             product_id (str): The document ID of the product.
@@ -64,6 +165,9 @@ class ProductRepository:
             bool: True if update is successful.
         """
         try:
+            updates = {**updates, "updated_at": SERVER_TIMESTAMP}
+            if "price" in updates:
+                updates["amount_unit"] = AMOUNT_UNIT
             self.collection.document(product_id).update(updates)
             return True
         except Exception as e:
@@ -85,6 +189,19 @@ class ProductRepository:
         except Exception as e:
             raise Exception(f"Failed to delete product '{product_id}': {e}")
 
+    @classmethod
+    def to_product(cls, doc: DocumentSnapshot) -> Product:
+        """
+        Build a Product from a document snapshot, using the document ID as product_id.
+
+        Args:
+            doc (DocumentSnapshot): The Firestore document snapshot.
+
+        Returns:
+            Product: The materialized product.
+        """
+        return Product.from_dict(cls._with_id(doc))
+
     @staticmethod
     def _with_id(doc: DocumentSnapshot) -> dict:
         """
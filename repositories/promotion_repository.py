@@ -0,0 +1,55 @@
+from typing import List
+
+from google.cloud.firestore import Client
+
+from models.promotion_model import Promotion
+
+
+class PromotionRepository:
+    """
+    Repository class for managing Promotion records in Firestore.
+    """
+
+    def __init__(self, db: Client):
+        """
+        Initialize the repository with a Firestore client.
+
+        Args:
+            db (Client): An instance of Firestore client.
+        """
+        self.db = db
+        self.collection = self.db.collection("promotions")
+
+    def save(self, promotion: Promotion) -> str:
+        """
+        Save or update a promotion using promotion_id as the document ID.
+
+        Args:
+            promotion (Promotion): The promotion to be saved.
+
+        Returns:
+            str: The promotion_id used as the document ID.
+        """
+        try:
+            self.collection.document(promotion.promotion_id).set(promotion.to_dict())
+            return promotion.promotion_id
+        except Exception as e:
+            raise Exception(f"Failed to save promotion '{promotion.promotion_id}': {e}")
+
+    def list_active(self) -> List[Promotion]:
+        """
+        Retrieve the promotions that are switched on. Malformed documents are skipped.
+
+        Returns:
+            List[Promotion]: Active promotions; their validity windows are not checked here.
+        """
+        try:
+            promotions = []
+            for doc in self.collection.where("active", "==", True).stream():
+                try:
+                    promotions.append(Promotion.from_dict({**doc.to_dict(), "promotion_id": doc.id}))
+                except ValueError as e:
+                    print(f"[PromotionRepository] Skipping promotion '{doc.id}': {e}")
+            return promotions
+        except Exception as e:
+            raise Exception(f"Failed to list promotions: {e}")
@@ -0,0 +1,55 @@
+from typing import List
+
+from google.cloud.firestore import Client
+
+from models.tax_model import TaxRate
+
+
+class TaxRepository:
+    """
+    Repository class for the tax rate table in Firestore.
+    """
+
+    def __init__(self, db: Client):
+        """
+        Initialize the repository with a Firestore client.
+
+        Args:
+            db (Client): An instance of Firestore client.
+        """
+        self.db = db
+        self.collection = self.db.collection("tax_rates")
+
+    def save(self, rate: TaxRate) -> str:
+        """
+        Save or update a tax rate using its rate_id as the document ID.
+
+        Args:
+            rate (TaxRate): The rate to be saved.
+
+        Returns:
+            str: The rate_id used as the document ID.
+        """
+        try:
+            self.collection.document(rate.rate_id).set(rate.to_dict())
+            return rate.rate_id
+        except Exception as e:
+            raise Exception(f"Failed to save tax rate '{rate.rate_id}': {e}")
+
+    def list_all(self) -> List[TaxRate]:
+        """
+        Retrieve the whole tax rate table. Malformed rows are skipped.
+
+        Returns:
+            List[TaxRate]: All valid rates in the collection.
+        """
+        try:
+            rates = []
+            for doc in self.collection.stream():
+                try:
+                    rates.append(TaxRate.from_dict({**doc.to_dict(), "rate_id": doc.id}))
+                except ValueError as e:
+                    print(f"[TaxRepository] Skipping tax rate '{doc.id}': {e}")
+            return rates
+        except Exception as e:
+            raise Exception(f"Failed to list tax rates: {e}")
@@ -0,0 +1,240 @@
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from models.bill_model import Bill
+from services.cart import Cart
+
+
+@dataclass(frozen=True, slots=True)
+class BillMismatch:
+    """
+    A stored bill amount that differs from the recomputed one.
+
+    Attributes:
+        bill_no (str): Bill number.
+        field (str): Name of the Bill attribute that differs (e.g. "grocery_tax").
+        stored (int): Amount stored on the bill, in paise.
+        computed (int): Amount recomputed from the bill's items, in paise.
+    """
+    bill_no: str
+    field: str
+    stored: int
+    computed: int
+
+
+@dataclass(slots=True)
+class BillBatch:
+    """
+    Column-oriented view of a batch of bills, one array entry per line item.
+
+    Attributes:
+        bill_nos (List[str]): Bill number for each bill row.
+        bill_index (ndarray): Row of the owning bill for each line item.
+        quantity (ndarray): Quantity of each line item.
+        price (ndarray): Unit price of each line item, in paise.
+        discount (ndarray): Promotion discount of each line item, in paise.
+        category (ndarray): Category code of each line item (index into BillBatchEngine.CATEGORIES,
+            or len(CATEGORIES) for any other category).
+        tax_rate (ndarray): Tax rate of each line item, in basis points.
+        stored (ndarray): Stored amounts per bill in paise, one column per BillBatchEngine.FIELDS entry.
+    """
+    bill_nos: List[str]
+    bill_index: object
+    quantity: object
+    price: object
+    discount: object
+    category: object
+    tax_rate: object
+    stored: object
+
+    def __len__(self) -> int:
+        return len(self.bill_nos)
+
+
+@dataclass(slots=True)
+class BatchTotals:
+    """
+    Recomputed amounts for a BillBatch.
+
+    Attributes:
+        category_totals (ndarray): Subtotal per bill and category in paise, shape (bills, len(CATEGORIES)).
+        category_taxes (ndarray): Tax per bill and category in paise, same shape.
+        grand_totals (ndarray): Grand total per bill in paise.
+    """
+    category_totals: object
+    category_taxes: object
+    grand_totals: object
+
+    def as_columns(self):
+        """Stack the amounts in BillBatchEngine.FIELDS order, one row per bill."""
+        np = _numpy()
+        return np.column_stack([self.category_totals, self.category_taxes, self.grand_totals])
+
+
+class BillBatchEngine:
+    """
+    Vectorized recomputation of bill totals over many bills at once, for audits
+    and for re-pricing history after a tax-rate change.
+
+    Line items are loaded into flat NumPy arrays; per-bill category subtotals come
+    from a single weighted `bincount` over a combined (bill, category) key, so the
+    cost is a few passes over the line arrays regardless of how the lines are spread
+    across bills. All amounts are int64 paise; as in Cart, each category tax is the
+    sum of `total * rate` over its lines rounded half up once, so results are exact.
+
+    Requires numpy, which is an optional dependency of the application.
+    """
+
+    CATEGORIES = ("medical", "grocery", "drinks")
+    FIELDS = ("medical_total", "grocery_total", "drinks_total",
+              "medical_tax", "grocery_tax", "drinks_tax", "total_amount")
+
+    def __init__(self, tax_rates: Optional[Dict[str, int]] = None, use_recorded_rates: bool = True,
+                 tolerance: int = 0):
+        """
+        Initialize the engine.
+
+        Args:
+            tax_rates (Optional[Dict[str, int]]): Tax rate per category in basis points. Defaults to Cart.TAX_RATES.
+            use_recorded_rates (bool, optional): Tax items at the rate recorded on them when billed, using
+                `tax_rates` only for items saved without one. Pass False to re-tax every item by
+                category, e.g. to see the effect of a rate change.
+            tolerance (int, optional): Largest difference in paise between stored and computed amounts
+                that is not reported as a mismatch.
+        """
+        _numpy()
+        self.tax_rates = dict(Cart.TAX_RATES if tax_rates is None else tax_rates)
+        self.use_recorded_rates = use_recorded_rates
+        # Codes outside CATEGORIES land in a trailing "other" column
+        self._codes = {category: code for code, category in enumerate(self.CATEGORIES)}
+        self.tolerance = tolerance
+
+    def load(self, bills: Iterable[Bill], categories: Optional[Mapping[str, str]] = None) -> BillBatch:
+        """
+        Copy bills into column arrays.
+
+        Args:
+            bills (Iterable[Bill]): Bills to load.
+            categories (Optional[Mapping[str, str]]): Product ID to category, used for items
+                saved without a category.
+
+        Returns:
+            BillBatch: The loaded batch.
+        """
+        np = _numpy()
+        codes = self._codes
+        rates = self.tax_rates
+        use_recorded = self.use_recorded_rates
+        other = len(self.CATEGORIES)
+        categories = categories or {}
+
+        bill_nos: List[str] = []
+        stored: List[Tuple[int, ...]] = []
+        bill_index: List[int] = []
+        quantity: List[int] = []
+        price: List[int] = []
+        discount: List[int] = []
+        category: List[int] = []
+        tax_rate: List[int] = []
+
+        for row, bill in enumerate(bills):
+            bill_nos.append(bill.bill_no)
+            stored.append((bill.medical_total, bill.grocery_total, bill.drinks_total,
+                           bill.medical_tax, bill.grocery_tax, bill.drinks_tax, bill.total_amount))
+            for item in bill.items:
+                bill_index.append(row)
+                quantity.append(item.quantity)
+                price.append(item.price)
+                discount.append(item.discount)
+                name = item.category or categories.get(item.product_id, "")
+                category.append(codes.get(name, other))
+                tax_rate.append(item.tax_rate if use_recorded and item.tax_rate is not None else rates.get(name, 0))
+
+        return BillBatch(
+            bill_nos=bill_nos,
+            bill_index=np.array(bill_index, dtype=np.int64),
+            quantity=np.array(quantity, dtype=np.int64),
+            price=np.array(price, dtype=np.int64),
+            discount=np.array(discount, dtype=np.int64),
+            category=np.array(category, dtype=np.int64),
+            tax_rate=np.array(tax_rate, dtype=np.int64),
+            stored=np.array(stored, dtype=np.int64).reshape(len(bill_nos), len(self.FIELDS))
+        )
+
+    def compute(self, batch: BillBatch) -> BatchTotals:
+        """
+        Recompute category subtotals, taxes and grand totals for every bill in a batch.
+
+        Args:
+            batch (BillBatch): Batch produced by `load`.
+
+        Returns:
+            BatchTotals: Recomputed amounts, rows aligned with `batch.bill_nos`.
+        """
+        np = _numpy()
+        width = len(self.CATEGORIES) + 1
+        key = batch.bill_index * width + batch.category
+        line_totals = batch.quantity * batch.price - batch.discount
+        # bincount sums in float64, which is exact for integers below 2**53
+        sums = np.bincount(key, weights=line_totals,
+                           minlength=len(batch) * width).astype(np.int64).reshape(len(batch), width)
+        tax_bp = np.bincount(key, weights=line_totals * batch.tax_rate,
+                             minlength=len(batch) * width).astype(np.int64).reshape(len(batch), width)
+
+        # Same half-up rounding as models.money.round_basis_points
+        taxes = (tax_bp + 5000) // 10000
+        named = len(self.CATEGORIES)
+        return BatchTotals(
+            category_totals=sums[:, :named],
+            category_taxes=taxes[:, :named],
+            grand_totals=sums.sum(axis=1) + taxes.sum(axis=1)
+        )
+
+    def mismatches(self, batch: BillBatch, totals: Optional[BatchTotals] = None) -> List[BillMismatch]:
+        """
+        Compare stored amounts with recomputed ones.
+
+        Args:
+            batch (BillBatch): Batch produced by `load`.
+            totals (Optional[BatchTotals]): Result of `compute`; computed here if not given.
+
+        Returns:
+            List[BillMismatch]: One entry per differing amount, ordered by bill then field.
+        """
+        np = _numpy()
+        computed = (totals or self.compute(batch)).as_columns()
+        rows, columns = np.nonzero(np.abs(computed - batch.stored) > self.tolerance)
+        return [
+            BillMismatch(batch.bill_nos[r], self.FIELDS[c], int(batch.stored[r, c]), int(computed[r, c]))
+            for r, c in zip(rows.tolist(), columns.tolist())
+        ]
+
+    def audit(self, bills: Iterable[Bill], categories: Optional[Mapping[str, str]] = None,
+              chunk_size: int = 50000) -> Iterator[BillMismatch]:
+        """
+        Recompute and check bills chunk by chunk, so memory stays bounded for long histories.
+
+        Args:
+            bills (Iterable[Bill]): Bills to check, e.g. streamed from Firestore.
+            categories (Optional[Mapping[str, str]]): Product ID to category, for items saved without one.
+            chunk_size (int, optional): Bills loaded into arrays at a time.
+
+        Yields:
+            BillMismatch: Each stored amount that differs from the recomputed one.
+        """
+        bills = iter(bills)
+        while True:
+            chunk = list(islice(bills, chunk_size))
+            if not chunk:
+                return
+            yield from self.mismatches(self.load(chunk, categories))
+
+
+def _numpy():
+    """Import numpy on first use, with a clear message when it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("numpy is required for batch bill recomputation (pip install numpy)")
+    return numpy
@@ -0,0 +1,136 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from models.bill_model import Bill
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    """
+    Point-in-time counters of a BillCache.
+
+    Attributes:
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that were not cached or had expired.
+        evictions (int): Entries dropped to stay within `max_size`.
+        expirations (int): Entries dropped because they were older than the TTL.
+        size (int): Entries currently cached.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class BillCache:
+    """
+    Bounded LRU cache of bills by bill number, with a time-to-live per entry.
+
+    A lookup moves the entry to the most-recently-used end; inserting past
+    `max_size` evicts the least recently used entry. Entries older than
+    `ttl_seconds` are treated as misses, so bills edited on another terminal are
+    re-read eventually. Cached bills are shared, so callers must not modify them.
+    """
+
+    def __init__(self, max_size: int = 256, ttl_seconds: float = 600.0):
+        """
+        Create an empty cache.
+
+        Args:
+            max_size (int, optional): Maximum number of bills kept.
+            ttl_seconds (float, optional): Seconds an entry stays valid after it was stored.
+        """
+        self.max_size = max(1, max_size)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Bill]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, bill_no: str) -> Optional[Bill]:
+        """
+        Look up a bill, counting a hit or a miss.
+
+        Args:
+            bill_no (str): Bill number.
+
+        Returns:
+            Optional[Bill]: The cached bill, or None if it is not cached or has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(bill_no)
+            if entry is not None and time.monotonic() - entry[0] >= self.ttl_seconds:
+                del self._entries[bill_no]
+                self._expirations += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(bill_no)
+            self._hits += 1
+            return entry[1]
+
+    def peek(self, bill_no: str) -> Optional[Bill]:
+        """
+        Return a cached bill without counting a lookup or refreshing its recency.
+
+        Args:
+            bill_no (str): Bill number.
+
+        Returns:
+            Optional[Bill]: The cached bill, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(bill_no)
+            return entry[1] if entry is not None else None
+
+    def put(self, bill: Bill) -> None:
+        """
+        Store a bill, replacing any cached copy and evicting the least recently used entry if full.
+
+        Args:
+            bill (Bill): The bill to cache.
+        """
+        with self._lock:
+            self._entries[bill.bill_no] = (time.monotonic(), bill)
+            self._entries.move_to_end(bill.bill_no)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, bill_no: str) -> None:
+        """
+        Drop a bill from the cache.
+
+        Args:
+            bill_no (str): Bill number.
+        """
+        with self._lock:
+            self._entries.pop(bill_no, None)
+
+    def clear(self) -> None:
+        """Drop every entry. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """
+        Return the cache counters.
+
+        Returns:
+            CacheStats: Hits, misses, evictions, expirations and current size.
+        """
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, self._expirations, len(self._entries))
@@ -0,0 +1,145 @@
+import json
+import os
+from typing import Callable, List, Optional
+
+from auth.firebase_config import FirebaseConfig
+from config import imports_cache_path
+from models.bill_model import Bill
+from repositories.bill_repository import BillRepository
+
+
+class BillMigrationService:
+    """
+    Service for moving bills from the old global `bills` collection into a shop's
+    own collection, `shops/{shop_id}/bills`.
+
+    Only documents that name the given shop are copied by default. Older documents do not
+    record which shop issued them and may belong to any tenant, so they are skipped and
+    counted unless the caller confirms they all belong to this shop with `claim_ownerless`;
+    documents that name another shop are always skipped.
+    The source is read in pages ordered by bill number and each page is written with a
+    BulkWriter. Copies are keyed by bill number, so running the migration again only
+    rewrites the same documents; a checkpoint lets an interrupted run resume after the
+    last completed page.
+    """
+
+    LEGACY_COLLECTION = "bills"
+    MAX_PAGE_SIZE = 500
+
+    def __init__(self, shop_id: str, page_size: int = MAX_PAGE_SIZE, claim_ownerless: bool = False):
+        """
+        Initialize Firestore and the shop's Bill repository.
+
+        Args:
+            shop_id (str): UID of the shop that receives the bills.
+            page_size (int, optional): Source documents read and written per page (at most 500).
+            claim_ownerless (bool, optional): Assign documents that name no shop to this shop.
+        """
+        firebase_config = FirebaseConfig()
+        self.db = firebase_config.db
+        self.shop_id = shop_id
+        self.repo = BillRepository(self.db, shop_id)
+        self.source = self.db.collection(self.LEGACY_COLLECTION)
+        self.page_size = max(1, min(page_size, self.MAX_PAGE_SIZE))
+        self.claim_ownerless = claim_ownerless
+        self.checkpoint_path = os.path.join(imports_cache_path(), f"bill_migration_{shop_id}.json")
+
+    def migrate(self, delete_source: bool = False, dry_run: bool = False,
+                progress: Optional[Callable[[dict], None]] = None, resume: bool = True) -> dict:
+        """
+        Copy the shop's bills from the global collection into its own collection.
+
+        Args:
+            delete_source (bool, optional): Delete each source document once its copy is written.
+            dry_run (bool, optional): Read and validate the source without writing anything.
+            progress (Optional[Callable[[dict], None]]): Called after each page with the running report.
+            resume (bool, optional): Start after the last page completed by a previous run.
+
+        Returns:
+            dict: Report with `copied`, `deleted`, `other_shop` (owned by another shop), `ownerless`
+            (naming no shop and left in place because `claim_ownerless` is off) and `invalid`
+            document counts, `invalid_docs` as (bill number, reason) pairs, and `failed` as
+            (bill number, error) pairs.
+
+        Raises:
+            Exception: If the source collection cannot be read.
+        """
+        report = {"copied": 0, "deleted": 0, "other_shop": 0, "ownerless": 0, "invalid": 0, "invalid_docs": [],
+                  "failed": []}
+        cursor = self._load_checkpoint() if resume and not dry_run else None
+        try:
+            while True:
+                query = self.source.order_by("__name__").limit(self.page_size)
+                if cursor is not None:
+                    query = query.start_after({"__name__": self.source.document(cursor)})
+                docs = list(query.stream())
+                if not docs:
+                    break
+                self._migrate_page(docs, report, delete_source, dry_run)
+                cursor = docs[-1].id
+                if not dry_run:
+                    self._save_checkpoint(cursor)
+                if progress:
+                    progress(dict(report))
+                if len(docs) < self.page_size:
+                    break
+        except Exception as e:
+            raise Exception(f"Failed to migrate bills to shop '{self.shop_id}': {e}")
+
+        # The whole source has been read; running again (e.g. to retry failures) starts from the beginning
+        if not dry_run and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        return report
+
+    def _migrate_page(self, docs: list, report: dict, delete_source: bool, dry_run: bool) -> None:
+        """Copy one page of source documents, then delete the copied ones if asked to."""
+        bills: List[Bill] = []
+        for doc in docs:
+            data = doc.to_dict() or {}
+            owner = data.get("shop_id")
+            if owner and owner != self.shop_id:
+                report["other_shop"] += 1
+                continue
+            if not owner and not self.claim_ownerless:
+                report["ownerless"] += 1
+                continue
+            data["bill_no"] = doc.id
+            try:
+                bills.append(Bill.from_dict(data))
+            except ValueError as e:
+                report["invalid"] += 1
+                report["invalid_docs"].append((doc.id, str(e)))
+        if dry_run:
+            report["copied"] += len(bills)
+            return
+        if not bills:
+            return
+
+        failures = self.repo.save_many(bills)
+        report["failed"].extend(failures.items())
+        copied = [bill.bill_no for bill in bills if bill.bill_no not in failures]
+        report["copied"] += len(copied)
+        if delete_source and copied:
+            batch = self.db.batch()
+            for bill_no in copied:
+                batch.delete(self.source.document(bill_no))
+            batch.commit()
+            report["deleted"] += len(copied)
+
+    def _load_checkpoint(self) -> Optional[str]:
+        """Return the last bill number of the last page completed by a previous run."""
+        try:
+            with open(self.checkpoint_path, "r") as f:
+                return json.load(f).get("last")
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[BillMigrationService] Ignoring unreadable checkpoint: {e}")
+            return None
+
+    def _save_checkpoint(self, last: str) -> None:
+        """Atomically record the last bill number of the completed pages."""
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"last": last}, f)
+        os.replace(tmp_path, self.checkpoint_path)
@@ -0,0 +1,113 @@
+import json
+import os
+import secrets
+import threading
+import time
+from typing import Optional
+
+from config import cache_path
+
+_DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def _base36(value: int, width: int) -> str:
+    """Encode a non-negative integer as fixed-width, zero-padded base36."""
+    chars = []
+    for _ in range(width):
+        value, digit = divmod(value, 36)
+        chars.append(_DIGITS[digit])
+    if value:
+        raise ValueError(f"value does not fit in {width} base36 digits")
+    return "".join(reversed(chars))
+
+
+class BillNumberGenerator:
+    """
+    Issues unique, time-ordered bill numbers without any network call.
+
+    A number is three fixed-width base36 fields: milliseconds since the Unix epoch
+    (9 digits), the terminal ID (4 digits) and a sequence within the millisecond
+    (2 digits), e.g. "0MVBTYZ3N37SN00". Numbers from one terminal never repeat and
+    always increase, and numbers from different terminals differ in the terminal field.
+    Because the fields are fixed-width, sorting numbers as strings sorts them by time.
+
+    The last issued timestamp is saved locally, so numbers keep increasing across
+    restarts even if the system clock is set back.
+    """
+
+    TIME_DIGITS = 9
+    TERMINAL_DIGITS = 4
+    SEQUENCE_DIGITS = 2
+    TERMINAL_ENV = "BILLING_TERMINAL_ID"
+
+    def __init__(self, terminal_id: Optional[str] = None, path: Optional[str] = None):
+        """
+        Load the saved state, assigning this terminal an ID on first use.
+
+        Args:
+            terminal_id (Optional[str]): Up to four base36 characters identifying this terminal. Defaults
+                to the BILLING_TERMINAL_ID environment variable, then to a saved, randomly chosen ID.
+                Assign IDs explicitly when several terminals share a shop, so they are guaranteed to differ.
+            path (Optional[str]): State file. Defaults to `bill_numbers.json` in the cache directory.
+
+        Raises:
+            ValueError: If the terminal ID is not base36 or is too long.
+        """
+        self.path = path or os.path.join(cache_path(), "bill_numbers.json")
+        self._lock = threading.Lock()
+        state = self._load()
+        self._last_ms = int(state.get("last_ms", 0))
+        self._sequence = int(state.get("sequence", 0))
+
+        terminal_id = terminal_id or os.getenv(self.TERMINAL_ENV) or state.get("terminal_id")
+        if not terminal_id:
+            terminal_id = _base36(secrets.randbelow(36 ** self.TERMINAL_DIGITS), self.TERMINAL_DIGITS)
+        terminal_id = terminal_id.upper()
+        if len(terminal_id) > self.TERMINAL_DIGITS or any(c not in _DIGITS for c in terminal_id):
+            raise ValueError(f"Terminal ID must be 1-{self.TERMINAL_DIGITS} base36 characters, got {terminal_id!r}")
+        self.terminal_id = terminal_id.rjust(self.TERMINAL_DIGITS, "0")
+        if state.get("terminal_id") != self.terminal_id:
+            self._save()
+
+    def next(self) -> str:
+        """
+        Issue the next bill number.
+
+        Returns:
+            str: A 15-character bill number.
+        """
+        with self._lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > self._last_ms:
+                self._last_ms, self._sequence = now_ms, 0
+            elif self._sequence + 1 < 36 ** self.SEQUENCE_DIGITS:
+                # Same millisecond, or the clock went back: stay on the last timestamp
+                self._sequence += 1
+            else:
+                # Sequence exhausted: borrow the next millisecond
+                self._last_ms, self._sequence = self._last_ms + 1, 0
+            self._save()
+            return (_base36(self._last_ms, self.TIME_DIGITS) + self.terminal_id
+                    + _base36(self._sequence, self.SEQUENCE_DIGITS))
+
+    def _load(self) -> dict:
+        """Read the saved state, or an empty state if there is none."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"[BillNumberGenerator] Ignoring unreadable state file: {e}")
+            return {}
+
+    def _save(self) -> None:
+        """Write the state atomically."""
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"terminal_id": self.terminal_id, "last_ms": self._last_ms,
+                           "sequence": self._sequence}, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"[BillNumberGenerator] Error saving state: {e}")
@@ -1,8 +1,26 @@
-from typing import Optional, List
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, Optional, List
 
 from auth.firebase_config import FirebaseConfig
-from models.bill_model import Bill
+from config import cache_path
+from models.bill_model import Bill, BillHeader
+from models.promotion_model import Promotion
+from repositories.bill_index import BillIndex
+from repositories.bill_journal import BillJournal
 from repositories.bill_repository import BillRepository
+from repositories.invoice_counter_repository import InvoiceCounterRepository
+from repositories.product_repository import ProductRepository
+from repositories.promotion_repository import PromotionRepository
+from repositories.tax_repository import TaxRepository
+from services.bill_batch_engine import BillBatchEngine, BillMismatch
+from services.bill_cache import BillCache, CacheStats
+from services.bill_number_generator import BillNumberGenerator
+from services.bill_writer import BillWriter, WriterStatus
+from services.invoice_number_allocator import InvoiceNumberAllocator
+from services.promotion_engine import PromotionEngine
+from services.tax_service import TaxService
 
 
 class BillService:
@@ -10,34 +28,282 @@ class BillService:
     Service layer for managing business logic related to Bill operations.
     """
 
-    def __init__(self):
+    # Seconds between reloads of the promotions; a validity window opening or closing triggers one sooner
+    PROMOTION_REFRESH_SECONDS = 300.0
+
+    def __init__(self, shop_id: str, compact_bills: bool = False):
         """
-        Initializes Firestore database and sets up the Bill repository.
+        Initializes Firestore database, sets up the logged-in shop's Bill repository, opens the
+        shop's local bill journal and search index, and loads this terminal's bill number generator.
+
+        Every query and local store is scoped to the shop, so a terminal shared by several
+        shops never shows or syncs one shop's bills under another.
+
+        Args:
+            shop_id (str): UID of the logged-in shop. Bills get sequential invoice numbers from its counter.
+            compact_bills (bool, optional): Save bills with the compact columnar item layout.
         """
         firebase_config = FirebaseConfig()
         self.db = firebase_config.db
-        self.repo = BillRepository(self.db)
+        self.shop_id = shop_id
+        self.repo = BillRepository(self.db, shop_id, compact_bills)
+        self.promotion_repo = PromotionRepository(self.db)
+        self.promotion_engine = PromotionEngine([])
+        self.promotions_version = 0
+        self._promotions: Optional[List[Promotion]] = None
+        self._promotions_stop = threading.Event()
+        self.journal = BillJournal(os.path.join(cache_path(), f"bill_journal_{shop_id}.db"))
+        self._adopt_legacy_journal()
+        self.bill_cache = BillCache()
+        try:
+            self.index: Optional[BillIndex] = BillIndex(os.path.join(cache_path(), f"bill_index_{shop_id}.db"))
+        except Exception as e:
+            print(f"[BillService] Bill search index unavailable: {e}")
+            self.index = None
+        self.bill_numbers = BillNumberGenerator()
+        self._writer: Optional[BillWriter] = None
+        self.invoice_numbers = InvoiceNumberAllocator(
+            InvoiceCounterRepository(self.db, shop_id),
+            self.bill_numbers.terminal_id,
+            path=os.path.join(cache_path(), f"invoice_numbers_{shop_id}.json")
+        )
+
+    def _adopt_legacy_journal(self) -> None:
+        """
+        Move this shop's bills that never synced from the journal shared by all shops, used
+        before bills were stored per shop, into this shop's journal. Bills it holds that did
+        sync were saved to the global collection and are moved by `tools.migrate_bills`.
+
+        A bill is this shop's if it names the shop, or if it names no shop and no other shop
+        has used this terminal; bills cannot be attributed otherwise. Those stay in the shared
+        journal and are reported on every start. The shared journal is retired once empty.
+        """
+        legacy_path = os.path.join(cache_path(), "bill_journal.db")
+        if not os.path.exists(legacy_path):
+            return
+        try:
+            other_shops = self._other_shops_on_terminal()
+            legacy = BillJournal(legacy_path)
+            try:
+                adopted, left = [], []
+                for bill in legacy.unsynced(limit=legacy.count_unsynced()):
+                    owner = bill.shop_id or (None if other_shops else self.shop_id)
+                    (adopted if owner == self.shop_id else left).append(bill)
+                for bill in adopted:
+                    bill.shop_id = self.shop_id
+                    self.journal.append(bill)
+                    legacy.delete(bill.bill_no)
+            finally:
+                legacy.close()
+            if adopted:
+                print(f"[BillService] Moved {len(adopted)} unsynced bill(s) into the journal of shop '{self.shop_id}'")
+            if left:
+                print(f"[BillService] {len(left)} unsynced bill(s) of other or unknown shops left in '{legacy_path}': "
+                      f"{', '.join(bill.bill_no for bill in left)}")
+            else:
+                os.replace(legacy_path, f"{legacy_path}.migrated")
+        except Exception as e:
+            print(f"[BillService] Error moving bills from the shared journal: {e}")
+
+    def _other_shops_on_terminal(self) -> List[str]:
+        """UIDs of other shops that have leased invoice numbers or kept a bill journal on this terminal."""
+        shops = set()
+        for name in os.listdir(cache_path()):
+            for prefix, suffix in (("invoice_numbers_", ".json"), ("bill_journal_", ".db")):
+                if name.startswith(prefix) and name.endswith(suffix):
+                    shops.add(name[len(prefix):-len(suffix)])
+        shops.discard(self.shop_id)
+        return sorted(shops)
+
+    def next_bill_number(self) -> str:
+        """
+        Issue a new bill number. Unique across terminals and never needs the network.
+
+        Returns:
+            str: The bill number.
+        """
+        return self.bill_numbers.next()
 
     def create_bill(self, bill: Bill) -> bool:
         """
-        Create and save a new bill.
+        Create a new bill: record it in the local journal, then save it to Firestore.
+        If Firestore is unreachable the background writer syncs it later.
 
         Args:
             bill (Bill): Bill object to be saved.
 
         Returns:
-            bool: True if successful, False otherwise.
+            bool: True if the bill was recorded, False otherwise.
         """
+        bill.shop_id = self.shop_id
         try:
-            self.repo.save(bill)
-            return True
+            self._assign_invoice_number(bill)
+            self.journal.append(bill)
         except Exception as e:
             print(f"[create_bill] Error creating bill: {e}")
             return False
+        self.bill_cache.put(bill)
+        self._index_bills([bill])
+        try:
+            self.repo.save(bill)
+            self.journal.mark_synced([bill.bill_no])
+        except Exception as e:
+            print(f"[create_bill] Bill '{bill.bill_no}' kept in journal for background sync: {e}")
+            self.start_sync()
+        return True
+
+    def start_sync(self) -> None:
+        """
+        Start the background writer, which also syncs bills left in the journal by earlier
+        sessions, lease invoice numbers ahead of the first checkout, and bring the local
+        search index up to date with bills from other terminals.
+        """
+        if self._writer is None:
+            self._writer = BillWriter(self.journal, self.repo.save_many)
+            self.invoice_numbers.prefetch()
+            if self.index is not None:
+                threading.Thread(target=self.catch_up_bill_index, name="bill-index", daemon=True).start()
+
+    def queue_bill(self, bill: Bill) -> bool:
+        """
+        Record a bill in the local journal; the background writer syncs it to Firestore.
+        Never blocks on the network.
+
+        Args:
+            bill (Bill): Bill object to be saved.
+
+        Returns:
+            bool: True if the bill was journaled, False otherwise.
+        """
+        self.start_sync()
+        bill.shop_id = self.shop_id
+        try:
+            self._assign_invoice_number(bill)
+        except Exception as e:
+            print(f"[queue_bill] Error assigning invoice number to bill '{bill.bill_no}': {e}")
+        if not self._writer.submit(bill):
+            return False
+        self.bill_cache.put(bill)
+        self._index_bills([bill])
+        return True
+
+    def _assign_invoice_number(self, bill: Bill) -> None:
+        """
+        Give a bill the next invoice number, unless it already has one. A bill saved
+        again under the same bill number keeps the invoice number it was first given.
+        """
+        if bill.invoice_no is not None:
+            return
+        previous = self.bill_cache.peek(bill.bill_no) or self.journal.get(bill.bill_no)
+        if previous is not None and previous.invoice_no is not None:
+            bill.invoice_no = previous.invoice_no
+            return
+        bill.invoice_no = self.invoice_numbers.next()
+        if bill.invoice_no is None:
+            print(f"[BillService] No leased invoice numbers available; bill '{bill.bill_no}' has none")
+
+    def writer_status(self) -> WriterStatus:
+        """
+        Return the background writer's progress.
+
+        Returns:
+            WriterStatus: Pending, saved and failed bills.
+        """
+        if self._writer is None:
+            return WriterStatus(pending=0, saved=0, failed=(), retrying=None)
+        return self._writer.status()
+
+    def retry_failed_bills(self) -> int:
+        """
+        Clear the failure counts of bills that keep failing to sync and retry them now.
+
+        Returns:
+            int: Number of bills retried.
+        """
+        return self._writer.retry_failed() if self._writer is not None else 0
+
+    def close(self, timeout: float = 5.0) -> bool:
+        """
+        Give journaled bills up to `timeout` seconds to sync, then stop the writer.
+        Unsynced bills stay in the journal and are synced by the next session, as do
+        leased invoice numbers that cannot be returned within that time.
+
+        Args:
+            timeout (float, optional): Seconds to wait; 0 stops without waiting, e.g. from the UI thread.
+
+        Returns:
+            bool: True if every bill reached Firestore.
+        """
+        self._promotions_stop.set()
+        self.invoice_numbers.close(min(timeout, 2.0))
+        if self._writer is None:
+            return not self.journal.count_unsynced()
+        return self._writer.close(timeout)
+
+    def bill_cache_stats(self) -> CacheStats:
+        """
+        Return the bill cache's hit and miss counters, for sizing the cache.
+
+        Returns:
+            CacheStats: Cache counters.
+        """
+        return self.bill_cache.stats()
+
+    def get_promotion_engine(self) -> PromotionEngine:
+        """
+        Load the active promotions and compile them for use by a cart.
+
+        Returns:
+            PromotionEngine: Compiled promotions; empty if they could not be loaded.
+        """
+        try:
+            return PromotionEngine(self.promotion_repo.list_active())
+        except Exception as e:
+            print(f"[get_promotion_engine] Error loading promotions: {e}")
+            return PromotionEngine([])
+
+    def refresh_promotions(self) -> bool:
+        """
+        Reload the active promotions and compile them into `promotion_engine`, bumping
+        `promotions_version`. If they cannot be loaded, the last loaded promotions are
+        recompiled instead, so windows that opened or closed since still take effect.
+
+        Returns:
+            bool: True if the promotions were reloaded from Firestore.
+        """
+        loaded = True
+        try:
+            self._promotions = self.promotion_repo.list_active()
+        except Exception as e:
+            print(f"[refresh_promotions] Error loading promotions: {e}")
+            loaded = False
+        if self._promotions is not None:
+            self.promotion_engine = PromotionEngine(self._promotions)
+            self.promotions_version += 1
+        return loaded
+
+    def start_promotion_refresh(self) -> None:
+        """
+        Load the promotions in the background, then keep them current: reload every
+        PROMOTION_REFRESH_SECONDS and whenever a validity window opens or closes.
+        Callers pick up a new engine by watching `promotions_version`.
+        """
+        def worker():
+            while True:
+                self.refresh_promotions()
+                wait = self.PROMOTION_REFRESH_SECONDS
+                next_change = self.promotion_engine.next_change
+                if next_change is not None:
+                    wait = min(wait, max(1.0, (next_change - datetime.now(timezone.utc)).total_seconds()))
+                if self._promotions_stop.wait(wait):
+                    return
+
+        threading.Thread(target=worker, name="promotion-refresh", daemon=True).start()
 
     def get_bill(self, bill_no: str) -> Optional[Bill]:
         """
-        Retrieve a bill by its bill number.
+        Retrieve a bill by its bill number: from the cache of recently used bills, else the
+        local journal, else Firestore. Bills read from the journal or Firestore are cached.
 
         Args:
             bill_no (str): Unique bill number.
@@ -45,11 +311,25 @@ class BillService:
         Returns:
             Optional[Bill]: Bill object if found, else None.
         """
+        bill = self.bill_cache.get(bill_no)
+        if bill is not None:
+            return bill
+        try:
+            bill = self.journal.get(bill_no)
+            if bill is not None:
+                self.bill_cache.put(bill)
+                return bill
+        except Exception as e:
+            print(f"[get_bill] Error reading bill '{bill_no}' from journal: {e}")
         try:
-            return self.repo.get_by_id(bill_no)
+            bill = self.repo.get_by_id(bill_no)
         except Exception as e:
             print(f"[get_bill] Error retrieving bill '{bill_no}': {e}")
             return None
+        if bill is not None:
+            self.bill_cache.put(bill)
+            self._index_bills([bill])
+        return bill
 
     def update_bill(self, bill_no: str, updates: dict) -> bool:
         """
@@ -63,7 +343,22 @@ class BillService:
             bool: True if successful, False otherwise.
         """
         try:
-            return self.repo.update(bill_no, updates)
+            updated = self.repo.update(bill_no, updates)
+            local = self.journal.get(bill_no)
+            cached = self.bill_cache.peek(bill_no)
+            if local is not None:
+                local = Bill.from_dict({**local.to_dict(), **updates})
+                self.journal.append(local, synced=True)
+                self.bill_cache.put(local)
+                self._index_bills([local])
+            elif cached is not None:
+                cached = Bill.from_dict({**cached.to_dict(), **updates})
+                self.bill_cache.put(cached)
+                self._index_bills([cached])
+            elif {"customer_name", "customer_phone", "total_amount"} & updates.keys():
+                # Re-reading the bill refreshes its index entry
+                self.get_bill(bill_no)
+            return updated
         except Exception as e:
             print(f"[update_bill] Error updating bill '{bill_no}': {e}")
             return False
@@ -78,7 +373,11 @@ class BillService:
         Returns:
             bool: True if successful, False otherwise.
         """
+        self.bill_cache.invalidate(bill_no)
         try:
+            self.journal.delete(bill_no)
+            if self.index is not None:
+                self.index.remove(bill_no)
             return self.repo.delete(bill_no)
         except Exception as e:
             print(f"[delete_bill] Error deleting bill '{bill_no}': {e}")
@@ -86,7 +385,11 @@ class BillService:
 
     def search_bills(self, field: str, value: str) -> List[Bill]:
         """
-        Search for bills that match a specific field and value.
+        Search the shop's bills for those that match a specific field and value.
+
+        Results merge the local journal with Firestore, so bills that have not synced yet
+        are found and a search still works offline. Where both hold a bill, the journal
+        copy wins.
 
         Args:
             field (str): Field name to search (e.g., 'customer_name').
@@ -95,9 +398,157 @@ class BillService:
         Returns:
             List[Bill]: List of matching Bill objects.
         """
+        bills: Dict[str, Bill] = {}
         try:
             query = self.repo.collection.where(field, "==", value).stream()
-            return [Bill.from_dict(doc.to_dict()) for doc in query]
+            for doc in query:
+                bill = Bill.from_dict(doc.to_dict())
+                bills[bill.bill_no] = bill
+            self._index_bills(bills.values())
         except Exception as e:
             print(f"[search_bills] Error searching bills by {field}={value}: {e}")
+        try:
+            for bill in self.journal.search(field, value):
+                bills[bill.bill_no] = bill
+        except Exception as e:
+            print(f"[search_bills] Error searching journal by {field}={value}: {e}")
+        return list(bills.values())
+
+    def search_bill_pages(self, field: str, value: str, prefix: bool = False, start: Optional[datetime] = None,
+                          end: Optional[datetime] = None, page_size: int = 50) -> Iterator[List[Bill]]:
+        """
+        Search the shop's bills page by page, newest first; each page is fetched only when the caller asks for it.
+
+        Bills still waiting in the local journal are not in Firestore yet, so they lead
+        the first page. The search stops early, after printing the error, if Firestore
+        cannot be reached.
+
+        Args:
+            field (str): Field name to search (e.g., 'customer_name').
+            value (str): Value to match, or the prefix to match when `prefix` is True.
+            prefix (bool, optional): Match values starting with `value`.
+            start (Optional[datetime]): Only bills created at or after this time.
+            end (Optional[datetime]): Only bills created before this time.
+            page_size (int, optional): Bills per Firestore page.
+
+        Yields:
+            List[Bill]: Each non-empty page of matching bills.
+        """
+        try:
+            local = self.journal.search(field, value, prefix, start, end, unsynced_only=True)
+        except Exception as e:
+            print(f"[search_bill_pages] Error searching journal by {field}={value}: {e}")
+            local = []
+        local_nos = {bill.bill_no for bill in local}
+
+        try:
+            for page in self.repo.search_pages(field, value, prefix, start, end, page_size):
+                self._index_bills(page)
+                page = [bill for bill in page if bill.bill_no not in local_nos]
+                if local:
+                    page, local = local + page, []
+                if page:
+                    yield page
+        except Exception as e:
+            print(f"[search_bill_pages] Error searching bills by {field}={value}: {e}")
+        if local:
+            yield local
+
+    def find_bills(self, query: str, limit: int = 50) -> List[BillHeader]:
+        """
+        Look up bills instantly in the local search index by any part of the bill number,
+        customer name or phone number.
+
+        Args:
+            query (str): Search text; every term must match.
+            limit (int, optional): Maximum number of results.
+
+        Returns:
+            List[BillHeader]: Matching bill headers, newest first; empty if the index is unavailable.
+        """
+        if self.index is None:
+            return []
+        try:
+            return self.index.search(query, limit)
+        except Exception as e:
+            print(f"[find_bills] Error searching bill index for '{query}': {e}")
+            return []
+
+    def catch_up_bill_index(self, chunk_size: int = 500) -> int:
+        """
+        Add bills written to Firestore since the index last caught up, e.g. by other terminals,
+        including old bills that only just synced from a terminal that was offline.
+        The first run indexes the whole history; later runs only read newer writes.
+
+        Args:
+            chunk_size (int, optional): Bills written to the index per transaction.
+
+        Returns:
+            int: Number of bills indexed.
+        """
+        if self.index is None:
+            return 0
+        indexed = 0
+        try:
+            state = self.index.get_state("remote_synced_at")
+            since = datetime.fromisoformat(state) if state else None
+            # The first run streams in no particular order, so the watermark only moves at the end
+            ordered = since is not None
+            watermark = since
+            chunk: List[Bill] = []
+            for bill, synced_at in self.repo.stream_synced_since(since):
+                chunk.append(bill)
+                if synced_at is not None and (watermark is None or synced_at > watermark):
+                    watermark = synced_at
+                if len(chunk) >= chunk_size:
+                    indexed += self._index_chunk(chunk, watermark if ordered else None)
+                    chunk = []
+            indexed += self._index_chunk(chunk, watermark)
+        except Exception as e:
+            print(f"[catch_up_bill_index] Error indexing bills: {e}")
+        return indexed
+
+    def _index_chunk(self, bills: List[Bill], watermark: Optional[datetime]) -> int:
+        """Index a chunk of streamed bills, then advance the catch-up watermark if one is given."""
+        count = self.index.add_many(BillHeader.from_bill(bill) for bill in bills) if bills else 0
+        if watermark is not None:
+            self.index.set_state("remote_synced_at", watermark.isoformat())
+        return count
+
+    def _index_bills(self, bills: Iterable[Bill]) -> None:
+        """Add bills to the local search index; indexing problems never fail the caller."""
+        if self.index is None:
+            return
+        try:
+            self.index.add_many(BillHeader.from_bill(bill) for bill in bills)
+        except Exception as e:
+            print(f"[BillService] Error indexing bills: {e}")
+
+    def audit_bills(self, tax_rates: Optional[Dict[str, int]] = None) -> List[BillMismatch]:
+        """
+        Recompute every bill of the shop from its items and report amounts that differ.
+
+        By default items are taxed at the rate recorded on them, falling back to the
+        current category rates. Pass new category rates as `tax_rates` to re-tax every
+        item and see which bills a tax-rule change affects.
+
+        Args:
+            tax_rates (Optional[Dict[str, int]]): Tax rate per category in basis points.
+
+        Returns:
+            List[BillMismatch]: Differing amounts, empty if every bill matches or on error.
+        """
+        try:
+            # Items saved before categories were recorded on bills fall back to the catalog
+            categories = {p.product_id: p.category for p in ProductRepository(self.db).list_all()}
+            if tax_rates is None:
+                table = TaxService(TaxRepository(self.db))
+                table.load_cached()
+                table.refresh()
+                engine = BillBatchEngine(table.category_rates())
+            else:
+                engine = BillBatchEngine(tax_rates, use_recorded_rates=False)
+            return list(engine.audit(self.repo.stream_all(), categories))
+        except Exception as e:
+            print(f"[audit_bills] Error auditing bills: {e}")
             return []
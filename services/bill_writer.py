@@ -0,0 +1,185 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from models.bill_model import Bill
+from repositories.bill_journal import BillJournal
+
+
+@dataclass(frozen=True, slots=True)
+class WriterStatus:
+    """
+    Point-in-time view of the bill writer.
+
+    Attributes:
+        pending (int): Bills in the local journal that have not reached Firestore yet.
+        saved (int): Bills synced since the writer started.
+        failed (Tuple[Tuple[str, str], ...]): (bill number, error) for bills that failed `max_attempts`
+            syncs. They stay in the journal and are still retried.
+        retrying (Optional[str]): Error from the latest failed sync while bills are waiting.
+    """
+    pending: int
+    saved: int
+    failed: Tuple[Tuple[str, str], ...]
+    retrying: Optional[str]
+
+
+class BillWriter:
+    """
+    Records bills in the local journal and syncs them to Firestore on a background thread.
+
+    `submit` only appends to the SQLite journal, so checkout never waits on the network
+    and a bill survives an outage or a restart. A single worker thread pushes the oldest
+    unsynced bills in batches, marks the ones that were saved as synced, and backs off
+    exponentially while nothing gets through. Bills left over from an earlier session
+    are synced as soon as the writer starts.
+    """
+
+    def __init__(self, journal: BillJournal, save_many: Callable[[List[Bill]], Dict[str, str]], batch_size: int = 2000,
+                 max_attempts: int = 5, base_delay: float = 1.0, max_delay: float = 30.0,
+                 idle_interval: float = 30.0):
+        """
+        Start the sync thread.
+
+        Args:
+            journal (BillJournal): Local journal bills are recorded in.
+            save_many (Callable[[List[Bill]], Dict[str, str]]): Persists a list of bills and returns the
+                error for each bill it could not save (e.g. BillRepository.save_many). Raising fails the
+                whole list.
+            batch_size (int, optional): Bills read from the journal and sent per sync.
+            max_attempts (int, optional): Failed syncs after which a bill is reported as failed.
+            base_delay (float, optional): Seconds before the first retry; doubled after each failure.
+            max_delay (float, optional): Upper bound for the retry delay, in seconds.
+            idle_interval (float, optional): Seconds between journal checks when nothing was submitted.
+        """
+        self.journal = journal
+        self.save_many = save_many
+        self.batch_size = batch_size
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.idle_interval = idle_interval
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._retry_now = threading.Event()
+        self._saved = 0
+        self._retrying: Optional[str] = None
+        self._thread = threading.Thread(target=self._run, name="bill-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, bill: Bill) -> bool:
+        """
+        Record a bill in the journal and wake the sync thread. Never touches the network.
+
+        Args:
+            bill (Bill): The bill to save.
+
+        Returns:
+            bool: True if the bill was journaled, False if the writer is closed or the journal write failed.
+        """
+        if self._stop.is_set():
+            return False
+        try:
+            self.journal.append(bill)
+        except Exception as e:
+            print(f"[BillWriter] Error journaling bill '{bill.bill_no}': {e}")
+            return False
+        self._wake.set()
+        return True
+
+    def status(self) -> WriterStatus:
+        """
+        Return the writer's current state.
+
+        Returns:
+            WriterStatus: Pending, saved and failed counts.
+        """
+        try:
+            pending = self.journal.count_unsynced()
+            failed = tuple(self.journal.failing(self.max_attempts))
+        except Exception as e:
+            print(f"[BillWriter] Error reading journal status: {e}")
+            pending, failed = 0, ()
+        with self._lock:
+            return WriterStatus(pending=pending, saved=self._saved, failed=failed,
+                                retrying=self._retrying if pending else None)
+
+    def retry_failed(self) -> int:
+        """
+        Clear the failure counts of unsynced bills and sync again immediately.
+
+        Returns:
+            int: Number of bills whose failures were cleared.
+        """
+        try:
+            reset = self.journal.reset_attempts()
+        except Exception as e:
+            print(f"[BillWriter] Error resetting failed bills: {e}")
+            return 0
+        self._retry_now.set()
+        self._wake.set()
+        return reset
+
+    def close(self, timeout: float = 5.0) -> bool:
+        """
+        Stop accepting bills and give the journal up to `timeout` seconds to sync.
+        Bills still unsynced stay in the journal for the next session.
+
+        Args:
+            timeout (float, optional): Seconds to wait for pending bills to sync.
+
+        Returns:
+            bool: True if every journaled bill was synced before the timeout.
+        """
+        deadline = time.monotonic() + timeout
+        self._wake.set()
+        while self.status().pending and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self._stop.set()
+        self._retry_now.set()
+        self._wake.set()
+        self._thread.join(max(0.0, deadline - time.monotonic()))
+        return not self.status().pending
+
+    def _run(self) -> None:
+        """Worker loop: sync journaled bills in batches until closed."""
+        delay = self.base_delay
+        while not self._stop.is_set():
+            try:
+                bills = self.journal.unsynced(self.batch_size)
+            except Exception as e:
+                print(f"[BillWriter] Error reading journal: {e}")
+                bills = []
+            if not bills:
+                self._wake.wait(self.idle_interval)
+                self._wake.clear()
+                continue
+
+            bill_nos = [bill.bill_no for bill in bills]
+            try:
+                errors = self.save_many(bills)
+            except Exception as e:
+                errors = dict.fromkeys(bill_nos, str(e))
+            synced = [bill_no for bill_no in bill_nos if bill_no not in errors]
+            try:
+                if synced:
+                    self.journal.mark_synced(synced)
+                if errors:
+                    self.journal.record_failures(errors)
+            except Exception as e:
+                print(f"[BillWriter] Error updating journal after sync: {e}")
+            with self._lock:
+                self._saved += len(synced)
+                self._retrying = next(iter(errors.values())) if errors else None
+
+            if synced:
+                delay = self.base_delay
+                continue
+            # Nothing got through: back off. New bills do not end the backoff; retry_failed() and close() do
+            if self._retry_now.wait(delay):
+                self._retry_now.clear()
+                delay = self.base_delay
+            else:
+                delay = min(delay * 2, self.max_delay)
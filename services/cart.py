@@ -0,0 +1,266 @@
+import threading
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+from models.money import round_basis_points
+from models.product_model import Product
+from services.promotion_engine import PromotionEngine
+
+
+@dataclass(frozen=True, slots=True)
+class CartLine:
+    """
+    One product line in the cart.
+
+    Attributes:
+        product_id (str): Unique identifier for the product.
+        product_name (str): Name of the product.
+        category (str): Category of the product.
+        quantity (int): Quantity in the cart.
+        price (int): Unit price in paise, captured when the line was last updated.
+        total (int): Line total (quantity * price) in paise.
+        tax_rate (int): Tax rate applied to the line, in basis points.
+        discount (int): Promotion discount on the line, in paise.
+        promotions (Tuple[str, ...]): IDs of the promotions behind the discount.
+    """
+    product_id: str
+    product_name: str
+    category: str
+    quantity: int
+    price: int
+    total: int
+    tax_rate: int = 0
+    discount: int = 0
+    promotions: Tuple[str, ...] = ()
+
+    @property
+    def net_total(self) -> int:
+        """Line total after discounts; taxes are charged on this amount."""
+        return self.total - self.discount
+
+
+@dataclass(frozen=True, slots=True)
+class CartSnapshot:
+    """
+    Read-only view of the cart totals at one point in time.
+
+    Attributes:
+        lines (Tuple[CartLine, ...]): Lines with a positive quantity, in insertion order.
+        category_totals (Mapping[str, int]): Subtotal per category, in paise.
+        category_taxes (Mapping[str, int]): Tax per category, in paise.
+        grand_total (int): Subtotals plus taxes, in paise.
+    """
+    lines: Tuple[CartLine, ...]
+    category_totals: Mapping[str, int]
+    category_taxes: Mapping[str, int]
+    grand_total: int
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.lines
+
+
+class Cart:
+    """
+    Cart state and running totals, independent of the UI toolkit.
+
+    Each quantity change adjusts only the affected category's subtotal and tax
+    by the change in that line's total, so updating the cart costs the same no
+    matter how large the catalog or the cart is. Amounts are integer paise, so the
+    running totals stay exact however many changes are applied.
+
+    Lines in one category may carry different rates (e.g. HSN-specific ones): each
+    category keeps the sum of `net_total * rate` and rounds it to paise once.
+
+    With a PromotionEngine, each change re-evaluates only the promotions that touch the
+    changed line, and category subtotals are net of discounts.
+    """
+
+    # Basis points: 500 = 5%. Used when no rate lookup is given.
+    TAX_RATES = {"medical": 500, "grocery": 100, "drinks": 1000}
+
+    def __init__(self, rate_for: Optional[Callable[[Product], int]] = None,
+                 promotions: Optional[PromotionEngine] = None):
+        """
+        Initialize an empty cart.
+
+        Args:
+            rate_for (Optional[Callable[[Product], int]]): Returns a product's tax rate in basis
+                points, e.g. ProductService.get_tax_rate. Defaults to TAX_RATES by category.
+            promotions (Optional[PromotionEngine]): Promotions to apply to the lines, if any.
+        """
+        self.rate_for = rate_for or (lambda product: self.TAX_RATES.get(product.category, 0))
+        self.promotions = promotions
+        self._lock = threading.RLock()
+        self._lines: Dict[str, CartLine] = {}
+        self._category_totals: Dict[str, int] = {}
+        self._category_tax_bp: Dict[str, int] = {}
+        self._category_taxes: Dict[str, int] = {}
+        self._grand_total = 0
+        self._snapshot: Optional[CartSnapshot] = None
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def __contains__(self, product_id: str) -> bool:
+        return product_id in self._lines
+
+    def quantity(self, product_id: str) -> int:
+        """
+        Return the quantity of a product in the cart.
+
+        Args:
+            product_id (str): Unique product ID.
+
+        Returns:
+            int: Quantity, 0 if the product is not in the cart.
+        """
+        line = self._lines.get(product_id)
+        return line.quantity if line else 0
+
+    def set_quantity(self, product: Product, quantity: int) -> None:
+        """
+        Set the quantity of a product, updating totals by delta.
+
+        Args:
+            product (Product): The product to set.
+            quantity (int): New quantity. Zero or less removes the line.
+        """
+        with self._lock:
+            old = self._lines.get(product.product_id)
+            if quantity > 0:
+                new = CartLine(product.product_id, product.name, product.category, quantity,
+                               product.price, quantity * product.price, self.rate_for(product))
+                self._lines[product.product_id] = new
+            else:
+                new = None
+                self._lines.pop(product.product_id, None)
+            self._apply_delta(old, new)
+            self._apply_promotions(product.product_id)
+
+    def add(self, product: Product, count: int = 1) -> int:
+        """
+        Change a product's quantity by `count`, never going below zero.
+
+        Args:
+            product (Product): The product to add or remove.
+            count (int, optional): Units to add (negative to remove).
+
+        Returns:
+            int: The new quantity.
+        """
+        with self._lock:
+            quantity = max(0, self.quantity(product.product_id) + count)
+            self.set_quantity(product, quantity)
+            return quantity
+
+    def remove(self, product_id: str) -> None:
+        """
+        Remove a product line from the cart.
+
+        Args:
+            product_id (str): Unique product ID.
+        """
+        with self._lock:
+            old = self._lines.pop(product_id, None)
+            if old is not None:
+                self._apply_delta(old, None)
+                self._apply_promotions(product_id)
+
+    def refresh_prices(self, lookup: Callable[[str], Optional[Product]]) -> None:
+        """
+        Re-price the lines in the cart after a catalog change.
+
+        Args:
+            lookup (Callable[[str], Optional[Product]]): Returns the current product for an ID,
+                or None if it no longer exists.
+        """
+        with self._lock:
+            for product_id, line in list(self._lines.items()):
+                product = lookup(product_id)
+                if product is None:
+                    self.remove(product_id)
+                elif (product.price != line.price or product.category != line.category
+                      or product.name != line.product_name or self.rate_for(product) != line.tax_rate):
+                    self.set_quantity(product, line.quantity)
+
+    def set_promotions(self, promotions: Optional[PromotionEngine]) -> None:
+        """
+        Switch to a newly compiled set of promotions and re-price every line with it.
+
+        Args:
+            promotions (Optional[PromotionEngine]): Promotions to apply from now on, or None for none.
+        """
+        with self._lock:
+            for product_id, line in list(self._lines.items()):
+                if line.discount or line.promotions:
+                    updated = replace(line, discount=0, promotions=())
+                    self._lines[product_id] = updated
+                    self._apply_delta(line, updated)
+            self.promotions = promotions
+            if promotions is not None:
+                promotions.reset()
+                for product_id in list(self._lines):
+                    self._apply_promotions(product_id)
+
+    def clear(self) -> None:
+        """Empty the cart."""
+        with self._lock:
+            self._lines.clear()
+            self._category_totals.clear()
+            self._category_tax_bp.clear()
+            self._category_taxes.clear()
+            self._grand_total = 0
+            self._snapshot = None
+            if self.promotions is not None:
+                self.promotions.reset()
+
+    def snapshot(self) -> CartSnapshot:
+        """
+        Return a read-only view of the current cart, cached until the next change.
+
+        Returns:
+            CartSnapshot: Current lines and totals.
+        """
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = CartSnapshot(
+                    lines=tuple(self._lines.values()),
+                    category_totals=MappingProxyType(dict(self._category_totals)),
+                    category_taxes=MappingProxyType(dict(self._category_taxes)),
+                    grand_total=self._grand_total
+                )
+            return self._snapshot
+
+    def _apply_promotions(self, product_id: str) -> None:
+        """Let the promotion engine re-price the lines affected by a change to one line."""
+        if self.promotions is None:
+            return
+        for target_id, (discount, promotion_ids) in self.promotions.line_changed(product_id, self._lines).items():
+            line = self._lines.get(target_id)
+            if line is not None and (line.discount, line.promotions) != (discount, promotion_ids):
+                updated = replace(line, discount=discount, promotions=promotion_ids)
+                self._lines[target_id] = updated
+                self._apply_delta(line, updated)
+
+    def _apply_delta(self, old: Optional[CartLine], new: Optional[CartLine]) -> None:
+        """Move category subtotals, taxes and the grand total by the change in one line."""
+        if old is not None:
+            self._adjust_category(old.category, -old.net_total, -old.net_total * old.tax_rate)
+        if new is not None:
+            self._adjust_category(new.category, new.net_total, new.net_total * new.tax_rate)
+        self._snapshot = None
+
+    def _adjust_category(self, category: str, amount: int, tax_bp: int) -> None:
+        """Add a line's amount and tax numerator to its category and recompute only that category's tax."""
+        subtotal = self._category_totals.get(category, 0) + amount
+        category_tax_bp = self._category_tax_bp.get(category, 0) + tax_bp
+        old_tax = self._category_taxes.get(category, 0)
+        tax = round_basis_points(category_tax_bp)
+
+        self._category_totals[category] = subtotal
+        self._category_tax_bp[category] = category_tax_bp
+        self._category_taxes[category] = tax
+        self._grand_total += amount + tax - old_tax
+
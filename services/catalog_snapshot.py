@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import zlib
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from config import catalog_cache_path
+from models.product_model import Product
+
+
+class CatalogSnapshot:
+    """
+    Compact on-disk snapshot of the product catalog used for warm starts.
+
+    File layout:
+    - Line 1: JSON header with `version`, `synced_at`, `count` and a SHA-256 `checksum`
+    - Rest: zlib-compressed JSON array of product dictionaries
+
+    A snapshot whose version or checksum does not match is ignored.
+    """
+
+    VERSION = 2
+
+    def __init__(self, filename: str = "products.snapshot"):
+        """
+        Initialize the snapshot store.
+
+        Args:
+            filename (str, optional): File name inside the catalog cache directory.
+        """
+        self.path = os.path.join(catalog_cache_path(), filename)
+
+    def load(self) -> Optional[Tuple[List[Product], datetime]]:
+        """
+        Read the snapshot from disk.
+
+        Returns:
+            Optional[Tuple[List[Product], datetime]]: The cached products and the last-sync
+            timestamp, or None if there is no valid snapshot.
+        """
+        if not os.path.exists(self.path):
+            return None
+
+        try:
+            with open(self.path, "rb") as f:
+                header = json.loads(f.readline())
+                payload = f.read()
+
+            if header.get("version") != self.VERSION:
+                return None
+            if hashlib.sha256(payload).hexdigest() != header.get("checksum"):
+                print("[CatalogSnapshot] Checksum mismatch, ignoring snapshot")
+                return None
+
+            rows = json.loads(zlib.decompress(payload))
+            products = [Product.from_dict(row) for row in rows]
+            return products, datetime.fromisoformat(header["synced_at"])
+        except Exception as e:
+            print(f"[CatalogSnapshot] Error loading snapshot: {e}")
+            return None
+
+    def save(self, products: List[Product], synced_at: Optional[datetime] = None) -> bool:
+        """
+        Atomically write the catalog to disk.
+
+        Args:
+            products (List[Product]): Products to persist.
+            synced_at (Optional[datetime]): Time of the last sync with Firestore. Defaults to now.
+
+        Returns:
+            bool: True if the snapshot was written, False otherwise.
+        """
+        try:
+            rows = [self._serializable(p.to_dict()) for p in products]
+            payload = zlib.compress(json.dumps(rows, separators=(",", ":")).encode("utf-8"))
+            header = {
+                "version": self.VERSION,
+                "synced_at": (synced_at or datetime.now(timezone.utc)).isoformat(),
+                "count": len(rows),
+                "checksum": hashlib.sha256(payload).hexdigest()
+            }
+
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(json.dumps(header).encode("utf-8") + b"\n")
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+            return True
+        except Exception as e:
+            print(f"[CatalogSnapshot] Error saving snapshot: {e}")
+            return False
+
+    @staticmethod
+    def _serializable(data: dict) -> dict:
+        """Convert datetime values to ISO strings for JSON."""
+        return {k: v.isoformat() if isinstance(v, datetime) else v for k, v in data.items()}
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from auth.firebase_config import FirebaseConfig
+from models.invoice_lease_model import InvoiceLease
+from repositories.bill_repository import BillRepository
+from repositories.invoice_counter_repository import InvoiceCounterRepository
+
+
+class InvoiceLeaseService:
+    """
+    Service for finding and releasing invoice number leases that terminals never returned,
+    e.g. because a terminal was retired or lost while holding a block.
+
+    The counter does not track how far into a block a terminal got, so a released lease
+    returns only the numbers after the highest invoice number synced from its block. A
+    terminal that is still offline with unsynced bills could otherwise see its numbers
+    issued again, so only leases expired for a grace period are considered.
+    """
+
+    def __init__(self, shop_id: str):
+        """
+        Initialize Firestore and the shop's counter and Bill repositories.
+
+        Args:
+            shop_id (str): UID of the shop whose counter is inspected.
+        """
+        firebase_config = FirebaseConfig()
+        self.db = firebase_config.db
+        self.counter_repo = InvoiceCounterRepository(self.db, shop_id)
+        self.bill_repo = BillRepository(self.db, shop_id)
+
+    def expired_leases(self, grace: timedelta = timedelta(hours=24)) -> List[InvoiceLease]:
+        """
+        Retrieve the leases that expired more than `grace` ago without being returned.
+
+        Args:
+            grace (timedelta, optional): Time a lease must have been expired for.
+
+        Returns:
+            List[InvoiceLease]: Expired leases, lowest numbers first.
+
+        Raises:
+            Exception: If the counter cannot be read.
+        """
+        now = datetime.now(timezone.utc) - grace
+        return [lease for lease in self.counter_repo.list_leases() if lease.is_expired(now)]
+
+    def release(self, lease: InvoiceLease) -> int:
+        """
+        Close an expired lease, returning the numbers after the last one synced from it.
+
+        Args:
+            lease (InvoiceLease): A lease from `expired_leases`.
+
+        Returns:
+            int: How many numbers went back to the counter's free list.
+
+        Raises:
+            Exception: If the bills or the counter cannot be read or updated.
+        """
+        highest = self.bill_repo.highest_invoice_no(lease.start, lease.end)
+        lease.next = lease.start if highest is None else highest + 1
+        self.counter_repo.return_block(lease)
+        return lease.remaining
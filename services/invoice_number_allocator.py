@@ -0,0 +1,167 @@
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from config import cache_path
+from models.invoice_lease_model import InvoiceLease
+from repositories.invoice_counter_repository import InvoiceCounterRepository
+
+
+class InvoiceNumberAllocator:
+    """
+    Hands out short, sequential invoice numbers from blocks leased from the shop's counter.
+
+    The terminal leases a block (100 numbers by default) in one Firestore transaction
+    and issues numbers from it locally, so checkout never waits on the counter. When
+    the numbers left fall below `low_water`, the next block is leased on a background
+    thread. Leases and the position within them are saved locally after every number.
+
+    Numbers are not issued from an expired lease; its unissued numbers are returned to
+    the counter's free list, as are the unissued numbers of open leases on `close`.
+    Returns that fail (e.g. while offline) are retried on the next refill or session.
+    """
+
+    def __init__(self, repo: InvoiceCounterRepository, terminal_id: str, block_size: int = 100,
+                 lease_seconds: float = 12 * 3600, low_water: int = 20, path: Optional[str] = None):
+        """
+        Load the saved leases.
+
+        Args:
+            repo (InvoiceCounterRepository): Repository for the shop's counter document.
+            terminal_id (str): This terminal's ID.
+            block_size (int, optional): Numbers reserved per lease.
+            lease_seconds (float, optional): How long a lease stays usable.
+            low_water (int, optional): Numbers left at which the next block is leased.
+            path (Optional[str]): State file. Defaults to `invoice_numbers.json` in the cache directory.
+        """
+        self.repo = repo
+        self.terminal_id = terminal_id
+        self.block_size = block_size
+        self.lease_seconds = lease_seconds
+        self.low_water = low_water
+        self.path = path or os.path.join(cache_path(), "invoice_numbers.json")
+        self._lock = threading.Lock()
+        self._refill_thread: Optional[threading.Thread] = None
+        self._leases: List[InvoiceLease] = []
+        self._returns: List[InvoiceLease] = []
+        self._load()
+
+    def next(self) -> Optional[int]:
+        """
+        Issue the next invoice number. Never touches the network.
+
+        Returns:
+            Optional[int]: The number, or None if no leased number is available (e.g. offline on first use).
+        """
+        with self._lock:
+            self._retire_expired()
+            number = None
+            if self._leases:
+                lease = self._leases[0]
+                number = lease.next
+                lease.next += 1
+                if not lease.remaining:
+                    # Still returned, so the counter drops the lease
+                    self._returns.append(self._leases.pop(0))
+                self._save()
+            low = sum(lease.remaining for lease in self._leases) < self.low_water
+        if low or self._returns:
+            self.prefetch()
+        return number
+
+    def prefetch(self) -> None:
+        """Return pending blocks and lease a new one if needed, on a background thread."""
+        with self._lock:
+            if self._refill_thread is not None and self._refill_thread.is_alive():
+                return
+            self._refill_thread = threading.Thread(target=self._refill, name="invoice-lease", daemon=True)
+            self._refill_thread.start()
+
+    def close(self, timeout: float = 2.0) -> bool:
+        """
+        Return the unissued numbers of every open lease, waiting at most `timeout` seconds.
+
+        The blocks are recorded as pending returns on disk first, so blocks that are not
+        returned in time, e.g. while offline, are returned by the next session.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the counter.
+
+        Returns:
+            bool: True if every block was returned.
+        """
+        with self._lock:
+            self._returns.extend(self._leases)
+            self._leases = []
+            self._save()
+        worker = threading.Thread(target=self._return_pending, name="invoice-return", daemon=True)
+        worker.start()
+        worker.join(timeout)
+        with self._lock:
+            return not worker.is_alive() and not self._returns
+
+    def _refill(self) -> None:
+        """Background refill: return pending blocks, then lease a block if running low."""
+        self._return_pending()
+        with self._lock:
+            if sum(lease.remaining for lease in self._leases) >= self.low_water:
+                return
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.lease_seconds)
+        try:
+            lease = self.repo.lease_block(self.terminal_id, self.block_size, expires_at)
+        except Exception as e:
+            print(f"[InvoiceNumberAllocator] Error leasing invoice numbers: {e}")
+            return
+        with self._lock:
+            self._leases.append(lease)
+            self._save()
+
+    def _return_pending(self) -> None:
+        """Return the blocks waiting to go back to the counter, keeping the ones that fail."""
+        with self._lock:
+            pending, self._returns = self._returns, []
+        failed = []
+        for lease in pending:
+            try:
+                self.repo.return_block(lease)
+            except Exception as e:
+                print(f"[InvoiceNumberAllocator] {e}")
+                failed.append(lease)
+        with self._lock:
+            self._returns = failed + self._returns
+            self._save()
+
+    def _retire_expired(self) -> None:
+        """Move expired leases to the return list. Caller holds the lock."""
+        expired = [lease for lease in self._leases if lease.is_expired()]
+        if expired:
+            self._leases = [lease for lease in self._leases if not lease.is_expired()]
+            self._returns.extend(expired)
+            self._save()
+
+    def _load(self) -> None:
+        """Read the saved leases."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self._leases = [InvoiceLease.from_dict(row) for row in state.get("leases", [])]
+            self._returns = [InvoiceLease.from_dict(row) for row in state.get("returns", [])]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[InvoiceNumberAllocator] Ignoring unreadable state file: {e}")
+
+    def _save(self) -> None:
+        """Write the leases atomically. Caller holds the lock."""
+        def rows(leases: List[InvoiceLease]) -> list:
+            return [{**lease.to_dict(), "expires_at": lease.expires_at.isoformat()} for lease in leases]
+
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"leases": rows(self._leases), "returns": rows(self._returns)}, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"[InvoiceNumberAllocator] Error saving state: {e}")
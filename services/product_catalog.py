@@ -0,0 +1,487 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from models.product_model import Product
+from repositories.product_repository import ProductRepository
+from services.catalog_snapshot import CatalogSnapshot
+
+
+class ProductCatalog:
+    """
+    In-memory cache of the product catalog.
+
+    The catalog is loaded once and then kept fresh by a Firestore `on_snapshot`
+    listener on the products collection, so reads never touch the network.
+    If the listener drops, the cached data is treated as stale after `ttl_seconds`
+    and the next read re-subscribes (falling back to a plain bulk load).
+
+    When a `CatalogSnapshot` is supplied, the catalog can warm-start from disk and
+    then reconcile in the background by downloading only products whose
+    `updated_at` is newer than the snapshot. A delta never reports products deleted
+    before it started, so after a delta catch-up, and then every `full_resync_after`
+    while no full listener is running, the cached IDs are checked against Firestore.
+    """
+
+    def __init__(
+            self,
+            repo: ProductRepository,
+            snapshot: Optional[CatalogSnapshot] = None,
+            ttl_seconds: float = 300.0,
+            initial_timeout: float = 10.0,
+            full_resync_after: timedelta = timedelta(days=1)
+    ):
+        """
+        Initialize the catalog.
+
+        Args:
+            repo (ProductRepository): Repository used to load and watch products.
+            snapshot (Optional[CatalogSnapshot]): On-disk snapshot store for warm starts.
+            ttl_seconds (float, optional): Maximum age of the cache while the listener is down.
+            initial_timeout (float, optional): Seconds to wait for the listener's first snapshot
+                before falling back to a bulk load.
+            full_resync_after (timedelta, optional): Snapshots older than this are refreshed in full
+                rather than by delta, which also drops products deleted in the meantime. Also the
+                interval between checks for deleted products while the catalog is kept by delta.
+        """
+        self.repo = repo
+        self.snapshot = snapshot
+        self.ttl_seconds = ttl_seconds
+        self.initial_timeout = initial_timeout
+        self.full_resync_after = full_resync_after
+
+        self._lock = threading.RLock()
+        self._products: Dict[str, Product] = {}
+        self._by_category: Dict[str, Dict[str, Product]] = {}
+        self._by_barcode: Dict[str, Product] = {}
+        self._loaded_at: Optional[float] = None
+        self._synced_at: Optional[datetime] = None
+        self._watch = None
+        self._watch_is_delta = False
+        self._first_snapshot = threading.Event()
+        self._listeners: List[Callable[[List[Product], List[str]], None]] = []
+        self._pending_upserts: List[Product] = []
+        self._pending_removals: List[str] = []
+        # Products written while a reconcile was listing IDs, which it must not drop
+        self._reconcile_seen: Optional[set] = None
+        self._reconciler: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+
+        # Incremented on every change so callers can cheaply detect updates
+        self.version = 0
+
+    def get_all_products(self) -> List[Product]:
+        """
+        Return every cached product.
+
+        Returns:
+            List[Product]: All products in the catalog.
+        """
+        self._ensure_fresh()
+        return self.cached_products()
+
+    def cached_products(self) -> List[Product]:
+        """
+        Return the products currently cached, without loading or refreshing the catalog.
+        Safe to call from background threads that must not touch the network.
+
+        Returns:
+            List[Product]: The cached products, possibly none.
+        """
+        with self._lock:
+            return list(self._products.values())
+
+    def get_product_by_id(self, product_id: str) -> Optional[Product]:
+        """
+        Return a cached product by its ID.
+
+        Args:
+            product_id (str): Unique product ID.
+
+        Returns:
+            Optional[Product]: The product if present, else None.
+        """
+        self._ensure_fresh()
+        with self._lock:
+            return self._products.get(product_id)
+
+    def get_products_by_ids(self, product_ids: List[str]) -> List[Product]:
+        """
+        Return cached products for several IDs, skipping unknown ones.
+
+        Args:
+            product_ids (List[str]): Unique product IDs.
+
+        Returns:
+            List[Product]: Products found in the catalog.
+        """
+        self._ensure_fresh()
+        with self._lock:
+            return [self._products[pid] for pid in product_ids if pid in self._products]
+
+    def get_products_by_category(self, category: str) -> List[Product]:
+        """
+        Return cached products that belong to a category.
+
+        Args:
+            category (str): Category name.
+
+        Returns:
+            List[Product]: Products in the given category.
+        """
+        self._ensure_fresh()
+        with self._lock:
+            return list(self._by_category.get(category, {}).values())
+
+    def get_product_by_barcode(self, barcode: str) -> Optional[Product]:
+        """
+        Return a cached product by its barcode/SKU.
+
+        Args:
+            barcode (str): Scanned or typed code.
+
+        Returns:
+            Optional[Product]: The product if the code is known, else None.
+        """
+        self._ensure_fresh()
+        with self._lock:
+            return self._by_barcode.get(barcode.strip())
+
+    def get_products_grouped(self) -> Dict[str, List[Product]]:
+        """
+        Return every cached product grouped by category, from the maintained category index.
+
+        Returns:
+            Dict[str, List[Product]]: Mapping of category name to its products.
+        """
+        self._ensure_fresh()
+        with self._lock:
+            return {category: list(products.values()) for category, products in self._by_category.items()}
+
+    def add_listener(self, callback: Callable[[List[Product], List[str]], None]) -> None:
+        """
+        Register a callback for catalog changes.
+
+        The callback receives the products that were added or replaced and the IDs that were
+        removed. It is called immediately with the current contents, then after every change,
+        possibly from the Firestore listener thread.
+
+        Args:
+            callback (Callable[[List[Product], List[str]], None]): Change handler.
+        """
+        with self._lock:
+            self._listeners.append(callback)
+            if self._products:
+                callback(list(self._products.values()), [])
+
+    def ensure_loaded(self) -> None:
+        """
+        Load the catalog if it has not been loaded yet or has gone stale.
+
+        Raises:
+            Exception: If the catalog cannot be loaded.
+        """
+        self._ensure_fresh()
+
+    def load_cached(self) -> bool:
+        """
+        Populate the catalog from the on-disk snapshot without touching the network.
+
+        Returns:
+            bool: True if a valid snapshot was loaded, False otherwise.
+        """
+        if self.snapshot is None:
+            return False
+
+        cached = self.snapshot.load()
+        if cached is None:
+            return False
+
+        products, synced_at = cached
+        with self._lock:
+            self._replace_all(products)
+            self._synced_at = synced_at
+            self._loaded_at = time.monotonic()
+            self._notify()
+        return True
+
+    def refresh(self) -> None:
+        """
+        Reconcile the catalog with Firestore.
+
+        A recent snapshot is brought up to date by delta (only products changed since
+        the newest `updated_at` seen); otherwise the whole catalog is reloaded.
+
+        Raises:
+            Exception: If the catalog cannot be refreshed.
+        """
+        since = self._delta_watermark()
+        if since is None:
+            self.reload()
+            return
+
+        caught_up = False
+        if not self._listener_active():
+            caught_up = self._start_listener(since) and self._first_snapshot.wait(self.initial_timeout)
+        if not caught_up:
+            self._merge(self.repo.list_updated_since(since))
+
+        self.reconcile()
+        self._schedule_reconcile()
+
+    def reconcile(self) -> int:
+        """
+        Drop cached products that no longer exist in Firestore.
+
+        Only product IDs are downloaded. Products written while the IDs are being
+        listed are kept.
+
+        Returns:
+            int: Number of products dropped.
+
+        Raises:
+            Exception: If the product IDs cannot be listed.
+        """
+        with self._lock:
+            self._reconcile_seen = set()
+        try:
+            existing = set(self.repo.list_ids())
+        except Exception:
+            with self._lock:
+                self._reconcile_seen = None
+            raise
+        with self._lock:
+            seen, self._reconcile_seen = self._reconcile_seen, None
+            gone = [pid for pid in self._products if pid not in existing and pid not in seen]
+            for product_id in gone:
+                self._remove(product_id)
+            if gone:
+                self._notify()
+        if gone:
+            self._persist()
+        return len(gone)
+
+    def refresh_async(self) -> threading.Thread:
+        """
+        Run `refresh` on a background thread.
+
+        Returns:
+            threading.Thread: The started worker thread.
+        """
+
+        def worker():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[ProductCatalog] Error refreshing catalog: {e}")
+
+        thread = threading.Thread(target=worker, name="catalog-refresh", daemon=True)
+        thread.start()
+        return thread
+
+    def reload(self) -> None:
+        """
+        (Re)load the full catalog, preferring the live listener over a one-off bulk read.
+
+        Raises:
+            Exception: If the catalog cannot be loaded.
+        """
+        if not self._listener_active() or self._watch_is_delta:
+            if self._start_listener() and self._first_snapshot.wait(self.initial_timeout):
+                return
+
+        products = self.repo.list_all()
+        with self._lock:
+            self._replace_all(products)
+            self._loaded_at = time.monotonic()
+            self._synced_at = datetime.now(timezone.utc)
+            self._notify()
+        self._persist()
+
+    def close(self) -> None:
+        """Stop the live listener, if any, and the periodic check for deleted products."""
+        self._closed.set()
+        self._stop_listener()
+
+    def _schedule_reconcile(self) -> None:
+        """Start the background thread that checks for deleted products every `full_resync_after`."""
+        with self._lock:
+            if self._reconciler is not None:
+                return
+
+            def worker():
+                while not self._closed.wait(self.full_resync_after.total_seconds()):
+                    # A full listener reports deletions itself
+                    if self._listener_active() and not self._watch_is_delta:
+                        continue
+                    try:
+                        self.reconcile()
+                    except Exception as e:
+                        print(f"[ProductCatalog] Error checking for deleted products: {e}")
+
+            self._reconciler = threading.Thread(target=worker, name="catalog-reconcile", daemon=True)
+            self._reconciler.start()
+
+    def _stop_listener(self) -> None:
+        """Stop the live listener, if any."""
+        with self._lock:
+            watch, self._watch = self._watch, None
+        if watch is not None:
+            try:
+                watch.unsubscribe()
+            except Exception as e:
+                print(f"[ProductCatalog] Error stopping listener: {e}")
+
+    def _ensure_fresh(self) -> None:
+        """Load the catalog on first use, or again once it is stale and unwatched."""
+        with self._lock:
+            if self._loaded_at is not None:
+                if self._listener_active() or time.monotonic() - self._loaded_at < self.ttl_seconds:
+                    return
+        self.refresh()
+
+    def _delta_watermark(self) -> Optional[datetime]:
+        """
+        Return the server time after which changes still need downloading.
+
+        Returns:
+            Optional[datetime]: Newest `updated_at` in the cache, or None when a full load is needed.
+        """
+        with self._lock:
+            if self._synced_at is None or datetime.now(timezone.utc) - self._synced_at > self.full_resync_after:
+                return None
+            stamps = [p.updated_at for p in self._products.values() if p.updated_at is not None]
+        return max(stamps) if stamps else None
+
+    def _merge(self, products: List[Product]) -> None:
+        """Apply changed products on top of the cache and persist the result."""
+        with self._lock:
+            for product in products:
+                self._put(product)
+            self._loaded_at = time.monotonic()
+            self._synced_at = datetime.now(timezone.utc)
+            self._notify()
+        self._persist()
+
+    def _persist(self, synced_at: Optional[datetime] = None) -> None:
+        """Write the current catalog to the on-disk snapshot, if configured."""
+        if self.snapshot is None:
+            return
+        with self._lock:
+            products = list(self._products.values())
+            synced_at = synced_at or self._synced_at
+        self.snapshot.save(products, synced_at)
+
+    def _replace_all(self, products: List[Product]) -> None:
+        """Replace the cache contents, rebuilding the category index in the same pass."""
+        incoming = {p.product_id for p in products}
+        self._pending_removals.extend(pid for pid in self._products if pid not in incoming)
+        self._products = {}
+        self._by_category = {}
+        self._by_barcode = {}
+        for product in products:
+            self._put(product)
+
+    def _put(self, product: Product) -> None:
+        """Insert or replace one product, keeping the category and barcode indexes in step."""
+        previous = self._products.get(product.product_id)
+        if previous is not None and (previous.category != product.category or previous.barcode != product.barcode):
+            self._remove(product.product_id)
+        self._products[product.product_id] = product
+        if self._reconcile_seen is not None:
+            self._reconcile_seen.add(product.product_id)
+        self._by_category.setdefault(product.category, {})[product.product_id] = product
+        if product.barcode:
+            self._by_barcode[product.barcode] = product
+        self._pending_upserts.append(product)
+
+    def _remove(self, product_id: str) -> None:
+        """Drop one product from the cache and the category and barcode indexes."""
+        product = self._products.pop(product_id, None)
+        if product is None:
+            return
+        self._pending_removals.append(product_id)
+        bucket = self._by_category.get(product.category)
+        if bucket is not None:
+            bucket.pop(product_id, None)
+            if not bucket:
+                del self._by_category[product.category]
+        if product.barcode and self._by_barcode.get(product.barcode) is product:
+            del self._by_barcode[product.barcode]
+
+    def _notify(self) -> None:
+        """Bump the version and hand the pending changes to registered listeners."""
+        upserted, self._pending_upserts = self._pending_upserts, []
+        removed, self._pending_removals = self._pending_removals, []
+        self.version += 1
+
+        # A product moved between categories is removed and re-added; report it once as an upsert
+        removed = [pid for pid in dict.fromkeys(removed) if pid not in self._products]
+        for callback in self._listeners:
+            try:
+                callback(upserted, removed)
+            except Exception as e:
+                print(f"[ProductCatalog] Error in change listener: {e}")
+
+    def _listener_active(self) -> bool:
+        """Check whether the Firestore listener is still streaming."""
+        watch = self._watch
+        return watch is not None and bool(getattr(watch, "is_active", False))
+
+    def _start_listener(self, since: Optional[datetime] = None) -> bool:
+        """
+        Subscribe to changes on the products collection.
+
+        Args:
+            since (Optional[datetime]): When given, only products changed after this time are
+                streamed, so the initial snapshot is a delta rather than the whole catalog.
+
+        Returns:
+            bool: True if the listener was started, False if subscribing failed.
+        """
+        self._stop_listener()
+        self._first_snapshot.clear()
+        self._watch_is_delta = since is not None
+        try:
+            query = self.repo.changed_since_query(since) if since is not None else self.repo.collection
+            self._watch = query.on_snapshot(self._on_snapshot)
+            return True
+        except Exception as e:
+            print(f"[ProductCatalog] Error starting listener: {e}")
+            self._watch = None
+            return False
+
+    def _on_snapshot(self, docs, changes, read_time) -> None:
+        """
+        Apply a batch of document changes from the listener thread.
+
+        The first snapshot of a full listener replaces the cache wholesale, so products
+        deleted while the listener was down do not linger. The first snapshot of a delta
+        listener is merged on top of the cache instead.
+
+        Args:
+            docs: Current documents matched by the listener.
+            changes: Document changes since the previous snapshot.
+            read_time: Server time of the snapshot.
+        """
+        with self._lock:
+            if not self._first_snapshot.is_set():
+                fresh = [self.repo.to_product(doc) for doc in docs]
+                if self._watch_is_delta:
+                    for product in fresh:
+                        self._put(product)
+                else:
+                    self._replace_all(fresh)
+            else:
+                for change in changes:
+                    doc = change.document
+                    if change.type.name == "REMOVED":
+                        self._remove(doc.id)
+                    else:
+                        self._put(self.repo.to_product(doc))
+            self._loaded_at = time.monotonic()
+            self._synced_at = read_time or datetime.now(timezone.utc)
+            self._notify()
+        self._first_snapshot.set()
+        self._persist()
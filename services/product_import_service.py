@@ -0,0 +1,258 @@
+import csv
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from auth.firebase_config import FirebaseConfig
+from config import imports_cache_path
+from models.money import to_paise
+from models.product_model import Product
+from repositories.product_repository import ProductRepository
+
+
+class ProductImportService:
+    """
+    Service for bulk-loading a price list (CSV or XLSX) into the products collection.
+
+    Rows are streamed from the file, validated into Product objects and committed in
+    WriteBatch chunks (500 documents by default) across a small thread pool.
+    Completed chunks are checkpointed on disk, so re-running an interrupted import
+    of the same file only sends the chunks that did not make it.
+
+    Expected columns: product_id, name, price, category, and optionally barcode and hsn_code.
+    """
+
+    REQUIRED_COLUMNS = ("product_id", "name", "price", "category")
+    MAX_BATCH_SIZE = 500
+    # Firestore's limit on a document ID
+    MAX_ID_BYTES = 1500
+
+    def __init__(self, chunk_size: int = MAX_BATCH_SIZE, workers: int = 4, max_attempts: int = 3):
+        """
+        Initialize Firestore and the Product repository.
+
+        Args:
+            chunk_size (int, optional): Documents per WriteBatch commit (at most 500).
+            workers (int, optional): Number of concurrent batch commits.
+            max_attempts (int, optional): Attempts per chunk before it is reported as failed.
+        """
+        firebase_config = FirebaseConfig()
+        self.db = firebase_config.db
+        self.repo = ProductRepository(self.db)
+        self.chunk_size = max(1, min(chunk_size, self.MAX_BATCH_SIZE))
+        self.workers = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+
+    def import_file(self, path: str, progress: Optional[Callable[[dict], None]] = None,
+                    resume: bool = True) -> dict:
+        """
+        Import a CSV or XLSX price list.
+
+        Args:
+            path (str): Path to the price list.
+            progress (Optional[Callable[[dict], None]]): Called after each chunk with the running report.
+            resume (bool, optional): Skip chunks recorded as committed by a previous run of the same file.
+
+        Returns:
+            dict: Report with `imported`, `skipped` (already committed earlier) and `invalid` row counts,
+            `invalid_rows` as (row number, reason) pairs, and `failed_chunks` as (chunk index, error) pairs.
+
+        Raises:
+            Exception: If the file cannot be read.
+        """
+        checkpoint_path = self._checkpoint_path(path)
+        done = self._load_checkpoint(checkpoint_path) if resume else set()
+        lock = threading.Lock()
+        report = {"imported": 0, "skipped": 0, "invalid": 0, "invalid_rows": [], "failed_chunks": []}
+
+        def commit(index: int, products: List[Product]) -> None:
+            error = self._commit_with_retry(products)
+            with lock:
+                if error is None:
+                    done.add(index)
+                    report["imported"] += len(products)
+                    self._save_checkpoint(checkpoint_path, done)
+                else:
+                    report["failed_chunks"].append((index, error))
+                if progress:
+                    progress(dict(report))
+
+        def collect(finished: set) -> None:
+            # Errors outside the batch commit itself, e.g. writing the checkpoint, surface here
+            for future in finished:
+                index = pending.pop(future)
+                try:
+                    future.result()
+                except Exception as e:
+                    with lock:
+                        report["failed_chunks"].append((index, f"Worker error: {e}"))
+
+        pending: Dict[Future, int] = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for index, products in self._chunks(path, report):
+                    if index in done:
+                        report["skipped"] += len(products)
+                        continue
+                    # Bound the chunks held in memory to what the pool can work on
+                    if len(pending) >= self.workers * 2:
+                        collect(wait(pending, return_when=FIRST_COMPLETED).done)
+                    pending[pool.submit(commit, index, products)] = index
+                collect(wait(pending).done)
+        except Exception as e:
+            raise Exception(f"Failed to import products from '{path}': {e}")
+
+        # A fully successful import needs no checkpoint
+        if not report["failed_chunks"] and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        return report
+
+    def _commit_with_retry(self, products: List[Product]) -> Optional[str]:
+        """
+        Commit one chunk, retrying with exponential backoff.
+
+        Returns:
+            Optional[str]: None on success, otherwise the last error message.
+        """
+        error = None
+        for attempt in range(self.max_attempts):
+            try:
+                self.repo.save_batch(products)
+                return None
+            except Exception as e:
+                error = str(e)
+                if attempt + 1 < self.max_attempts:
+                    time.sleep(2 ** attempt)
+        return error
+
+    def _chunks(self, path: str, report: dict) -> Iterator[Tuple[int, List[Product]]]:
+        """
+        Yield numbered chunks of valid products, recording invalid rows in the report.
+
+        Chunk numbering only depends on the file contents and the chunk size, which keeps
+        checkpoints valid across runs.
+        """
+        chunk: List[Product] = []
+        index = 0
+        for row_number, row in self._read_rows(path):
+            try:
+                chunk.append(self.parse_row(row))
+            except ValueError as e:
+                report["invalid"] += 1
+                report["invalid_rows"].append((row_number, str(e)))
+                continue
+            if len(chunk) == self.chunk_size:
+                yield index, chunk
+                chunk = []
+                index += 1
+        if chunk:
+            yield index, chunk
+
+    @classmethod
+    def parse_row(cls, row: Dict[str, object]) -> Product:
+        """
+        Validate one price-list row into a Product.
+
+        Args:
+            row (Dict[str, object]): Column name to cell value.
+
+        Returns:
+            Product: The validated product.
+
+        Raises:
+            ValueError: If a required column is empty or the price is not a non-negative number.
+        """
+        values = {k: str(v).strip() if v is not None else "" for k, v in row.items()}
+        missing = [column for column in cls.REQUIRED_COLUMNS if not values.get(column)]
+        if missing:
+            raise ValueError(f"Missing {', '.join(missing)}")
+
+        # The ID becomes the document ID; Firestore rejects these, failing the whole batch
+        product_id = values["product_id"]
+        if "/" in product_id or product_id in (".", "..") or (product_id.startswith("__") and product_id.endswith("__")):
+            raise ValueError(f"Invalid product_id '{product_id}'")
+        if len(product_id.encode("utf-8")) > cls.MAX_ID_BYTES:
+            raise ValueError(f"product_id longer than {cls.MAX_ID_BYTES} bytes")
+
+        # Price lists are in rupees; the catalog stores exact paise
+        try:
+            price = to_paise(values["price"])
+        except ValueError:
+            raise ValueError(f"Invalid price '{values['price']}'")
+        if price < 0:
+            raise ValueError(f"Negative price '{values['price']}'")
+
+        return Product(
+            product_id=product_id,
+            name=values["name"],
+            price=price,
+            category=values["category"].lower(),
+            barcode=values.get("barcode", ""),
+            hsn_code=values.get("hsn_code", "")
+        )
+
+    @staticmethod
+    def _read_rows(path: str) -> Iterator[Tuple[int, Dict[str, object]]]:
+        """
+        Stream rows from a CSV or XLSX file as (row number, column dict) pairs.
+
+        Raises:
+            ValueError: If the file type is not supported.
+            ImportError: If an XLSX file is given and openpyxl is not installed.
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                reader = csv.DictReader(f)
+                reader.fieldnames = [name.strip().lower() for name in reader.fieldnames or []]
+                for row_number, row in enumerate(reader, start=2):
+                    yield row_number, row
+        elif extension in (".xlsx", ".xlsm"):
+            try:
+                from openpyxl import load_workbook
+            except ImportError:
+                raise ImportError("openpyxl is required to import .xlsx price lists (pip install openpyxl)")
+
+            workbook = load_workbook(path, read_only=True, data_only=True)
+            try:
+                rows = workbook.active.iter_rows(values_only=True)
+                header = [str(cell or "").strip().lower() for cell in next(rows, ())]
+                for row_number, cells in enumerate(rows, start=2):
+                    if any(cell is not None for cell in cells):
+                        yield row_number, dict(zip(header, cells))
+            finally:
+                workbook.close()
+        else:
+            raise ValueError(f"Unsupported price list format '{extension}'")
+
+    def _checkpoint_path(self, path: str) -> str:
+        """Checkpoint file keyed by the file contents and chunk size."""
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return os.path.join(imports_cache_path(), f"{digest.hexdigest()}_{self.chunk_size}.json")
+
+    @staticmethod
+    def _load_checkpoint(checkpoint_path: str) -> set:
+        """Return the chunk indices already committed for this file."""
+        try:
+            with open(checkpoint_path, "r") as f:
+                return set(json.load(f).get("done", []))
+        except FileNotFoundError:
+            return set()
+        except Exception as e:
+            print(f"[ProductImportService] Ignoring unreadable checkpoint: {e}")
+            return set()
+
+    @staticmethod
+    def _save_checkpoint(checkpoint_path: str, done: set) -> None:
+        """Atomically record the committed chunk indices."""
+        tmp_path = f"{checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"done": sorted(done)}, f)
+        os.replace(tmp_path, checkpoint_path)
@@ -0,0 +1,177 @@
+import heapq
+import re
+import threading
+from typing import Dict, List, Set, Tuple
+
+from models.product_model import Product
+
+
+class ProductSearchIndex:
+    """
+    In-memory type-ahead index over product names.
+
+    Two structures are maintained per product:
+    - a prefix index mapping every prefix of every name token to product IDs
+    - a trigram index over the whole normalized name, used for substring and typo-tolerant matches
+
+    Products are added, replaced and removed one at a time, so catalog changes only
+    touch the affected entries instead of re-scanning the catalog.
+    """
+
+    _TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+    def __init__(self, max_prefix_length: int = 20):
+        """
+        Initialize an empty index.
+
+        Args:
+            max_prefix_length (int, optional): Longest token prefix that gets its own index entry.
+        """
+        self.max_prefix_length = max_prefix_length
+        self._lock = threading.RLock()
+        self._products: Dict[str, Product] = {}
+        self._names: Dict[str, str] = {}
+        self._keys: Dict[str, Tuple[Set[str], Set[str]]] = {}
+        self._prefixes: Dict[str, Set[str]] = {}
+        self._trigrams: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def apply_changes(self, upserted: List[Product], removed: List[str]) -> None:
+        """
+        Apply a batch of catalog changes.
+
+        Args:
+            upserted (List[Product]): Products that were added or replaced.
+            removed (List[str]): IDs of products that were deleted.
+        """
+        with self._lock:
+            for product_id in removed:
+                self.remove(product_id)
+            for product in upserted:
+                self.add(product)
+
+    def add(self, product: Product) -> None:
+        """
+        Index a product, replacing any previous entry with the same ID.
+
+        Args:
+            product (Product): The product to index.
+        """
+        with self._lock:
+            previous = self._products.get(product.product_id)
+            self._products[product.product_id] = product
+            if previous is not None:
+                if previous.name == product.name:
+                    return
+                self._unindex(product.product_id)
+
+            self._names[product.product_id] = self._normalize(product.name)
+            prefixes, trigrams = self._index_keys(product.name)
+            self._keys[product.product_id] = (prefixes, trigrams)
+            for key in prefixes:
+                self._prefixes.setdefault(key, set()).add(product.product_id)
+            for key in trigrams:
+                self._trigrams.setdefault(key, set()).add(product.product_id)
+
+    def remove(self, product_id: str) -> None:
+        """
+        Remove a product from the index.
+
+        Args:
+            product_id (str): ID of the product to remove.
+        """
+        with self._lock:
+            if self._products.pop(product_id, None) is not None:
+                self._unindex(product_id)
+
+    def search(self, query: str, limit: int = 20) -> List[Product]:
+        """
+        Find products whose names match a query, best matches first.
+
+        Ranking, from strongest to weakest: exact name, name starts with the query,
+        every query token prefixes a name token, then trigram similarity.
+
+        Args:
+            query (str): Text typed by the user.
+            limit (int, optional): Maximum number of results.
+
+        Returns:
+            List[Product]: Matching products ordered by match quality.
+        """
+        normalized = self._normalize(query)
+        tokens = self._TOKEN_RE.findall(normalized)
+        if not tokens:
+            return []
+
+        with self._lock:
+            candidates = None
+            for token in tokens:
+                ids = self._prefixes.get(token[:self.max_prefix_length], set())
+                candidates = set(ids) if candidates is None else candidates & ids
+
+            scores: Dict[str, float] = {}
+            for product_id in candidates or ():
+                name = self._names[product_id]
+                if name == normalized:
+                    scores[product_id] = 3.0
+                elif name.startswith(normalized):
+                    scores[product_id] = 2.0
+                else:
+                    scores[product_id] = 1.0
+
+            # Fall back to trigram similarity for substrings and typos
+            if len(scores) < limit:
+                query_trigrams = self._trigrams_of(normalized)
+                overlap: Dict[str, int] = {}
+                for key in query_trigrams:
+                    for product_id in self._trigrams.get(key, ()):
+                        if product_id not in scores:
+                            overlap[product_id] = overlap.get(product_id, 0) + 1
+                for product_id, shared in overlap.items():
+                    union = len(query_trigrams) + len(self._keys[product_id][1]) - shared
+                    similarity = shared / union if union else 0.0
+                    if similarity >= 0.2:
+                        scores[product_id] = similarity
+
+            ranked = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], self._names[item[0]]))
+            return [self._products[product_id] for product_id, _ in ranked]
+
+    def _unindex(self, product_id: str) -> None:
+        """Drop the index entries recorded for a product."""
+        self._names.pop(product_id, None)
+        prefixes, trigrams = self._keys.pop(product_id, (set(), set()))
+        for key in prefixes:
+            self._discard(self._prefixes, key, product_id)
+        for key in trigrams:
+            self._discard(self._trigrams, key, product_id)
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[str]], key: str, product_id: str) -> None:
+        """Remove a product ID from an index bucket, deleting the bucket once empty."""
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.discard(product_id)
+            if not bucket:
+                del index[key]
+
+    def _index_keys(self, name: str) -> Tuple[Set[str], Set[str]]:
+        """Compute the prefix and trigram keys for a product name."""
+        normalized = self._normalize(name)
+        prefixes = set()
+        for token in self._TOKEN_RE.findall(normalized):
+            for end in range(1, min(len(token), self.max_prefix_length) + 1):
+                prefixes.add(token[:end])
+        return prefixes, self._trigrams_of(normalized)
+
+    @classmethod
+    def _trigrams_of(cls, normalized: str) -> Set[str]:
+        """Return the trigrams of a normalized string, padded so short words still match."""
+        padded = f"  {' '.join(cls._TOKEN_RE.findall(normalized))} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Lowercase and trim text for matching."""
+        return (text or "").strip().lower()
@@ -1,8 +1,14 @@
-from typing import List, Optional
+import threading
+from typing import Dict, List, Optional, Tuple
 
 from auth.firebase_config import FirebaseConfig
 from models.product_model import Product
 from repositories.product_repository import ProductRepository
+from repositories.tax_repository import TaxRepository
+from services.catalog_snapshot import CatalogSnapshot
+from services.product_catalog import ProductCatalog
+from services.product_search import ProductSearchIndex
+from services.tax_service import TaxService
 
 
 class ProductService:
@@ -12,28 +18,83 @@ class ProductService:
 
     def __init__(self):
         """
-        Initializes Firestore database and sets up the Product repository.
+        Initializes Firestore database, the Product repository, the in-memory catalog,
+        and the name search index and per-product tax rates that follow it.
         """
         firebase_config = FirebaseConfig()
         self.db = firebase_config.db
         self.repo = ProductRepository(self.db)
+        self.catalog = ProductCatalog(self.repo, snapshot=CatalogSnapshot())
+        self.search_index = ProductSearchIndex()
+        self.tax_service = TaxService(TaxRepository(self.db))
+        self._tax_lock = threading.Lock()
+        self._tax_rates: Dict[str, int] = {}
+        self.catalog.add_listener(self.search_index.apply_changes)
+        self.catalog.add_listener(self._update_tax_rates)
+
+    @property
+    def catalog_version(self) -> int:
+        """
+        Counter that changes whenever the cached catalog or the tax rate table changes.
+
+        Returns:
+            int: Current catalog version.
+        """
+        return self.catalog.version + self.tax_service.version
+
+    def warm_start(self) -> bool:
+        """
+        Load the catalog from the local snapshot and reconcile it with Firestore in the background.
+        Without a snapshot, the catalog is loaded on first use instead.
+
+        Returns:
+            bool: True if products were available from disk immediately, False otherwise.
+        """
+        try:
+            # Rates come first so products loaded from disk are priced with the cached table
+            self.tax_service.load_cached()
+            threading.Thread(target=self.refresh_tax_rates, name="tax-refresh", daemon=True).start()
+
+            if not self.catalog.load_cached():
+                return False
+            self.catalog.refresh_async()
+            return True
+        except Exception as e:
+            print(f"[warm_start] Error warm-starting catalog: {e}")
+            return False
 
     def get_all_products(self) -> List[Product]:
         """
-        Retrieve all products from the database.
+        Retrieve all products from the cached catalog.
 
         Returns:
             List[Product]: List of all Product objects.
         """
         try:
-            return [self.repo.get_by_id(doc.id) for doc in self.repo.collection.stream()]
+            return self.catalog.get_all_products()
         except Exception as e:
             print(f"[get_all_products] Error retrieving products: {e}")
             return []
 
+    def get_products_by_ids(self, product_ids: List[str]) -> List[Product]:
+        """
+        Retrieve several products by ID from the cached catalog.
+
+        Args:
+            product_ids (List[str]): Unique product IDs.
+
+        Returns:
+            List[Product]: Product objects for the IDs that exist.
+        """
+        try:
+            return self.catalog.get_products_by_ids(product_ids)
+        except Exception as e:
+            print(f"[get_products_by_ids] Error retrieving products: {e}")
+            return []
+
     def get_products_by_category(self, category: str) -> List[Product]:
         """
-        Retrieve products by category.
+        Retrieve products by category from the cached catalog.
 
         Args:
             category (str): Category name to filter products.
@@ -42,15 +103,62 @@ class ProductService:
             List[Product]: List of Product objects in the given category.
         """
         try:
-            query = self.repo.collection.where("category", "==", category).stream()
-            return [Product.from_dict(doc.to_dict()) for doc in query]
+            return self.catalog.get_products_by_category(category)
         except Exception as e:
             print(f"[get_products_by_category] Error fetching products in category '{category}': {e}")
             return []
 
+    def get_products_grouped_by_category(self) -> Dict[str, List[Product]]:
+        """
+        Retrieve every product grouped by category in a single pass over the catalog.
+
+        Returns:
+            Dict[str, List[Product]]: Mapping of category name to its products.
+        """
+        try:
+            return self.catalog.get_products_grouped()
+        except Exception as e:
+            print(f"[get_products_grouped_by_category] Error grouping products: {e}")
+            return {}
+
+    def get_product_by_barcode(self, barcode: str) -> Optional[Product]:
+        """
+        Retrieve a product by its barcode/SKU from the cached catalog's hash index.
+
+        Args:
+            barcode (str): Scanned or typed code.
+
+        Returns:
+            Optional[Product]: Product object if the code is known, else None.
+        """
+        try:
+            return self.catalog.get_product_by_barcode(barcode)
+        except Exception as e:
+            print(f"[get_product_by_barcode] Error looking up barcode '{barcode}': {e}")
+            return None
+
+    def search_products(self, query: str, limit: int = 20) -> List[Product]:
+        """
+        Find products by name for type-ahead search, best matches first.
+
+        Args:
+            query (str): Text typed by the user.
+            limit (int, optional): Maximum number of results.
+
+        Returns:
+            List[Product]: Matching products ordered by match quality.
+        """
+        try:
+            # The index follows the catalog, so make sure the catalog has been loaded
+            self.catalog.ensure_loaded()
+            return self.search_index.search(query, limit)
+        except Exception as e:
+            print(f"[search_products] Error searching products for '{query}': {e}")
+            return []
+
     def get_product_by_id(self, product_id: str) -> Optional[Product]:
         """
-        Retrieve a product by its ID.
+        Retrieve a product by its ID from the cached catalog.
 
         Args:
             product_id (str): Unique product ID.
@@ -59,11 +167,66 @@ class ProductService:
             Optional[Product]: Product object if found, else None.
         """
         try:
-            return self.repo.get_by_id(product_id)
+            return self.catalog.get_product_by_id(product_id)
         except Exception as e:
             print(f"[get_product_by_id] Error retrieving product '{product_id}': {e}")
             return None
 
+    def get_tax_rate(self, product: Product) -> int:
+        """
+        Return a product's effective tax rate, precomputed when the catalog loaded.
+
+        Args:
+            product (Product): The product.
+
+        Returns:
+            int: Tax rate in basis points.
+        """
+        rate = self._tax_rates.get(product.product_id)
+        return rate if rate is not None else self.tax_service.rate_for(product)
+
+    def get_tax_labels(self) -> Dict[str, Tuple[str, int]]:
+        """
+        Return the printed tax name and current rate per category, e.g. {"medical": ("Medical Tax", 500)}.
+
+        Returns:
+            Dict[str, Tuple[str, int]]: Category name to (tax name, rate in basis points).
+        """
+        return self.tax_service.labels()
+
+    def refresh_tax_rates(self) -> bool:
+        """
+        Reload the tax rate table from Firestore and re-resolve every cached product's rate.
+        Only products already in the catalog are resolved; it is not reloaded from here.
+
+        Returns:
+            bool: True if the table was reloaded, False otherwise.
+        """
+        try:
+            if not self.tax_service.refresh():
+                return False
+            products = self.catalog.cached_products()
+            with self._tax_lock:
+                self._tax_rates = {p.product_id: self.tax_service.rate_for(p) for p in products}
+            return True
+        except Exception as e:
+            print(f"[refresh_tax_rates] Error refreshing tax rates: {e}")
+            return False
+
+    def _update_tax_rates(self, upserted: List[Product], removed: List[str]) -> None:
+        """Catalog listener: resolve tax rates for changed products only."""
+        with self._tax_lock:
+            for product_id in removed:
+                self._tax_rates.pop(product_id, None)
+            for product in upserted:
+                self._tax_rates[product.product_id] = self.tax_service.rate_for(product)
+
+    def close(self) -> None:
+        """
+        Release the catalog's live Firestore listener.
+        """
+        self.catalog.close()
+
     # Optional: Add this method back if you'd like to preload some default data.
     # def initialize_default_products(self) -> None:
     #     """
@@ -72,24 +235,24 @@ class ProductService:
     #     try:
     #         if not list(self.repo.collection.limit(1).stream()):
     #             default_products = [
-    #                 Product("med_1", "Sanitizer", 20, "medical"),
-    #                 Product("med_2", "Mask", 10, "medical"),
-    #                 Product("med_3", "Hand Gloves", 70, "medical"),
-    #                 Product("med_4", "Syrup", 30, "medical"),
-    #                 Product("med_5", "Cream", 20, "medical"),
-    #                 Product("med_6", "Thermal Gun", 20, "medical"),
-    #                 Product("gro_1", "Rice", 35, "grocery"),
-    #                 Product("gro_2", "Food Oil", 120, "grocery"),
-    #                 Product("gro_3", "Wheat", 26, "grocery"),
-    #                 Product("gro_4", "Spices", 10, "grocery"),
-    #                 Product("gro_5", "Flour", 30, "grocery"),
-    #                 Product("gro_6", "Maggi", 25, "grocery"),
-    #                 Product("drk_1", "Sprite", 95, "drinks"),
-    #                 Product("drk_2", "Mineral Water", 20, "drinks"),
-    #                 Product("drk_3", "Juice", 10, "drinks"),
-    #                 Product("drk_4", "Coke", 20, "drinks"),
-    #                 Product("drk_5", "Lassi", 30, "drinks"),
-    #                 Product("drk_6", "Mountain Duo", 100, "drinks")
+    #                 Product("med_1", "Sanitizer", 2000, "medical"),
+    #                 Product("med_2", "Mask", 1000, "medical"),
+    #                 Product("med_3", "Hand Gloves", 7000, "medical"),
+    #                 Product("med_4", "Syrup", 3000, "medical"),
+    #                 Product("med_5", "Cream", 2000, "medical"),
+    #                 Product("med_6", "Thermal Gun", 2000, "medical"),
+    #                 Product("gro_1", "Rice", 3500, "grocery"),
+    #                 Product("gro_2", "Food Oil", 12000, "grocery"),
+    #                 Product("gro_3", "Wheat", 2600, "grocery"),
+    #                 Product("gro_4", "Spices", 1000, "grocery"),
+    #                 Product("gro_5", "Flour", 3000, "grocery"),
+    #                 Product("gro_6", "Maggi", 2500, "grocery"),
+    #                 Product("drk_1", "Sprite", 9500, "drinks"),
+    #                 Product("drk_2", "Mineral Water", 2000, "drinks"),
+    #                 Product("drk_3", "Juice", 1000, "drinks"),
+    #                 Product("drk_4", "Coke", 2000, "drinks"),
+    #                 Product("drk_5", "Lassi", 3000, "drinks"),
+    #                 Product("drk_6", "Mountain Duo", 10000, "drinks")
     #             ]
     #             for product in default_products:
     #                 self.repo.save(product)
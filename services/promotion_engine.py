@@ -0,0 +1,160 @@
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from models.money import round_basis_points
+from models.promotion_model import Promotion
+
+
+class PromotionEngine:
+    """
+    Applies compiled promotions to cart lines incrementally.
+
+    Live promotions are indexed by product ID and by category once, when the engine is
+    built. When one cart line changes, only the rules indexed under that line's product
+    or category are re-evaluated; a bundle also updates the other lines it spans. The
+    discount each rule grants to each line is kept, so a line's total discount is a sum
+    over its own few entries.
+
+    Lines are read from a mapping of product ID to an object with `quantity`, `price`,
+    `total` and `category` attributes (e.g. services.cart.CartLine). Amounts are paise.
+    """
+
+    def __init__(self, promotions: Iterable[Promotion], now: Optional[datetime] = None):
+        """
+        Compile the promotions that are live at `now`.
+
+        Args:
+            promotions (Iterable[Promotion]): Candidate promotions.
+            now (Optional[datetime]): Time used to check validity windows. Defaults to the current time.
+        """
+        self.promotions: Dict[str, Promotion] = {}
+        self._by_product: Dict[str, List[Promotion]] = {}
+        self._by_category: Dict[str, List[Promotion]] = {}
+        # Earliest start or end of a validity window after `now`, when the compiled set goes stale
+        self.next_change: Optional[datetime] = None
+        now = now.astimezone() if now is not None else datetime.now(timezone.utc)
+        for promotion in promotions:
+            if promotion.active:
+                for boundary in (promotion.starts_at, promotion.ends_at):
+                    if boundary is not None and boundary.astimezone() > now and (
+                            self.next_change is None or boundary.astimezone() < self.next_change):
+                        self.next_change = boundary.astimezone()
+            if not promotion.is_live(now):
+                continue
+            if not self._is_valid(promotion):
+                print(f"[PromotionEngine] Skipping invalid promotion '{promotion.promotion_id}'")
+                continue
+            self.promotions[promotion.promotion_id] = promotion
+            for product_id in promotion.product_ids:
+                self._by_product.setdefault(product_id, []).append(promotion)
+            if promotion.kind != Promotion.BUNDLE:
+                for category in promotion.categories:
+                    self._by_category.setdefault(category, []).append(promotion)
+
+        self._lock = threading.RLock()
+        # product_id -> {promotion_id: discount granted to that line}
+        self._applied: Dict[str, Dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.promotions)
+
+    def line_changed(self, product_id: str, lines: Mapping[str, object]) -> Dict[str, Tuple[int, Tuple[str, ...]]]:
+        """
+        Re-evaluate the rules that touch one changed line.
+
+        Args:
+            product_id (str): ID of the line that was added, changed or removed.
+            lines (Mapping[str, object]): Current cart lines by product ID.
+
+        Returns:
+            Dict[str, Tuple[int, Tuple[str, ...]]]: For every line the evaluation touched, its total
+            discount and the IDs of the promotions that contributed to it.
+        """
+        with self._lock:
+            line = lines.get(product_id)
+            rules = list(self._by_product.get(product_id, ()))
+            touched: Set[str] = {product_id}
+            if line is None:
+                self._applied.pop(product_id, None)
+            else:
+                rules += [r for r in self._by_category.get(line.category, ()) if r not in rules]
+
+            for rule in rules:
+                for target_id, amount in self._evaluate(rule, product_id, lines).items():
+                    applied = self._applied.setdefault(target_id, {})
+                    if amount > 0:
+                        applied[rule.promotion_id] = amount
+                    else:
+                        applied.pop(rule.promotion_id, None)
+                    touched.add(target_id)
+
+            return {target_id: self.discount_for(target_id, lines) for target_id in touched}
+
+    def discount_for(self, product_id: str, lines: Mapping[str, object]) -> Tuple[int, Tuple[str, ...]]:
+        """
+        Return a line's current discount, capped at the line total.
+
+        Args:
+            product_id (str): Line to look up.
+            lines (Mapping[str, object]): Current cart lines by product ID.
+
+        Returns:
+            Tuple[int, Tuple[str, ...]]: Discount in paise and the contributing promotion IDs.
+        """
+        line = lines.get(product_id)
+        applied = self._applied.get(product_id)
+        if line is None or not applied:
+            return 0, ()
+        return min(sum(applied.values()), line.total), tuple(applied)
+
+    def reset(self) -> None:
+        """Forget every applied discount, e.g. when the cart is cleared."""
+        with self._lock:
+            self._applied.clear()
+
+    def _evaluate(self, rule: Promotion, product_id: str, lines: Mapping[str, object]) -> Dict[str, int]:
+        """Discount granted by one rule to each line it covers."""
+        if rule.kind == Promotion.BUNDLE:
+            return self._evaluate_bundle(rule, lines)
+
+        line = lines.get(product_id)
+        if line is None:
+            return {product_id: 0}
+        if rule.kind == Promotion.BUY_X_GET_Y:
+            free = line.quantity // (rule.buy_quantity + rule.get_quantity) * rule.get_quantity
+            return {product_id: free * line.price}
+
+        discount_bp = 0
+        for min_quantity, tier_bp in rule.tiers:
+            if line.quantity < min_quantity:
+                break
+            discount_bp = tier_bp
+        return {product_id: round_basis_points(line.total * discount_bp)}
+
+    @staticmethod
+    def _evaluate_bundle(rule: Promotion, lines: Mapping[str, object]) -> Dict[str, int]:
+        """Split a bundle's saving across its member lines in proportion to their prices."""
+        members = [lines.get(product_id) for product_id in rule.product_ids]
+        count = min((line.quantity if line is not None else 0) for line in members)
+        full_price = sum(line.price for line in members if line is not None)
+        saving = count * (full_price - rule.bundle_price)
+        if count == 0 or saving <= 0:
+            return {product_id: 0 for product_id in rule.product_ids}
+
+        shares = {}
+        remaining = saving
+        for product_id, line in zip(rule.product_ids[:-1], members[:-1]):
+            shares[product_id] = saving * line.price // full_price
+            remaining -= shares[product_id]
+        shares[rule.product_ids[-1]] = remaining
+        return shares
+
+    @staticmethod
+    def _is_valid(promotion: Promotion) -> bool:
+        """Reject rules that cannot be evaluated, so evaluation needs no checks."""
+        if promotion.kind == Promotion.BUNDLE:
+            return len(set(promotion.product_ids)) == len(promotion.product_ids) >= 2
+        if promotion.kind == Promotion.BUY_X_GET_Y:
+            return promotion.buy_quantity > 0 and promotion.get_quantity > 0
+        return bool(promotion.tiers)
@@ -0,0 +1,133 @@
+import json
+import os
+import threading
+from typing import Dict, List, Tuple
+
+from config import catalog_cache_path
+from models.product_model import Product
+from models.tax_model import TaxRate
+from repositories.tax_repository import TaxRepository
+
+
+class TaxService:
+    """
+    Tax rate table loaded from the Firestore `tax_rates` collection and cached on disk.
+
+    Rates are kept in two dictionaries, by HSN code and by category, so resolving a
+    product's rate is at most two lookups. Until a table has been loaded, the
+    built-in DEFAULT_RATES apply.
+    """
+
+    DEFAULT_RATES = (
+        TaxRate("category:medical", TaxRate.CATEGORY, "medical", 500, "Medical Tax"),
+        TaxRate("category:grocery", TaxRate.CATEGORY, "grocery", 100, "Grocery Tax"),
+        TaxRate("category:drinks", TaxRate.CATEGORY, "drinks", 1000, "Drinks Tax"),
+    )
+
+    def __init__(self, repo: TaxRepository, filename: str = "tax_rates.json"):
+        """
+        Initialize the table with the default rates.
+
+        Args:
+            repo (TaxRepository): Repository for the Firestore rate table.
+            filename (str, optional): Cache file name inside the catalog cache directory.
+        """
+        self.repo = repo
+        self.path = os.path.join(catalog_cache_path(), filename)
+        self._lock = threading.RLock()
+        self._by_category: Dict[str, TaxRate] = {}
+        self._by_hsn: Dict[str, TaxRate] = {}
+        self.version = 0
+        self._apply(list(self.DEFAULT_RATES))
+
+    def load_cached(self) -> bool:
+        """
+        Load the rate table saved by the last successful refresh.
+
+        Returns:
+            bool: True if a cached table was loaded, False otherwise.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                rates = [TaxRate.from_dict(row) for row in json.load(f)]
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"[TaxService] Ignoring unreadable tax rate cache: {e}")
+            return False
+        if not rates:
+            return False
+        self._apply(rates)
+        return True
+
+    def refresh(self) -> bool:
+        """
+        Reload the rate table from Firestore and cache it on disk.
+        An empty remote table leaves the current rates in place.
+
+        Returns:
+            bool: True if rates were loaded from Firestore, False otherwise.
+        """
+        try:
+            rates = self.repo.list_all()
+        except Exception as e:
+            print(f"[TaxService] Error refreshing tax rates: {e}")
+            return False
+        if not rates:
+            return False
+
+        self._apply(rates)
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump([rate.to_dict() for rate in rates], f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"[TaxService] Error caching tax rates: {e}")
+        return True
+
+    def rate_for(self, product: Product) -> int:
+        """
+        Resolve a product's effective tax rate: its HSN rate if one exists, else its category rate.
+
+        Args:
+            product (Product): The product.
+
+        Returns:
+            int: Tax rate in basis points, 0 if no rate applies.
+        """
+        rate = None
+        if product.hsn_code:
+            rate = self._by_hsn.get(product.hsn_code.lower())
+        if rate is None:
+            rate = self._by_category.get(product.category)
+        return rate.rate_bp if rate is not None else 0
+
+    def category_rates(self) -> Dict[str, int]:
+        """
+        Return the tax rate of every category.
+
+        Returns:
+            Dict[str, int]: Category name to rate in basis points.
+        """
+        with self._lock:
+            return {key: rate.rate_bp for key, rate in self._by_category.items()}
+
+    def labels(self) -> Dict[str, Tuple[str, int]]:
+        """
+        Return the printed tax name and rate of every category, e.g. {"medical": ("Medical Tax", 500)}.
+
+        Returns:
+            Dict[str, Tuple[str, int]]: Category name to (tax name, rate in basis points).
+        """
+        with self._lock:
+            return {key: (rate.label or f"{key.title()} Tax", rate.rate_bp) for key, rate in self._by_category.items()}
+
+    def _apply(self, rates: List[TaxRate]) -> None:
+        """Swap in a new rate table and bump the version."""
+        by_category = {r.key: r for r in rates if r.kind == TaxRate.CATEGORY}
+        by_hsn = {r.key: r for r in rates if r.kind == TaxRate.HSN}
+        with self._lock:
+            self._by_category = by_category
+            self._by_hsn = by_hsn
+            self.version += 1
@@ -10,15 +10,18 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 
 from config import bills_path
+from models.money import format_rupees, format_tax_label
 
 
 class BillPreviewWindow:
     """A top-level window to display and save bill as PDF"""
 
-    def __init__(self, parent, bill_data, user_data):
+    def __init__(self, parent, bill_data, user_data, tax_labels=None):
         self.parent = parent
         self.bill_data = bill_data
         self.user_data = user_data
+        # Category -> (tax name, current rate in bp), e.g. {"medical": ("Medical Tax", 500)}; item rates win
+        self.tax_labels = tax_labels or {}
 
         self.window = ctk.CTkToplevel(parent)
         self.window.title(f"Bill Preview - {bill_data.bill_no}")
@@ -44,6 +47,9 @@ class BillPreviewWindow:
 
         ctk.CTkLabel(info_frame, text=f"Bill Number: {self.bill_data.bill_no}", font=ctk.CTkFont(size=14)).pack(
             anchor="w", padx=10, pady=2)
+        if self.bill_data.invoice_no is not None:
+            ctk.CTkLabel(info_frame, text=f"Invoice Number: {self.bill_data.invoice_no}",
+                         font=ctk.CTkFont(size=14)).pack(anchor="w", padx=10, pady=2)
         ctk.CTkLabel(info_frame, text=f"Customer: {self.bill_data.customer_name}", font=ctk.CTkFont(size=14)).pack(
             anchor="w", padx=10, pady=2)
         ctk.CTkLabel(info_frame, text=f"Phone: {self.bill_data.customer_phone}", font=ctk.CTkFont(size=14)).pack(
@@ -97,6 +103,8 @@ class BillPreviewWindow:
                  self.bill_data.timestamp)],
             ["Customer:", self.bill_data.customer_name, "Phone:", self.bill_data.customer_phone]
         ]
+        if self.bill_data.invoice_no is not None:
+            header_data.insert(0, ["Invoice No:", str(self.bill_data.invoice_no), "", ""])
 
         header_table = Table(header_data, colWidths=[1.2 * inch, 1.8 * inch, 1.2 * inch, 1.8 * inch])
         header_table.setStyle(TableStyle([
@@ -113,9 +121,9 @@ class BillPreviewWindow:
             products_data.append([
                 i,
                 item.product_name,
-                f"₹{item.price:.2f}",
+                format_rupees(item.price),
                 item.quantity,
-                f"₹{item.total:.2f}"
+                format_rupees(item.total)
             ])
 
         products_table = Table(products_data, colWidths=[0.5 * inch, 3.0 * inch, 1.0 * inch, 0.5 * inch, 1.0 * inch])
@@ -130,21 +138,24 @@ class BillPreviewWindow:
         story.append(Spacer(1, 0.25 * inch))
 
         summary_data = []
+        discount = sum(item.discount for item in self.bill_data.items)
+        if discount > 0:
+            summary_data.append(["Promotional Discounts:", format_rupees(-discount)])
         if self.bill_data.medical_total > 0:
-            summary_data.append(["Medical Items Total:", f"₹{self.bill_data.medical_total:.2f}"])
+            summary_data.append(["Medical Items Total:", format_rupees(self.bill_data.medical_total)])
         if self.bill_data.grocery_total > 0:
-            summary_data.append(["Grocery Items Total:", f"₹{self.bill_data.grocery_total:.2f}"])
+            summary_data.append(["Grocery Items Total:", format_rupees(self.bill_data.grocery_total)])
         if self.bill_data.drinks_total > 0:
-            summary_data.append(["Cold Drinks Total:", f"₹{self.bill_data.drinks_total:.2f}"])
+            summary_data.append(["Cold Drinks Total:", format_rupees(self.bill_data.drinks_total)])
         if self.bill_data.medical_tax > 0:
-            summary_data.append(["Medical Tax (5%):", f"₹{self.bill_data.medical_tax:.2f}"])
+            summary_data.append([f"{self.tax_label('medical', 'Medical Tax')}:", format_rupees(self.bill_data.medical_tax)])
         if self.bill_data.grocery_tax > 0:
-            summary_data.append(["Grocery Tax (1%):", f"₹{self.bill_data.grocery_tax:.2f}"])
+            summary_data.append([f"{self.tax_label('grocery', 'Grocery Tax')}:", format_rupees(self.bill_data.grocery_tax)])
         if self.bill_data.drinks_tax > 0:
-            summary_data.append(["Drinks Tax (10%):", f"₹{self.bill_data.drinks_tax:.2f}"])
+            summary_data.append([f"{self.tax_label('drinks', 'Drinks Tax')}:", format_rupees(self.bill_data.drinks_tax)])
 
         summary_data.append([" ", " "])
-        summary_data.append(["Total Bill Amount:", f"₹{self.bill_data.total_amount:.2f}"])
+        summary_data.append(["Total Bill Amount:", format_rupees(self.bill_data.total_amount)])
 
         summary_table = Table(summary_data, colWidths=[4.0 * inch, 2.0 * inch])
         summary_table.setStyle(TableStyle([
@@ -160,6 +171,22 @@ class BillPreviewWindow:
         doc.build(story)
         return output_path
 
+    def tax_label(self, category, default):
+        """
+        Label a category's tax line with the rates charged on this bill's items.
+
+        Items record the rate they were taxed at, so a reprint shows the rates of the
+        day the bill was made, and every rate when HSN overrides mix several in one
+        category. Items saved before rates were recorded fall back to the current table.
+        """
+        name, current_rate = self.tax_labels.get(category, (default, None))
+
+        items = [item for item in self.bill_data.items if item.category == category]
+        rates = {item.tax_rate for item in items if item.tax_rate is not None}
+        if current_rate is not None and (not rates or any(item.tax_rate is None for item in items)):
+            rates.add(current_rate)
+        return format_tax_label(name, sorted(rates))
+
     def save_pdf(self):
         try:
             bills_dir = bills_path()
@@ -0,0 +1,54 @@
+"""
+Bulk import a CSV/XLSX price list into the products collection.
+
+Usage:
+    python -m tools.import_products price_list.csv [--chunk-size 500] [--workers 4] [--no-resume]
+"""
+
+import argparse
+import sys
+
+from services.product_import_service import ProductImportService
+
+
+def print_progress(report: dict):
+    """Print a one-line running summary of the import"""
+    print(
+        f"\rImported: {report['imported']}  Skipped: {report['skipped']}  "
+        f"Invalid: {report['invalid']}  Failed chunks: {len(report['failed_chunks'])}",
+        end="",
+        flush=True
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk import a CSV/XLSX price list into Firestore')
+    parser.add_argument('path', help='Price list with product_id, name, price, category[, barcode, hsn_code] columns')
+    parser.add_argument('--chunk-size', type=int, default=500, help='Documents per batch commit (max 500)')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent batch commits')
+    parser.add_argument('--no-resume', action='store_true', help='Ignore the checkpoint of a previous run')
+    args = parser.parse_args()
+
+    service = ProductImportService(chunk_size=args.chunk_size, workers=args.workers)
+    try:
+        report = service.import_file(args.path, progress=print_progress, resume=not args.no_resume)
+    except Exception as e:
+        print(f"Import failed: {e}")
+        return 1
+
+    print()
+    for row_number, reason in report["invalid_rows"]:
+        print(f"Row {row_number}: {reason}")
+    for index, error in report["failed_chunks"]:
+        print(f"Chunk {index} failed: {error}")
+
+    if report["failed_chunks"]:
+        print("Some chunks failed. Run the same command again to resume.")
+        return 1
+
+    print("Import completed successfully!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+List, and optionally release, invoice number leases that terminals never returned.
+
+A released lease puts the numbers after the highest invoice number synced from it back
+in the shop's free list. Release leases only for terminals that are retired or have
+synced all their bills.
+
+Usage:
+    python -m tools.invoice_leases SHOP_UID [--grace-hours 24] [--release] [--terminal TERMINAL_ID]
+"""
+
+import argparse
+import sys
+from datetime import timedelta
+
+from services.invoice_lease_service import InvoiceLeaseService
+
+
+def main():
+    parser = argparse.ArgumentParser(description='List or release expired invoice number leases')
+    parser.add_argument('shop_uid', help='UID of the shop whose invoice counter is inspected')
+    parser.add_argument('--grace-hours', type=float, default=24, help='Hours a lease must have been expired for')
+    parser.add_argument('--release', action='store_true', help='Return the unused numbers of the listed leases')
+    parser.add_argument('--terminal', help='Only leases held by this terminal ID')
+    args = parser.parse_args()
+
+    service = InvoiceLeaseService(args.shop_uid)
+    try:
+        leases = service.expired_leases(timedelta(hours=args.grace_hours))
+    except Exception as e:
+        print(f"Could not read leases: {e}")
+        return 1
+    if args.terminal:
+        leases = [lease for lease in leases if lease.terminal_id == args.terminal]
+    if not leases:
+        print("No expired leases.")
+        return 0
+
+    failed = False
+    for lease in leases:
+        line = (f"Terminal {lease.terminal_id}: numbers {lease.start}-{lease.end - 1}, "
+                f"expired {lease.expires_at:%Y-%m-%d %H:%M}")
+        if args.release:
+            try:
+                line += f", released {service.release(lease)}"
+            except Exception as e:
+                line += f", release failed: {e}"
+                failed = True
+        print(line)
+
+    if not args.release:
+        print("Run again with --release to return their unused numbers.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Move a shop's bills from the old global bills collection into shops/{uid}/bills.
+
+Bills that name no shop are left in place and make the run exit with an error; pass
+--claim-ownerless only when every such bill is known to belong to SHOP_UID.
+
+Usage:
+    python -m tools.migrate_bills SHOP_UID [--page-size 500] [--delete-source] [--dry-run] [--no-resume]
+                                  [--claim-ownerless]
+"""
+
+import argparse
+import sys
+
+from services.bill_migration_service import BillMigrationService
+
+
+def print_progress(report: dict):
+    """Print a one-line running summary of the migration"""
+    print(
+        f"\rCopied: {report['copied']}  Deleted: {report['deleted']}  Other shops: {report['other_shop']}  "
+        f"No owner: {report['ownerless']}  Invalid: {report['invalid']}  Failed: {len(report['failed'])}",
+        end="",
+        flush=True
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Move bills into per-shop Firestore collections')
+    parser.add_argument('shop_uid', help='UID of the shop that owns the bills in the global collection')
+    parser.add_argument('--page-size', type=int, default=500, help='Documents read and written per page (max 500)')
+    parser.add_argument('--delete-source', action='store_true', help='Delete each global document once copied')
+    parser.add_argument('--dry-run', action='store_true', help='Only read and validate the global collection')
+    parser.add_argument('--no-resume', action='store_true', help='Ignore the checkpoint of a previous run')
+    parser.add_argument('--claim-ownerless', action='store_true',
+                        help='Assign bills that name no shop to SHOP_UID (only if they all belong to it)')
+    args = parser.parse_args()
+
+    service = BillMigrationService(args.shop_uid, page_size=args.page_size, claim_ownerless=args.claim_ownerless)
+    try:
+        report = service.migrate(delete_source=args.delete_source, dry_run=args.dry_run,
+                                 progress=print_progress, resume=not args.no_resume)
+    except Exception as e:
+        print(f"Migration failed: {e}")
+        return 1
+
+    print()
+    for bill_no, reason in report["invalid_docs"]:
+        print(f"Bill {bill_no}: {reason}")
+    for bill_no, error in report["failed"]:
+        print(f"Bill {bill_no} failed: {error}")
+
+    if report["failed"]:
+        print("Some bills failed. Run the same command again to retry them.")
+        return 1
+    if report["ownerless"]:
+        print(f"{report['ownerless']} bills name no shop and were left in the global collection. "
+              "If they all belong to this shop, run again with --claim-ownerless.")
+        return 1
+
+    print("Dry run completed." if args.dry_run else "Migration completed successfully!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
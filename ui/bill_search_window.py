@@ -0,0 +1,220 @@
+from datetime import datetime, timedelta
+from tkinter import messagebox as mb
+
+import customtkinter as ctk
+
+from models.bill_model import BillHeader
+from models.money import format_rupees
+from templates.bill_template import BillPreviewWindow
+
+
+class BillSearchWindow:
+    """
+    A top-level window to find past bills.
+
+    Typing looks bills up instantly in the local search index by any part of the
+    number, name or phone; Search queries Firestore one page at a time.
+    """
+
+    # Label shown in the field selector -> bill field searched
+    SEARCH_FIELDS = {
+        "Customer Name": "customer_name",
+        "Phone Number": "customer_phone",
+        "Bill Number": "bill_no",
+    }
+    PAGE_SIZE = 50
+
+    def __init__(self, parent, bill_service, user_data, tax_labels=None):
+        self.parent = parent
+        self.bill_service = bill_service
+        self.user_data = user_data
+        self.tax_labels = tax_labels
+
+        self.field = ctk.StringVar(value="Customer Name")
+        self.query = ctk.StringVar()
+        self.query.trace_add("write", self.on_query_changed)
+        self._instant_job = None
+        self.prefix = ctk.BooleanVar(value=True)
+        self.date_from = ctk.StringVar()
+        self.date_to = ctk.StringVar()
+        self.result_status = ctk.StringVar(value="")
+
+        # Page generator of the current search, the number of result rows shown, and the bills they hold
+        self.pages = None
+        self.row_count = 0
+        self.loaded_bills = {}
+
+        self.window = ctk.CTkToplevel(parent)
+        self.window.title("Find Bills")
+        self.window.geometry("900x600")
+        self.window.grab_set()
+
+        self.create_ui()
+
+    def create_ui(self):
+        main_frame = ctk.CTkFrame(self.window)
+        main_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        main_frame.grid_columnconfigure(0, weight=1)
+        main_frame.grid_rowconfigure(1, weight=1)
+
+        # Search criteria
+        criteria_frame = ctk.CTkFrame(main_frame)
+        criteria_frame.grid(row=0, column=0, sticky="ew", padx=5, pady=5)
+        criteria_frame.grid_columnconfigure(1, weight=1)
+
+        ctk.CTkOptionMenu(
+            criteria_frame,
+            variable=self.field,
+            values=list(self.SEARCH_FIELDS),
+            width=150
+        ).grid(row=0, column=0, padx=10, pady=10)
+
+        query_entry = ctk.CTkEntry(
+            criteria_frame,
+            textvariable=self.query,
+            placeholder_text="Name, phone or bill number",
+            height=30,
+            font=ctk.CTkFont(size=14)
+        )
+        query_entry.grid(row=0, column=1, columnspan=3, padx=10, pady=10, sticky="ew")
+        query_entry.bind("<Return>", lambda event: self.search())
+
+        ctk.CTkCheckBox(
+            criteria_frame,
+            text="Starts with",
+            variable=self.prefix
+        ).grid(row=0, column=4, padx=10, pady=10)
+
+        ctk.CTkButton(
+            criteria_frame,
+            text="Search",
+            command=self.search,
+            width=100,
+            height=30,
+            font=ctk.CTkFont(size=14)
+        ).grid(row=0, column=5, padx=10, pady=10)
+
+        ctk.CTkLabel(criteria_frame, text="From (YYYY-MM-DD):").grid(row=1, column=0, padx=10, pady=(0, 10), sticky="e")
+        ctk.CTkEntry(criteria_frame, textvariable=self.date_from, width=120).grid(
+            row=1, column=1, padx=10, pady=(0, 10), sticky="w")
+        ctk.CTkLabel(criteria_frame, text="To (YYYY-MM-DD):").grid(row=1, column=2, padx=10, pady=(0, 10), sticky="e")
+        ctk.CTkEntry(criteria_frame, textvariable=self.date_to, width=120).grid(
+            row=1, column=3, padx=10, pady=(0, 10), sticky="w")
+
+        # Results
+        self.results_frame = ctk.CTkScrollableFrame(main_frame)
+        self.results_frame.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+        self.results_frame.grid_columnconfigure(2, weight=1)
+
+        footer_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        footer_frame.grid(row=2, column=0, sticky="ew", padx=5, pady=5)
+        footer_frame.grid_columnconfigure(0, weight=1)
+
+        ctk.CTkLabel(footer_frame, textvariable=self.result_status, anchor="w").grid(
+            row=0, column=0, padx=10, sticky="w")
+
+        self.load_more_btn = ctk.CTkButton(
+            footer_frame,
+            text="Load more",
+            command=self.load_more,
+            state="disabled",
+            width=120
+        )
+        self.load_more_btn.grid(row=0, column=1, padx=10)
+
+    def on_query_changed(self, *_):
+        """Debounce typing so a burst of keystrokes runs a single index lookup"""
+        if self._instant_job is not None:
+            self.window.after_cancel(self._instant_job)
+        self._instant_job = self.window.after(150, self.show_instant_results)
+
+    def show_instant_results(self):
+        """List bills from the local search index that match the search box"""
+        self._instant_job = None
+        self.clear_results()
+        self.pages = None
+        self.load_more_btn.configure(state="disabled")
+        query = self.query.get().strip()
+        if not query:
+            self.result_status.set("")
+            return
+        for header in self.bill_service.find_bills(query, limit=self.PAGE_SIZE):
+            self.add_result_row(header)
+        self.result_status.set(f"{self.row_count} match(es) on this computer - press Search to search all bills")
+
+    def clear_results(self):
+        """Remove every result row"""
+        for widget in self.results_frame.winfo_children():
+            widget.destroy()
+        self.row_count = 0
+        self.loaded_bills = {}
+
+    def search(self):
+        """Start a new search and show its first page"""
+        value = self.query.get().strip()
+        if not value:
+            mb.showerror("Error", "Please enter something to search for", parent=self.window)
+            return
+        try:
+            start = self.parse_date(self.date_from.get())
+            end = self.parse_date(self.date_to.get())
+        except ValueError:
+            mb.showerror("Error", "Dates must be in YYYY-MM-DD format", parent=self.window)
+            return
+        if end is not None:
+            # The "To" date is inclusive
+            end += timedelta(days=1)
+
+        self.clear_results()
+        self.pages = self.bill_service.search_bill_pages(
+            self.SEARCH_FIELDS[self.field.get()], value, self.prefix.get(), start, end, self.PAGE_SIZE
+        )
+        self.load_more()
+
+    def load_more(self):
+        """Fetch and show the next page of the current search"""
+        if self.pages is None:
+            return
+        page = next(self.pages, None)
+        if page is None:
+            self.pages = None
+        else:
+            for bill in page:
+                self.loaded_bills[bill.bill_no] = bill
+                self.add_result_row(BillHeader.from_bill(bill))
+
+        more = "" if self.pages is None else " - more available"
+        self.result_status.set(f"{self.row_count} bill(s) shown{more}" if self.row_count else "No bills found")
+        self.load_more_btn.configure(state="normal" if self.pages is not None else "disabled")
+
+    def add_result_row(self, header):
+        """Add one bill to the results list"""
+        row = self.row_count
+        timestamp = header.timestamp.strftime('%Y-%m-%d %H:%M') if isinstance(header.timestamp, datetime) else ""
+        ctk.CTkLabel(self.results_frame, text=header.bill_no).grid(row=row, column=0, padx=10, pady=2, sticky="w")
+        ctk.CTkLabel(self.results_frame, text=timestamp).grid(row=row, column=1, padx=10, pady=2, sticky="w")
+        ctk.CTkLabel(self.results_frame, text=f"{header.customer_name} ({header.customer_phone})").grid(
+            row=row, column=2, padx=10, pady=2, sticky="w")
+        ctk.CTkLabel(self.results_frame, text=format_rupees(header.total_amount)).grid(
+            row=row, column=3, padx=10, pady=2, sticky="e")
+        ctk.CTkButton(
+            self.results_frame,
+            text="Open",
+            width=70,
+            command=lambda bill_no=header.bill_no: self.open_bill(bill_no)
+        ).grid(row=row, column=4, padx=10, pady=2)
+        self.row_count += 1
+
+    def open_bill(self, bill_no):
+        """Preview a bill from the results, loading it first if only its header is known"""
+        bill = self.loaded_bills.get(bill_no) or self.bill_service.get_bill(bill_no)
+        if bill is None:
+            mb.showerror("Error", "Bill not found", parent=self.window)
+            return
+        BillPreviewWindow(self.window, bill, self.user_data, self.tax_labels)
+
+    @staticmethod
+    def parse_date(text):
+        """Parse a YYYY-MM-DD date, or return None for an empty field"""
+        text = text.strip()
+        return datetime.strptime(text, "%Y-%m-%d") if text else None
@@ -1,18 +1,30 @@
 # Main Application
-import random
 from datetime import datetime
-from tkinter import messagebox as mb
+from tkinter import TclError, messagebox as mb
 
 import customtkinter as ctk
 
 from models.bill_model import BillItem, Bill
+from models.money import format_rupees
 from services.bill_service import BillService
+from services.cart import Cart
 from services.product_service import ProductService
 from services.user_service import UserService
 from templates.bill_template import BillPreviewWindow
+from ui.bill_search_window import BillSearchWindow
 
 
 class BillingWindow:
+    # Product categories shown as tabs, in display order
+    CATEGORY_TABS = {
+        "medical": "Medical Items",
+        "grocery": "Grocery Items",
+        "drinks": "Cold Drinks",
+    }
+    SEARCH_TAB = "Search Results"
+    SEARCH_LIMIT = 30
+    ROW_PAGE_SIZE = 50
+
     def __init__(self, root, user_data):
         self.root = root
         self.user_data = user_data
@@ -22,7 +34,7 @@ class BillingWindow:
         self.root.grid_columnconfigure(0, weight=1)
         self.root.grid_rowconfigure(0, weight=1)
 
-        self.bill_service = BillService()
+        self.bill_service = BillService(self.user_data['localId'])
         self.user_service = UserService()
         self.product_service = ProductService()
         # self.product_service.initialize_default_products()
@@ -35,6 +47,16 @@ class BillingWindow:
         self.c_name = ctk.StringVar()
         self.c_phone = ctk.StringVar()
         self.search_bill = ctk.StringVar()
+        self.product_query = ctk.StringVar()
+        self.product_query.trace_add("write", self.on_product_query_changed)
+        self._product_search_job = None
+        self.scanner_mode = ctk.BooleanVar(value=False)
+        self.scan_status = ctk.StringVar(value="")
+        self._total_pending = False
+        self.save_status = ctk.StringVar(value="")
+        self._reported_failures = 0
+        # (bill number, invoice number) of the bill loaded for editing; re-saving it keeps its invoice number
+        self.loaded_invoice = None
 
         # Category totals and tax variables
         self.medical_price = ctk.StringVar(value="\u20B90.00")
@@ -44,23 +66,23 @@ class BillingWindow:
         self.grocery_tax = ctk.StringVar(value="\u20B90.00")
         self.cold_drinks_tax = ctk.StringVar(value="\u20B90.00")
 
-        # Product quantities (for each product)
+        # Quantity variables for rendered rows, rows whose field holds text that is not a quantity,
+        # and rows whose negative quantity is being reset to 0
         self.product_vars = {}
+        self.invalid_rows = set()
+        self._clamping_rows = set()
 
-        # Store totals for calculations
-        self.total_medical = 0
-        self.total_grocery = 0
-        self.total_drinks = 0
-        self.tax_medical = 0
-        self.tax_grocery = 0
-        self.tax_drinks = 0
-        self.bill_total = 0
+        # Cart state and running totals
+        self.cart = Cart(rate_for=self.product_service.get_tax_rate,
+                         promotions=self.bill_service.promotion_engine)
+        self.promotions_version = self.bill_service.promotions_version
 
         # Create main container using grid instead of pack
         self.main_frame = ctk.CTkFrame(self.root)
         self.main_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
         self.main_frame.grid_columnconfigure(0, weight=1)
         self.main_frame.grid_rowconfigure(2, weight=1)  # Products area should expand
+        self.main_frame.bind("<Destroy>", self.on_destroy)
 
         # Create UI components
         self.create_header()
@@ -69,12 +91,18 @@ class BillingWindow:
         self.create_totals_area()
         self.create_action_buttons()
 
-        # Load products from Firestore
+        # Render products from the local snapshot, then reconcile with Firestore in the background
+        self.product_service.warm_start()
+        self.catalog_version = None
         self.load_products()
+        self.watch_catalog()
+        self.bill_service.start_promotion_refresh()
+        self.watch_promotions()
+        self.bill_service.start_sync()
+        self.watch_bill_writer()
 
-    @staticmethod
-    def generate_bill_number():
-        return str(random.randint(10000, 99999))
+    def generate_bill_number(self):
+        return self.bill_service.next_bill_number()
 
     def create_header(self):
         header_frame = ctk.CTkFrame(self.main_frame, corner_radius=10)
@@ -162,72 +190,164 @@ class BillingWindow:
         )
         search_btn.grid(row=1, column=6, padx=10, pady=10, sticky="ew")
 
+        # Search past bills by customer, phone or bill number
+        find_btn = ctk.CTkButton(
+            customer_frame,
+            text="Find Bills",
+            command=self.open_bill_search,
+            width=100,
+            height=30,
+            font=ctk.CTkFont(size=14)
+        )
+        find_btn.grid(row=0, column=6, padx=10, pady=10, sticky="ew")
+
     def create_products_area(self):
         products_frame = ctk.CTkFrame(self.main_frame)
         products_frame.grid(row=2, column=0, sticky="nsew", padx=10, pady=10)
         products_frame.grid_columnconfigure(0, weight=1)
-        products_frame.grid_rowconfigure(0, weight=1)
+        products_frame.grid_rowconfigure(1, weight=1)
+
+        # Product search box
+        search_frame = ctk.CTkFrame(products_frame, fg_color="transparent")
+        search_frame.grid(row=0, column=0, sticky="ew", padx=5, pady=(5, 0))
+        search_frame.grid_columnconfigure(1, weight=1)
+
+        ctk.CTkLabel(
+            search_frame,
+            text="Search Products:",
+            font=ctk.CTkFont(size=14)
+        ).grid(row=0, column=0, padx=10, pady=5, sticky="w")
+
+        ctk.CTkEntry(
+            search_frame,
+            textvariable=self.product_query,
+            placeholder_text="Type a product name",
+            height=30,
+            font=ctk.CTkFont(size=14)
+        ).grid(row=0, column=1, padx=10, pady=5, sticky="ew")
+
+        # Barcode scanner input: scanners type the code followed by Enter
+        self.scan_entry = ctk.CTkEntry(
+            search_frame,
+            placeholder_text="Scan barcode",
+            width=200,
+            height=30,
+            font=ctk.CTkFont(size=14)
+        )
+        self.scan_entry.grid(row=0, column=2, padx=10, pady=5)
+        self.scan_entry.bind("<Return>", self.on_barcode_scanned)
+
+        ctk.CTkSwitch(
+            search_frame,
+            text="Scanner Mode",
+            variable=self.scanner_mode,
+            command=self.toggle_scanner_mode,
+            font=ctk.CTkFont(size=14)
+        ).grid(row=0, column=3, padx=10, pady=5)
+
+        ctk.CTkLabel(
+            search_frame,
+            textvariable=self.scan_status,
+            width=220,
+            font=ctk.CTkFont(size=13),
+            anchor="w"
+        ).grid(row=0, column=4, padx=10, pady=5, sticky="w")
 
         # Create notebook with tabs for each category
         tab_view = ctk.CTkTabview(products_frame)
-        tab_view.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+        tab_view.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+        self.tab_view = tab_view
 
         # Configure tab view to expand
         tab_view.grid_columnconfigure(0, weight=1)
         tab_view.grid_rowconfigure(0, weight=1)
 
-        # Create tabs for each product category
-        medical_tab = tab_view.add("Medical Items")
-        grocery_tab = tab_view.add("Grocery Items")
-        drinks_tab = tab_view.add("Cold Drinks")
-
-        # Configure tab columns and rows
-        for tab in [medical_tab, grocery_tab, drinks_tab]:
+        # Create a tab with a scrollable product list for each category
+        self.category_frames = {}
+        for category, title in self.CATEGORY_TABS.items():
+            tab = tab_view.add(title)
             tab.grid_columnconfigure(0, weight=1)
             tab.grid_rowconfigure(0, weight=1)
 
-        # Tab containers for products
-        self.medical_items_frame = ctk.CTkScrollableFrame(medical_tab)
-        self.medical_items_frame.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
-        self.medical_items_frame.grid_columnconfigure(0, weight=3)
-        self.medical_items_frame.grid_columnconfigure(1, weight=1)
-        self.medical_items_frame.grid_columnconfigure(2, weight=1)
-
-        self.grocery_items_frame = ctk.CTkScrollableFrame(grocery_tab)
-        self.grocery_items_frame.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
-        self.grocery_items_frame.grid_columnconfigure(0, weight=3)
-        self.grocery_items_frame.grid_columnconfigure(1, weight=1)
-        self.grocery_items_frame.grid_columnconfigure(2, weight=1)
-
-        self.drinks_items_frame = ctk.CTkScrollableFrame(drinks_tab)
-        self.drinks_items_frame.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
-        self.drinks_items_frame.grid_columnconfigure(0, weight=3)
-        self.drinks_items_frame.grid_columnconfigure(1, weight=1)
-        self.drinks_items_frame.grid_columnconfigure(2, weight=1)
+            items_frame = ctk.CTkScrollableFrame(tab)
+            items_frame.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+            items_frame.grid_columnconfigure(0, weight=3)
+            items_frame.grid_columnconfigure(1, weight=1)
+            items_frame.grid_columnconfigure(2, weight=1)
+            self.category_frames[category] = items_frame
+
+        # Tab that lists matches for the product search box
+        search_tab = tab_view.add(self.SEARCH_TAB)
+        search_tab.grid_columnconfigure(0, weight=1)
+        search_tab.grid_rowconfigure(0, weight=1)
+
+        self.search_results_frame = ctk.CTkScrollableFrame(search_tab)
+        self.search_results_frame.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+        self.search_results_frame.grid_columnconfigure(0, weight=3)
+        self.search_results_frame.grid_columnconfigure(1, weight=1)
+        self.search_results_frame.grid_columnconfigure(2, weight=1)
 
     def load_products(self):
-        # Clear existing products
-        for widget in self.medical_items_frame.winfo_children():
-            widget.destroy()
-        for widget in self.grocery_items_frame.winfo_children():
-            widget.destroy()
-        for widget in self.drinks_items_frame.winfo_children():
-            widget.destroy()
+        # Rows are rebuilt from the cart, so a catalog refresh does not wipe it
+        self.product_vars = {}
+        self.invalid_rows.clear()
+        self.catalog_version = self.product_service.catalog_version
+
+        # Get every product grouped by category in one pass over the catalog
+        grouped = self.product_service.get_products_grouped_by_category()
+
+        for category, frame in self.category_frames.items():
+            # Clear existing products
+            for widget in frame.winfo_children():
+                widget.destroy()
+
+            # Headers and products for this category
+            self.create_product_headers(frame)
+            self.add_products_to_frame(grouped.get(category, []), frame, start_row=1)
+
+        if self.product_query.get().strip():
+            self.show_product_search_results()
+
+    def on_product_query_changed(self, *_):
+        """Debounce type-ahead so a burst of keystrokes runs a single search"""
+        if self._product_search_job is not None:
+            self.root.after_cancel(self._product_search_job)
+        self._product_search_job = self.root.after(120, self.show_product_search_results)
+
+    def show_product_search_results(self):
+        """List products matching the search box in the search tab"""
+        self._product_search_job = None
+        query = self.product_query.get().strip()
 
-        # Get products from Firestore by category
-        medical_products = self.product_service.get_products_by_category("medical")
-        grocery_products = self.product_service.get_products_by_category("grocery")
-        drinks_products = self.product_service.get_products_by_category("drinks")
+        for widget in self.search_results_frame.winfo_children():
+            widget.destroy()
+        if not query:
+            return
 
-        # Headers for the products
-        self.create_product_headers(self.medical_items_frame)
-        self.create_product_headers(self.grocery_items_frame)
-        self.create_product_headers(self.drinks_items_frame)
+        results = self.product_service.search_products(query, limit=self.SEARCH_LIMIT)
+        self.create_product_headers(self.search_results_frame)
+        self.add_products_to_frame(results, self.search_results_frame, start_row=1)
+        self.tab_view.set(self.SEARCH_TAB)
 
-        # Add products to UI
-        self.add_products_to_frame(medical_products, self.medical_items_frame, start_row=1)
-        self.add_products_to_frame(grocery_products, self.grocery_items_frame, start_row=1)
-        self.add_products_to_frame(drinks_products, self.drinks_items_frame, start_row=1)
+    def watch_catalog(self):
+        """Re-render the product grid and re-price the cart when the background catalog sync brings changes"""
+        if not self.main_frame.winfo_exists():
+            return
+        if self.product_service.catalog_version != self.catalog_version:
+            self.cart.refresh_prices(self.product_service.get_product_by_id)
+            self.load_products()
+            self.update_totals()
+        self.root.after(1000, self.watch_catalog)
+
+    def watch_promotions(self):
+        """Re-price the cart when the background refresh compiles a new set of promotions"""
+        if not self.main_frame.winfo_exists():
+            return
+        if self.bill_service.promotions_version != self.promotions_version:
+            self.promotions_version = self.bill_service.promotions_version
+            self.cart.set_promotions(self.bill_service.promotion_engine)
+            self.update_totals()
+        self.root.after(1000, self.watch_promotions)
 
     @staticmethod
     def create_product_headers(frame):
@@ -265,74 +385,172 @@ class BillingWindow:
         actions_header.grid(row=0, column=3, columnspan=2, padx=10, pady=(5, 10))
 
     def add_products_to_frame(self, products, frame, start_row=0):
-        row = start_row
-        for product in products:
-            # Create variable for this product
-            self.product_vars[product.product_id] = ctk.IntVar(value=0)
+        """Render the first page of product rows; further pages load on demand"""
+        self.add_product_page(products, frame, start_row, 0)
+
+    def add_product_page(self, products, frame, row, offset):
+        """Render one page of rows, followed by a button for the next page"""
+        page = products[offset:offset + self.ROW_PAGE_SIZE]
+        for product in page:
+            self.add_product_row(product, frame, row)
+            row += 1
 
-            # Product name label
-            product_label = ctk.CTkLabel(
+        remaining = len(products) - offset - len(page)
+        if remaining > 0:
+            more_btn = ctk.CTkButton(
                 frame,
-                text=product.name,
+                text=f"Show more ({remaining} remaining)",
+                height=30,
                 font=ctk.CTkFont(size=14)
             )
-            product_label.grid(row=row, column=0, padx=10, pady=5, sticky="w")
+            more_btn.configure(command=lambda: (
+                more_btn.destroy(),
+                self.add_product_page(products, frame, row, offset + len(page))
+            ))
+            more_btn.grid(row=row, column=0, columnspan=5, padx=10, pady=10)
+
+    def add_product_row(self, product, frame, row):
+        # Tk variables exist only for rendered rows; the cart holds the quantities
+        if product.product_id not in self.product_vars:
+            var = ctk.IntVar(value=self.cart.quantity(product.product_id))
+            var.trace_add("write", lambda *_, p=product.product_id: self.on_quantity_var_changed(p))
+            self.product_vars[product.product_id] = var
+
+        # Product name label
+        product_label = ctk.CTkLabel(
+            frame,
+            text=product.name,
+            font=ctk.CTkFont(size=14)
+        )
+        product_label.grid(row=row, column=0, padx=10, pady=5, sticky="w")
 
-            # Price label
-            price_label = ctk.CTkLabel(
-                frame,
-                text=f"\u20B9{product.price:.2f}",
-                font=ctk.CTkFont(size=14)
-            )
-            price_label.grid(row=row, column=1, padx=10, pady=5)
+        # Price label
+        price_label = ctk.CTkLabel(
+            frame,
+            text=format_rupees(product.price),
+            font=ctk.CTkFont(size=14)
+        )
+        price_label.grid(row=row, column=1, padx=10, pady=5)
 
-            # Quantity entry
-            qty_entry = ctk.CTkEntry(
-                frame,
-                textvariable=self.product_vars[product.product_id],
-                width=70,
-                height=30,
-                font=ctk.CTkFont(size=14)
-            )
-            qty_entry.grid(row=row, column=2, padx=10, pady=5)
+        # Quantity entry
+        qty_entry = ctk.CTkEntry(
+            frame,
+            textvariable=self.product_vars[product.product_id],
+            width=70,
+            height=30,
+            font=ctk.CTkFont(size=14)
+        )
+        qty_entry.grid(row=row, column=2, padx=10, pady=5)
 
-            # Create a frame for buttons
-            btn_frame = ctk.CTkFrame(frame, fg_color="transparent")
-            btn_frame.grid(row=row, column=3, columnspan=2, padx=10, pady=5)
+        # Create a frame for buttons
+        btn_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        btn_frame.grid(row=row, column=3, columnspan=2, padx=10, pady=5)
 
-            # Add/Remove buttons
-            remove_btn = ctk.CTkButton(
-                btn_frame,
-                text="-",
-                width=30,
-                height=30,
-                command=lambda p=product.product_id: self.decrease_quantity(p)
-            )
-            remove_btn.pack(side="left", padx=2)
+        # Add/Remove buttons
+        remove_btn = ctk.CTkButton(
+            btn_frame,
+            text="-",
+            width=30,
+            height=30,
+            command=lambda p=product.product_id: self.decrease_quantity(p)
+        )
+        remove_btn.pack(side="left", padx=2)
 
-            add_btn = ctk.CTkButton(
-                btn_frame,
-                text="+",
-                width=30,
-                height=30,
-                command=lambda p=product.product_id: self.increase_quantity(p)
-            )
-            add_btn.pack(side="left", padx=2)
+        add_btn = ctk.CTkButton(
+            btn_frame,
+            text="+",
+            width=30,
+            height=30,
+            command=lambda p=product.product_id: self.increase_quantity(p)
+        )
+        add_btn.pack(side="left", padx=2)
 
-            row += 1
+    def toggle_scanner_mode(self):
+        """Keep keyboard focus on the scan field while scanner mode is on"""
+        if self.scanner_mode.get():
+            self.scan_entry.focus_set()
+            self.scan_status.set("Ready to scan")
+        else:
+            self.scan_status.set("")
+
+    def on_barcode_scanned(self, event=None):
+        """Add the scanned product to the cart using the in-memory barcode index"""
+        code = self.scan_entry.get().strip()
+        self.scan_entry.delete(0, "end")
+        if not code:
+            return "break"
+
+        product = self.product_service.get_product_by_barcode(code)
+        if product is None:
+            self.scan_status.set(f"Unknown code: {code}")
+            return "break"
+
+        quantity = self.set_quantity(product.product_id, self.cart.quantity(product.product_id) + 1)
+        self.scan_status.set(f"Added {product.name} (x{quantity})")
+
+        if self.scanner_mode.get():
+            self.scan_entry.focus_set()
+        return "break"
+
+    def on_quantity_var_changed(self, product_id):
+        """Move a quantity typed into a row into the cart, then schedule a totals refresh"""
+        var = self.product_vars.get(product_id)
+        if var is None or product_id in self._clamping_rows:
+            return
+        try:
+            quantity = var.get()
+        except (TclError, ValueError):
+            # Blank or partly typed text; keep the last valid quantity in the cart
+            self.invalid_rows.add(product_id)
+            return
+        self.invalid_rows.discard(product_id)
+
+        if quantity < 0:
+            # Show the quantity the cart will hold; the write must not re-enter this trace
+            self._clamping_rows.add(product_id)
+            try:
+                var.set(0)
+            finally:
+                self._clamping_rows.discard(product_id)
+            quantity = 0
+
+        if quantity != self.cart.quantity(product_id):
+            product = self.product_service.get_product_by_id(product_id)
+            if product is not None:
+                self.cart.set_quantity(product, quantity)
+                self.schedule_total()
+
+    def schedule_total(self):
+        """Refresh the totals display once the Tk event queue is idle"""
+        if not self._total_pending:
+            self._total_pending = True
+            self.root.after_idle(self._run_scheduled_total)
+
+    def _run_scheduled_total(self):
+        self._total_pending = False
+        self.update_totals()
+
+    def set_quantity(self, product_id, quantity):
+        """Update one cart line and its quantity field; totals move by delta"""
+        product = self.product_service.get_product_by_id(product_id)
+        if product is None:
+            return 0
+        self.cart.set_quantity(product, max(0, quantity))
+        quantity = self.cart.quantity(product_id)
+
+        var = self.product_vars.get(product_id)
+        if var is not None:
+            var.set(quantity)
+        # Back-to-back changes share a single totals refresh
+        self.schedule_total()
+        return quantity
 
     def increase_quantity(self, product_id):
-        current_value = self.product_vars[product_id].get()
-        self.product_vars[product_id].set(current_value + 1)
-        # Auto-calculate totals when quantity changes
-        self.calculate_total()
+        self.set_quantity(product_id, self.cart.quantity(product_id) + 1)
 
     def decrease_quantity(self, product_id):
-        current_value = self.product_vars[product_id].get()
-        if current_value > 0:
-            self.product_vars[product_id].set(current_value - 1)
-            # Auto-calculate totals when quantity changes
-            self.calculate_total()
+        if self.cart.quantity(product_id) > 0:
+            self.set_quantity(product_id, self.cart.quantity(product_id) - 1)
 
     def create_totals_area(self):
         totals_frame = ctk.CTkFrame(self.main_frame, corner_radius=10)
@@ -511,79 +729,72 @@ class BillingWindow:
         )
         exit_btn.grid(row=0, column=3, padx=10, pady=10, sticky="ew")
 
+        # Background save status
+        self.save_status_label = ctk.CTkLabel(
+            buttons_frame,
+            textvariable=self.save_status,
+            font=ctk.CTkFont(size=13)
+        )
+        self.save_status_label.grid(row=1, column=0, columnspan=3, padx=10, pady=(0, 10), sticky="w")
+
+        self.retry_btn = ctk.CTkButton(
+            buttons_frame,
+            text="Retry Failed Saves",
+            command=self.retry_failed_bills,
+            state="disabled",
+            width=150,
+            height=30,
+            font=ctk.CTkFont(size=13)
+        )
+        self.retry_btn.grid(row=1, column=3, padx=10, pady=(0, 10), sticky="ew")
+
     def calculate_total(self):
-        """Calculate totals for all categories and update the UI"""
-        # Get all products from Firestore
-        all_products = {p.product_id: p for p in self.product_service.get_all_products()}
+        """Show the cart totals; typed quantities are already in the cart"""
+        if self.invalid_rows:
+            mb.showwarning("Warning", "Some quantities are not whole numbers and were ignored")
+        self.update_totals()
 
-        # Calculate category totals
-        medical_total = 0
-        grocery_total = 0
-        drinks_total = 0
+    def update_totals(self):
+        """Show the cart's running totals in the UI"""
+        snapshot = self.cart.snapshot()
+        self.show_totals(snapshot.category_totals, snapshot.category_taxes, snapshot.grand_total)
 
-        # Iterate through product variables to calculate totals
-        for product_id, var in self.product_vars.items():
-            quantity = var.get()
-            if quantity > 0 and product_id in all_products:
-                product = all_products[product_id]
-                item_total = quantity * product.price
-
-                if product.category == "medical":
-                    medical_total += item_total
-                elif product.category == "grocery":
-                    grocery_total += item_total
-                elif product.category == "drinks":
-                    drinks_total += item_total
-
-        # Calculate taxes
-        medical_tax = round(medical_total * 0.05, 2)
-        grocery_tax = round(grocery_total * 0.01, 2)
-        drinks_tax = round(drinks_total * 0.10, 2)
-
-        # Calculate grand total
-        grand_total = medical_total + grocery_total + drinks_total + medical_tax + grocery_tax + drinks_tax
-
-        # Update UI variables
-        self.medical_price.set(f"\u20B9{medical_total:.2f}")
-        self.grocery_price.set(f"\u20B9{grocery_total:.2f}")
-        self.cold_drinks_price.set(f"\u20B9{drinks_total:.2f}")
-
-        self.medical_tax.set(f"\u20B9{medical_tax:.2f}")
-        self.grocery_tax.set(f"\u20B9{grocery_tax:.2f}")
-        self.cold_drinks_tax.set(f"\u20B9{drinks_tax:.2f}")
-
-        # Update grand total
-        self.grand_total_label.configure(text=f"\u20B9{grand_total:.2f}")
-
-        # Store calculated values for later use
-        self.total_medical = medical_total
-        self.total_grocery = grocery_total
-        self.total_drinks = drinks_total
-        self.tax_medical = medical_tax
-        self.tax_grocery = grocery_tax
-        self.tax_drinks = drinks_tax
-        self.bill_total = grand_total
+    def show_totals(self, totals, taxes, grand_total):
+        """Write category totals, taxes and the grand total to the labels"""
+        self.medical_price.set(format_rupees(totals.get("medical", 0)))
+        self.grocery_price.set(format_rupees(totals.get("grocery", 0)))
+        self.cold_drinks_price.set(format_rupees(totals.get("drinks", 0)))
+
+        self.medical_tax.set(format_rupees(taxes.get("medical", 0)))
+        self.grocery_tax.set(format_rupees(taxes.get("grocery", 0)))
+        self.cold_drinks_tax.set(format_rupees(taxes.get("drinks", 0)))
+
+        self.grand_total_label.configure(text=format_rupees(grand_total))
 
     def prepare_bill_data(self):
         """Prepare bill data for generating PDF"""
-        # Get all products from service
-        all_products = {p.product_id: p for p in self.product_service.get_all_products()}
+        snapshot = self.cart.snapshot()
 
         # Create list of bill items
-        bill_items = []
-        for product_id, var in self.product_vars.items():
-            quantity = var.get()
-            if quantity > 0 and product_id in all_products:
-                product = all_products[product_id]
-                total = quantity * product.price
-
-                bill_items.append(BillItem(
-                    product_id=product_id,
-                    product_name=product.name,
-                    price=product.price,
-                    quantity=quantity,
-                    total=total
-                ))
+        bill_items = [
+            BillItem(
+                product_id=line.product_id,
+                product_name=line.product_name,
+                price=line.price,
+                quantity=line.quantity,
+                total=line.total,
+                category=line.category,
+                tax_rate=line.tax_rate,
+                discount=line.discount,
+                promotions=line.promotions
+            )
+            for line in snapshot.lines
+        ]
+
+        # A loaded bill saved again under its own number keeps the invoice number it was issued
+        invoice_no = None
+        if self.loaded_invoice is not None and self.loaded_invoice[0] == self.bill_no.get():
+            invoice_no = self.loaded_invoice[1]
 
         # Create and return bill data
         return Bill(
@@ -591,14 +802,15 @@ class BillingWindow:
             customer_name=self.c_name.get(),
             customer_phone=self.c_phone.get(),
             items=bill_items,
-            medical_total=self.total_medical,
-            grocery_total=self.total_grocery,
-            drinks_total=self.total_drinks,
-            medical_tax=self.tax_medical,
-            grocery_tax=self.tax_grocery,
-            drinks_tax=self.tax_drinks,
-            total_amount=self.bill_total,
-            timestamp=datetime.now()
+            medical_total=snapshot.category_totals.get("medical", 0),
+            grocery_total=snapshot.category_totals.get("grocery", 0),
+            drinks_total=snapshot.category_totals.get("drinks", 0),
+            medical_tax=snapshot.category_taxes.get("medical", 0),
+            grocery_tax=snapshot.category_taxes.get("grocery", 0),
+            drinks_tax=snapshot.category_taxes.get("drinks", 0),
+            total_amount=snapshot.grand_total,
+            timestamp=datetime.now(),
+            invoice_no=invoice_no
         )
 
     def show_bill_preview(self):
@@ -608,28 +820,23 @@ class BillingWindow:
             mb.showerror("Error", "Customer details are required")
             return
 
-        # Check if any products are selected
-        any_products = False
-        for var in self.product_vars.values():
-            if var.get() > 0:
-                any_products = True
-                break
-
-        if not any_products:
+        # Pick up typed quantities and check if any products are selected
+        self.calculate_total()
+        if self.cart.snapshot().is_empty:
             mb.showerror("Error", "No products selected")
             return
 
-        # Calculate total if not already done
-        self.calculate_total()
-
         # Create bill data
         bill_data = self.prepare_bill_data()
 
-        # Save bill to database
-        self.bill_service.create_bill(bill_data)
+        # Record bill locally; it is synced to the database in the background
+        if not self.bill_service.queue_bill(bill_data):
+            mb.showerror("Error", "Could not record the bill on this computer. Check free disk space and try again.")
+            return
+        self.watch_bill_writer(reschedule=False)
 
         # Show bill preview
-        BillPreviewWindow(self.root, bill_data, self.user_profile)
+        BillPreviewWindow(self.root, bill_data, self.user_profile, self.product_service.get_tax_labels())
 
         # Reset fields for next bill
         self.bill_no.set(self.generate_bill_number())
@@ -646,13 +853,17 @@ class BillingWindow:
 
         if bill_data:
             # Show bill preview
-            BillPreviewWindow(self.root, bill_data, self.user_profile)
+            BillPreviewWindow(self.root, bill_data, self.user_profile, self.product_service.get_tax_labels())
 
             # Populate fields with bill data
             self.populate_fields_with_bill(bill_data)
         else:
             mb.showerror("Error", "Bill not found")
 
+    def open_bill_search(self):
+        """Open the window for finding past bills"""
+        BillSearchWindow(self.root, self.bill_service, self.user_profile, self.product_service.get_tax_labels())
+
     def populate_fields_with_bill(self, bill_data):
         """Populate all fields with data from found bill"""
         # Clear existing fields first
@@ -660,31 +871,24 @@ class BillingWindow:
 
         # Set bill number and customer details
         self.bill_no.set(bill_data.bill_no)
+        self.loaded_invoice = (bill_data.bill_no, bill_data.invoice_no)
         self.c_name.set(bill_data.customer_name)
         self.c_phone.set(bill_data.customer_phone)
 
         # Set quantities for products in the bill
         for item in bill_data.items:
+            product = self.product_service.get_product_by_id(item.product_id)
+            if product is not None:
+                self.cart.set_quantity(product, item.quantity)
             if item.product_id in self.product_vars:
                 self.product_vars[item.product_id].set(item.quantity)
 
-        # Update totals
-        self.total_medical = bill_data.medical_total
-        self.total_grocery = bill_data.grocery_total
-        self.total_drinks = bill_data.drinks_total
-        self.tax_medical = bill_data.medical_tax
-        self.tax_grocery = bill_data.grocery_tax
-        self.tax_drinks = bill_data.drinks_tax
-        self.bill_total = bill_data.total_amount
-
-        # Update UI
-        self.medical_price.set(f"\u20B9{self.total_medical:.2f}")
-        self.grocery_price.set(f"\u20B9{self.total_grocery:.2f}")
-        self.cold_drinks_price.set(f"\u20B9{self.total_drinks:.2f}")
-        self.medical_tax.set(f"\u20B9{self.tax_medical:.2f}")
-        self.grocery_tax.set(f"\u20B9{self.tax_grocery:.2f}")
-        self.cold_drinks_tax.set(f"\u20B9{self.tax_drinks:.2f}")
-        self.grand_total_label.configure(text=f"\u20B9{self.bill_total:.2f}")
+        # Show the totals stored on the bill
+        self.show_totals(
+            {"medical": bill_data.medical_total, "grocery": bill_data.grocery_total, "drinks": bill_data.drinks_total},
+            {"medical": bill_data.medical_tax, "grocery": bill_data.grocery_tax, "drinks": bill_data.drinks_tax},
+            bill_data.total_amount
+        )
 
         mb.showinfo("Bill Found", f"Bill #{bill_data.bill_no} has been loaded")
 
@@ -695,32 +899,65 @@ class BillingWindow:
         self.c_phone.set("")
         self.search_bill.set("")
 
-        # Clear product quantities
-        for var in self.product_vars.values():
-            var.set(0)
+        # Clear product quantities: only rows in the cart or holding invalid text can be non-zero
+        for product_id in {line.product_id for line in self.cart.snapshot().lines} | self.invalid_rows:
+            if product_id in self.product_vars:
+                self.product_vars[product_id].set(0)
+        self.cart.clear()
+        self.invalid_rows.clear()
+        self.loaded_invoice = None
 
         # Clear totals
-        self.medical_price.set("\u20B90.00")
-        self.grocery_price.set("\u20B90.00")
-        self.cold_drinks_price.set("\u20B90.00")
-        self.medical_tax.set("\u20B90.00")
-        self.grocery_tax.set("\u20B90.00")
-        self.cold_drinks_tax.set("\u20B90.00")
-        self.grand_total_label.configure(text="\u20B90.00")
-
-        # Reset stored values
-        self.total_medical = 0
-        self.total_grocery = 0
-        self.total_drinks = 0
-        self.tax_medical = 0
-        self.tax_grocery = 0
-        self.tax_drinks = 0
-        self.bill_total = 0
+        self.update_totals()
 
         # Generate new bill number
         self.bill_no.set(self.generate_bill_number())
 
+    def watch_bill_writer(self, reschedule=True):
+        """Show the background sync's progress and report bills that keep failing to sync"""
+        if not self.main_frame.winfo_exists():
+            return
+        status = self.bill_service.writer_status()
+        if status.failed:
+            self.save_status.set(f"{len(status.failed)} bill(s) not synced - last error: {status.failed[-1][1]}")
+            self.save_status_label.configure(text_color="red")
+        elif status.pending:
+            retrying = f" - retrying ({status.retrying})" if status.retrying else ""
+            self.save_status.set(f"Syncing {status.pending} bill(s){retrying}")
+            self.save_status_label.configure(text_color=("gray10", "gray90"))
+        else:
+            self.save_status.set("All bills synced" if status.saved else "")
+            self.save_status_label.configure(text_color=("gray10", "gray90"))
+        self.retry_btn.configure(state="normal" if status.failed else "disabled")
+
+        if len(status.failed) > self._reported_failures:
+            bill_nos = ", ".join(bill_no for bill_no, _ in status.failed[self._reported_failures:])
+            mb.showerror("Error", f"Could not sync bill(s) {bill_nos}. They are kept on this computer; "
+                                  "use 'Retry Failed Saves' once online.")
+        self._reported_failures = len(status.failed)
+
+        if reschedule:
+            self.root.after(500, self.watch_bill_writer)
+
+    def retry_failed_bills(self):
+        """Retry syncing the bills that keep failing now"""
+        self.bill_service.retry_failed_bills()
+        self.watch_bill_writer(reschedule=False)
+
+    def on_destroy(self, event):
+        """Stop background listeners once the billing screen is torn down"""
+        if event.widget is self.main_frame:
+            self.product_service.close()
+            # Don't hold the Tk thread waiting on the network; unsynced bills and unreturned
+            # invoice numbers stay on disk for the next session
+            self.bill_service.close(timeout=0)
+
     def exit_app(self):
         """Exit application"""
-        if mb.askyesno("Exit", "Do you want to exit?"):
+        status = self.bill_service.writer_status()
+        message = "Do you want to exit?"
+        if status.pending:
+            message = (f"{status.pending} bill(s) have not been synced yet. They are kept on this computer "
+                       f"and will be synced next time. Exit anyway?")
+        if mb.askyesno("Exit", message):
             self.root.destroy()